@@ -1,6 +1,15 @@
 from fastapi import Request, Response
 from jose import jwt
 from app.database import db
+from app.helper.llmGateway import llm_gateway
+from app.helper.llmCache import llm_cache
+from app.helper import intentClassifier
+from app.utils.outbox import outbox
+from app.utils.geocode_cache import geocode_cache
+from app.helper.nurseIndex import nurse_index
+from app.utils.count_cache import count_cache
+from app.helper.referenceCache import reference_cache
+from app.helper.senderResolver import sender_resolver
 import os
 from dotenv import load_dotenv
 import logging
@@ -41,4 +50,17 @@ async def admin_logout(request: Request, response: Response):
     response.delete_cookie("auth_token")
     return {"message": "Logout successful", "status": 200}
 
-
+async def admin_get_metrics(request: Request, response: Response):
+    return {
+        "llm": llm_gateway.metrics(),
+        "llm_cache": llm_cache.metrics(),
+        "intent_classifier": intentClassifier.metrics(),
+        "outbox": await outbox.metrics(),
+        "geocode": geocode_cache.metrics(),
+        "nurse_index": nurse_index.metrics(),
+        "counts": count_cache.metrics(),
+        "reference_cache": reference_cache.metrics(),
+        "sender_resolver": sender_resolver.metrics(),
+        "db": db.metrics(),
+        "status": 200
+    }
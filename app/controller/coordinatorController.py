@@ -1,5 +1,9 @@
 from app.database import db
-from app.utils.send_message import send_message
+from app.models.queries import COORDINATOR_CHAT_INSERT
+from app.utils.outbox import enqueue_message
+from app.utils.count_cache import count_cache
+from app.helper.referenceCache import reference_cache
+from app.helper.senderResolver import Principal, sender_resolver
 from dotenv import load_dotenv
 load_dotenv()
 from app.helper.promptHelper import generate_follow_up_message_for_nurse
@@ -13,16 +17,17 @@ from fastapi.responses import JSONResponse
 from app.utils.convert_mm_dd_yyyy_to_mm_dd import convert_to_md
 from datetime import datetime
 from app.utils.convert_date import extract_date_from_text
+from app.helper.chatHistory import get_history
+from app.helper.intentClassifier import classify_coordinator_message, remember_reply
 
-async def update_coordinator(shift_id: int, nurse_phone_number: str):
+async def update_coordinator(shift_id: int, principal: Principal):
     try:
-        nurse = await get_nurse_info(nurse_phone_number)
-
-        if not nurse:
+        if not principal:
             print("Nurse not found.")
             return
+        nurse = principal.record
 
-        await update_shift_status(shift_id, nurse.get("id"))
+        await update_shift_status(shift_id, principal.id)
         print('shift status updated')
         recipient = await get_coordinator_number(shift_id)
         shift_info = await get_shift_information(shift_id)
@@ -46,28 +51,13 @@ async def update_coordinator(shift_id: int, nurse_phone_number: str):
                 f"You can reach out via {nurse['mobile_number']}."
             )
             print("Message to be sent:", message)
-            asyncio.create_task(send_message(recipient["coordinator_phone"], message))
+            await enqueue_message(recipient["coordinator_phone"], message)
 
         else:
             print("Missing nurse or shift information. Cannot send message.")
     except Exception as e:
         print("Error in update_coordinator:", e)
 
-async def get_nurse_info(nurse_phone_number: str) -> dict | None:
-    try:
-        query = """
-            SELECT *
-            FROM nurses
-            WHERE mobile_number = $1
-            LIMIT 1
-        """
-        nurse = await db.fetchrow(query, nurse_phone_number)
-        return dict(nurse) if nurse else None
-    except Exception as e:
-        print("Error fetching nurse information:", e)
-        return None
-    
-
 async def update_shift_status(shift_id: int, nurse_id: int) -> None:
     try:
         query = """
@@ -77,6 +67,7 @@ async def update_shift_status(shift_id: int, nurse_id: int) -> None:
             WHERE id = $1
         """
         await db.execute(query, shift_id, nurse_id)
+        count_cache.invalidate("shift_tracker")
     except Exception as e:
         print('Error updating shift status:', e)
 
@@ -93,12 +84,7 @@ async def get_coordinator_number(shift_id: int):
 
         coordinator_id = shift_row["coordinator_id"]
 
-        coordinator_query = """
-            SELECT coordinator_phone, coordinator_email
-            FROM coordinator
-            WHERE id = $1
-        """
-        coordinator_row = await db.fetchrow(coordinator_query, coordinator_id)
+        coordinator_row = await reference_cache.coordinator(coordinator_id)
 
         if coordinator_row and coordinator_row["coordinator_phone"] and coordinator_row["coordinator_email"]:
             return {
@@ -112,19 +98,9 @@ async def get_coordinator_number(shift_id: int):
 
 async def get_shift_information(shift_id: int):
     try:
-        # Get facility info using subquery
-        facility_query = """
-            SELECT city_state_zip, name
-            FROM facilities
-            WHERE id = (SELECT facility_id FROM shift_tracker WHERE id = $1)
-        """
-        facility = await db.fetchrow(facility_query, shift_id)
-        location = facility["city_state_zip"] if facility and "city_state_zip" in facility else ""
-        name = facility["name"] if facility and "name" in facility else ""
-
         # Get shift info
         shift_query = """
-            SELECT date, shift
+            SELECT date, shift, facility_id
             FROM shift_tracker
             WHERE id = $1
         """
@@ -132,6 +108,10 @@ async def get_shift_information(shift_id: int):
         if not shift:
             return None
 
+        facility = await reference_cache.facility(shift["facility_id"])
+        location = facility["city_state_zip"] if facility else ""
+        name = facility["name"] if facility else ""
+
         shift_info = {
             "date": shift["date"],
             "shift": shift["shift"],
@@ -146,42 +126,21 @@ async def get_shift_information(shift_id: int):
 
 async def update_coordinator_chat_history(sender: str, text: str, msg_type: str):
     try:
-        await db.execute("""
-            INSERT INTO coordinator_chat_data (sender, message, message_type)
-            VALUES ($1, $2, $3)
-        """, sender, text, msg_type)
+        await db.execute_named(COORDINATOR_CHAT_INSERT, sender, text, msg_type)
     except Exception as err:
         print("Error updating coordinator chat history:", err)
 
 async def get_coordinator_chat_data(sender: str):
     try:
-        query = """
-            SELECT message
-            FROM coordinator_chat_data
-            WHERE sender = $1
-            LIMIT 50
-        """
-        result = await db.fetch(query, sender)
-        past_messages = [row["message"] for row in result]
-        return past_messages
+        return await get_history("coordinator", sender)
     except Exception as error:
         print("Error getting coordinator chat data:", error)
         return []
 
-async def validate_shift_before_cancellation(shift_id: int, phone_number: str) -> bool:
+async def validate_shift_before_cancellation(shift_id: int, coordinator: Principal) -> bool:
     try:
-        # Fetch coordinator's facility_id
-        coordinator_query = """
-            SELECT facility_id
-            FROM coordinator
-            WHERE coordinator_phone = $1 OR coordinator_email = $1
-        """
-        coordinator = await db.fetchrow(coordinator_query, phone_number)
-        if not coordinator:
-            asyncio.create_task(send_message(phone_number, "Coordinator not found."))
-            return False
-
-        facility_id_coordinator = coordinator["facility_id"]
+        phone_number = coordinator.sender
+        facility_id_coordinator = coordinator.facility_id
 
         # Check if shift exists and get its facility_id
         shift_query = """
@@ -193,12 +152,12 @@ async def validate_shift_before_cancellation(shift_id: int, phone_number: str) -
 
         if not shift:
             message = f"The shift with ID {shift_id} does not exist. Please check and try again."
-            asyncio.create_task(send_message(phone_number, message))
+            await enqueue_message(phone_number, message)
             return False
 
         if shift["facility_id"] != facility_id_coordinator:
             message = f"The shift with ID {shift_id} does not belong to your account. Please check and try again."
-            asyncio.create_task(send_message(phone_number, message))
+            await enqueue_message(phone_number, message)
             return False
 
         return True
@@ -207,58 +166,26 @@ async def validate_shift_before_cancellation(shift_id: int, phone_number: str) -
         print("Error in validate_shift_before_cancellation:", e)
         return False
 
-async def check_nurse_type(sender: str, nurse_type: str) -> bool:
+async def check_nurse_type(coordinator: Principal, nurse_type: str) -> bool:
     try:
         # Check if nurse_type exists
-        type_query = """
-            SELECT * 
-            FROM nurse_type 
-            WHERE nurse_type = $1
-        """
-        type_exists = await db.fetch(type_query, nurse_type)
-        if not type_exists:
-            return False
-
-        # Get coordinator's facility_id
-        facility_query = """
-            SELECT facility_id
-            FROM coordinator 
-            WHERE coordinator_phone = $1 OR coordinator_email = $1
-        """
-        facility = await db.fetchrow(facility_query, sender)
-        if not facility:
+        if not await reference_cache.nurse_type_exists(nurse_type):
             return False
 
-        facility_id = facility["facility_id"]
+        facility_id = coordinator.facility_id
 
         # Check if shifts exist for that nurse_type in the facility
-        shifts_query = """
-            SELECT * 
-            FROM shifts 
-            WHERE role = $1 
-              AND facility_id = $2
-        """
-        shifts = await db.fetch(shifts_query, nurse_type, facility_id)
-        return len(shifts) > 0
+        services = await reference_cache.services_for(facility_id)
+        return any(service["role"] == nurse_type for service in services)
 
     except Exception as e:
         print("Error in check_nurse_type:", e)
         return False
     
-async def follow_up_message_send(sender: str, nurse_name_input: str, follow_up_message: str):
+async def follow_up_message_send(coordinator: Principal, nurse_name_input: str, follow_up_message: str):
     try:
-        # Get coordinator ID
-        coordinator_query = """
-            SELECT id
-            FROM coordinator
-            WHERE coordinator_phone = $1 OR coordinator_email = $1
-        """
-        coordinator = await db.fetchrow(coordinator_query, sender)
-        if not coordinator:
-            print("Coordinator not found.")
-            return
-
-        coordinator_id = coordinator["id"]
+        sender = coordinator.sender
+        coordinator_id = coordinator.id
 
         # Get today's matching shifts
         matching_query = """
@@ -282,7 +209,7 @@ async def follow_up_message_send(sender: str, nurse_name_input: str, follow_up_m
         """
         matching_shifts = await db.fetch(matching_query, coordinator_id, nurse_name_input)
         if not matching_shifts:
-            asyncio.create_task(send_message(sender, f"No shift for {nurse_name_input} found for today."))
+            await enqueue_message(sender, f"No shift for {nurse_name_input} found for today.")
             print("No matching nurse shift found for today.")
             return
 
@@ -316,7 +243,7 @@ async def follow_up_message_send(sender: str, nurse_name_input: str, follow_up_m
                 print("replyMessage:", reply_message)
 
                 if mobile_number:
-                    asyncio.create_task(send_message(mobile_number, reply_message["message"]))
+                    await enqueue_message(mobile_number, reply_message["message"])
                 await update_nurse_chat_history(mobile_number, reply_message["message"], "sent")
                 await update_nurse_chat_history(email, reply_message["message"], "sent")
 
@@ -352,6 +279,9 @@ async def admin_delete_coordinator(request: Request, response: Response, id: int
         await db.execute("""
             DELETE FROM coordinator WHERE id = $1
         """, id)
+        reference_cache.invalidate_coordinators()
+        sender_resolver.invalidate("coordinator")
+        count_cache.invalidate("coordinator")
         return JSONResponse(content={"message": "Coordinator deleted successfully", "status": 200})
     except Exception as e:
         print("Error deleting coordinator:", str(e))
@@ -359,22 +289,15 @@ async def admin_delete_coordinator(request: Request, response: Response, id: int
 
 from fastapi import HTTPException
 
-async def send_shift_information_to_coordinator(sender: str, shift_info: dict):
+async def send_shift_information_to_coordinator(coordinator: Principal, shift_info: dict):
     try:
         print("SHIFT INFO:", shift_info)
+        sender = coordinator.sender
         base_query = "SELECT * FROM shift_tracker WHERE"
         conditions = []
         values = []
 
-        # Get coordinator ID
-        coordinator_row = await db.fetchrow("""
-            SELECT id FROM coordinator WHERE coordinator_phone = $1 OR coordinator_email = $1
-""", sender)
-
-        if not coordinator_row:
-            raise HTTPException(status_code=404, detail="Coordinator not found")
-
-        coordinator_id = coordinator_row["id"]  # Extract the integer id
+        coordinator_id = coordinator.id
 
         conditions.append("coordinator_id = ${}".format(len(values) + 1))
         values.append(coordinator_id)
@@ -417,7 +340,7 @@ async def send_shift_information_to_coordinator(sender: str, shift_info: dict):
         else:
             shift_message = "No shifts found for the given criteria."
 
-        asyncio.create_task(send_message(sender, shift_message))
+        await enqueue_message(sender, shift_message)
         await update_coordinator_chat_history(sender, shift_message, "sent")
     except Exception as e:
         print("Error in send_shift_information_to_coordinator:", e)
@@ -427,12 +350,18 @@ async def send_shift_information_to_coordinator(sender: str, shift_info: dict):
 
 async def coordinator_chat_bot(sender,text):
     from app.helper.promptHelper import generateReplyFromAI
-    from app.controller.nurseController import search_nurses, send_nurses_message
-    from app.controller.shiftController import create_shift, search_shift, search_shift_by_id, delete_shift, search_shifts_in_db
+    from app.controller.nurseController import start_nurse_outreach, start_series_outreach
+    from app.controller.shiftController import create_shift, create_shifts, search_shift, search_shift_by_id, delete_shift, search_shifts_in_db
     await update_coordinator_chat_history(sender, text, "received")
-    past_messages = await get_coordinator_chat_data(sender)
     try:
-        reply_message = await generateReplyFromAI(text, past_messages)
+        coordinator = await sender_resolver.coordinator(sender)
+        if not coordinator:
+            return {"message": "Coordinator not found."}
+
+        reply_message = classify_coordinator_message(sender, text)
+        if reply_message is None:
+            past_messages = await get_coordinator_chat_data(sender)
+            reply_message = await generateReplyFromAI(text, past_messages)
         if isinstance(reply_message, str):
             reply_message = reply_message.strip()
             if reply_message.startswith("```json"):
@@ -454,6 +383,7 @@ async def coordinator_chat_bot(sender,text):
                 if isinstance(reply_message["nurse_details"], list)
                 else [reply_message["nurse_details"]]
             )
+            new_shifts = []
             for nurse_detail in nurse_details_list:
                 if nurse_detail is None:
                     continue
@@ -464,7 +394,7 @@ async def coordinator_chat_bot(sender,text):
                 additional_instructions = nurse_detail.get("additional_instructions", "")
 
                 # ✅ Check if nurse type is linked
-                nurse_exists = await check_nurse_type(sender, nurse_type)
+                nurse_exists = await check_nurse_type(coordinator, nurse_type)
                 if not nurse_exists:
                     response_text = f"❌ The service type '{nurse_type}' is not available for your facility. Please choose a different service type."
                     await update_coordinator_chat_history(sender, response_text, "sent")
@@ -511,25 +441,21 @@ async def coordinator_chat_bot(sender,text):
                     shift_start_field = shift_time_fields.get(shift.upper())
 
                     if shift_start_field:
-                        coordinator = await db.fetchrow(
-                            "SELECT facility_id FROM coordinator WHERE coordinator_phone = $1 OR coordinator_email = $1",
-                            sender
-                        )
-                        if coordinator:
-                            facility_id = coordinator["facility_id"]
-                            time_row = await db.fetchrow(
-                                f"SELECT {shift_start_field} FROM shifts WHERE facility_id = $1 AND role = $2",
-                                facility_id, nurse_type
-                            )
-                            if time_row and time_row[shift_start_field]:
-                                shift_start_time = time_row[shift_start_field]
-
-                                if now >= shift_start_time:
-                                    msg = f"⚠️ Booking not allowed. The {shift.upper()} shift for {nurse_type} has already started at {shift_start_time.strftime('%I:%M %p')}."
-                                    return {"message": msg}
-
-                # Step 3: Proceed with Shift Creation
-                shift_result = await create_shift(sender, nurse_type, shift, date, additional_instructions)
+                        time_row = await reference_cache.service(coordinator.facility_id, nurse_type)
+                        if time_row and time_row[shift_start_field]:
+                            shift_start_time = time_row[shift_start_field]
+
+                            if now >= shift_start_time:
+                                msg = f"⚠️ Booking not allowed. The {shift.upper()} shift for {nurse_type} has already started at {shift_start_time.strftime('%I:%M %p')}."
+                                return {"message": msg}
+
+                new_shifts.append((nurse_type, shift, shift_date, additional_instructions))
+
+            # Step 3: Proceed with Shift Creation once every requested shift is valid
+            if len(new_shifts) == 1:
+                nurse_type, shift, shift_date, additional_instructions = new_shifts[0]
+                date = shift_date.strftime("%Y-%m-%d")
+                shift_result = await create_shift(coordinator, nurse_type, shift, date, additional_instructions)
                 print(shift_result, "shift_result")
                 if isinstance(shift_result, dict) and "error" in shift_result:
                     error_msg = shift_result["error"]
@@ -537,9 +463,12 @@ async def coordinator_chat_bot(sender,text):
                     return {"message": f"{error_msg}"}
 
                 shift_id = shift_result
-                nurses = await search_nurses(nurse_type, shift, shift_id)
-                print("Nurses found:", nurses)
-                await send_nurses_message(nurses, nurse_type, shift, shift_id, date, additional_instructions)
+                # Outreach runs in the background so the coordinator gets a reply as soon as the shift exists.
+                start_nurse_outreach(nurse_type, shift, shift_id, date, additional_instructions)
+            elif new_shifts:
+                # Several shifts in one request: one insert and one message per nurse.
+                rows = await create_shifts(coordinator.facility_id, coordinator.id, new_shifts, "bot")
+                start_series_outreach(coordinator.facility_id, rows)
         if reply_message.get("shift_details") and reply_message.get("cancellation"):
             shift_details_list = (
                 reply_message["shift_details"]
@@ -551,7 +480,7 @@ async def coordinator_chat_bot(sender,text):
                     shift_detail["nurse_type"],
                     shift_detail["shift"],
                     shift_detail["date"],
-                    sender
+                    coordinator
                 )
 
         if reply_message.get("shift_id") and reply_message.get("cancellation"):
@@ -563,7 +492,7 @@ async def coordinator_chat_bot(sender,text):
             deleted_shift_ids = []
 
             for shift_id in shift_ids:
-                is_valid = await validate_shift_before_cancellation(shift_id, sender)
+                is_valid = await validate_shift_before_cancellation(shift_id, coordinator)
                 if not is_valid:
                     continue
                 shift_details = await search_shift_by_id(shift_id)
@@ -587,10 +516,10 @@ async def coordinator_chat_bot(sender,text):
                     msg = f"The shift with ID {deleted_shift_ids[0]} has been deleted."
                 else:
                     msg = f"The shifts with IDs {', '.join(deleted_shift_ids)} have been deleted."
-                asyncio.create_task(send_message(sender, msg))
+                await enqueue_message(sender, msg)
 
         if reply_message.get("follow_up") and reply_message.get("nurse_name"):
-            await follow_up_message_send(sender, reply_message["nurse_name"], reply_message["follow_up_message"])
+            await follow_up_message_send(coordinator, reply_message["nurse_name"], reply_message["follow_up_message"])
         if reply_message.get("shift_information"):
             shift_info = reply_message["shift_information"]
 
@@ -629,8 +558,7 @@ async def coordinator_chat_bot(sender,text):
          # Fallback if no shift info (just use AI response message)
            response_text = reply_message.get("message", "")
 
-        
-
+        remember_reply(sender, response_text)
         return {"message": response_text}
 
     except Exception as e:
@@ -8,6 +8,12 @@ from datetime import datetime, time
 from typing import Optional
 from fastapi.responses import JSONResponse
 from app.utils.serialize_row import serialize_row
+from app.helper.eligibility import refresh_facility_eligibility
+from app.helper.searchIndex import search_pattern, FACILITY_SEARCH_FILTER
+from app.utils.count_cache import count_cache
+from app.helper.referenceCache import reference_cache
+from app.helper.senderResolver import sender_resolver
+from app.utils.pagination import wants_cursor, page_size, decode_cursor, keyset_predicate, split_page
 import logging
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -22,8 +28,85 @@ def time_str_to_ms(time_str: str) -> int:
     hours, minutes = map(int, time_str.split(":"))
     return ((hours * 60 + minutes) * 60) * 1000
 
+# Submitted coordinators (phone, email, id) that clash with another
+# coordinator's phone or email; a coordinator never clashes with itself.
+COORDINATOR_CONFLICT_QUERY = """
+    SELECT 1
+    FROM coordinator c
+    JOIN unnest($1::text[], $2::text[], $3::int[]) AS s(phone, email, id)
+      ON (c.coordinator_phone = s.phone OR c.coordinator_email ILIKE s.email)
+     AND c.id IS DISTINCT FROM s.id
+    LIMIT 1
+"""
+
+SERVICE_COLUMNS = """
+    am_time_start, am_time_end, pm_time_start, pm_time_end,
+    noc_time_start, noc_time_end, am_meal_start, am_meal_end,
+    pm_meal_start, pm_meal_end, noc_meal_start, noc_meal_end,
+    rate, hours, facility_id, role
+"""
+
+INSERT_SERVICE_QUERY = f"""
+    INSERT INTO shifts ({SERVICE_COLUMNS})
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16)
+"""
+
+UPDATE_SERVICE_QUERY = """
+    UPDATE shifts
+    SET am_time_start = $1, am_time_end = $2,
+        pm_time_start = $3, pm_time_end = $4,
+        noc_time_start = $5, noc_time_end = $6,
+        am_meal_start = $7, am_meal_end = $8,
+        pm_meal_start = $9, pm_meal_end = $10,
+        noc_meal_start = $11, noc_meal_end = $12,
+        rate = $13, hours = $14
+    WHERE facility_id = $15 AND role = $16
+"""
+
+INSERT_COORDINATOR_QUERY = """
+    INSERT INTO coordinator (
+        facility_id, coordinator_first_name, coordinator_last_name,
+        coordinator_phone, coordinator_email
+    ) VALUES ($1, $2, $3, $4, $5)
+"""
+
+UPDATE_COORDINATOR_QUERY = """
+    UPDATE coordinator
+    SET coordinator_first_name = $2, coordinator_last_name = $3,
+        coordinator_phone = $4, coordinator_email = $5
+    WHERE id = $1
+"""
+
+def service_params(facility_id: int, nurse: dict) -> tuple:
+    """Arguments of INSERT_/UPDATE_SERVICE_QUERY for one submitted nurse type."""
+    work_ms = time_str_to_ms(nurse["amTimeEnd"]) - time_str_to_ms(nurse["amTimeStart"])
+    meal_ms = time_str_to_ms(nurse["amMealEnd"]) - time_str_to_ms(nurse["amMealStart"])
+    hours = (work_ms - meal_ms) / (1000 * 60 * 60)
+    return (
+        parse_time(nurse["amTimeStart"]), parse_time(nurse["amTimeEnd"]),
+        parse_time(nurse["pmTimeStart"]), parse_time(nurse["pmTimeEnd"]),
+        parse_time(nurse["nocTimeStart"]), parse_time(nurse["nocTimeEnd"]),
+        parse_time(nurse["amMealStart"]), parse_time(nurse["amMealEnd"]),
+        parse_time(nurse["pmMealStart"]), parse_time(nurse["pmMealEnd"]),
+        parse_time(nurse["nocMealStart"]), parse_time(nurse["nocMealEnd"]),
+        nurse["rate"], hours, facility_id, nurse["nurseType"]
+    )
+
+def unique_services(nurses: list) -> list:
+    """Submitted nurse types with repeats collapsed; the last entry for a role wins."""
+    return list({nurse["nurseType"]: nurse for nurse in nurses}.values())
+
+async def coordinators_conflict(conn, coordinators: list) -> bool:
+    if not coordinators:
+        return False
+    return bool(await conn.fetchrow(
+        COORDINATOR_CONFLICT_QUERY,
+        [c.get("phone") for c in coordinators],
+        [c.get("email") for c in coordinators],
+        [c.get("id") for c in coordinators],
+    ))
+
 async def admin_add_facility(request: Request, response: Response):
-    conn = db
     try:
         body = await request.json()
 
@@ -31,69 +114,42 @@ async def admin_add_facility(request: Request, response: Response):
         address = body.get("address")
         cityStateZip = body.get("cityStateZip")
         multiplier = body.get("multiplier")
-        nurses = body.get("nurses", [])
+        nurses = unique_services(body.get("nurses", []))
         coordinators = body.get("coordinators", [])
 
-        await conn.execute("BEGIN")
-
         # Check for duplicate coordinator phone/email
-        for coordinator in coordinators:
-            phone = coordinator.get("phone")
-            email = coordinator.get("email")
-            exists = await conn.fetchrow("""
-                SELECT 1 FROM coordinator
-                WHERE coordinator_phone = $1 OR coordinator_email ILIKE $2
-            """, phone, email)
-            if exists:
-                await conn.execute("ROLLBACK")
-                return {"message": "Facility with this phone or email already exists", "status": 400}
+        if await coordinators_conflict(db, coordinators):
+            return {"message": "Facility with this phone or email already exists", "status": 400}
 
+        # Geocode before pinning a connection for the writes.
         geo = await geo_lat_lng(cityStateZip)
         lat, lng = geo.get("lat"), geo.get("lng")
 
-        facility_row = await conn.fetchrow("""
-            INSERT INTO facilities (name, address, city_state_zip, overtime_multiplier, lat, lng)
-            VALUES ($1, $2, $3, $4, $5, $6)
-            RETURNING id
-        """, name, address, cityStateZip, multiplier, lat, lng)
-        facility_id = facility_row["id"]
-
-        for nurse in nurses:
-            work_ms = time_str_to_ms(nurse["amTimeEnd"]) - time_str_to_ms(nurse["amTimeStart"])
-            meal_ms = time_str_to_ms(nurse["amMealEnd"]) - time_str_to_ms(nurse["amMealStart"])
-            hours = (work_ms - meal_ms) / (1000 * 60 * 60)
-
-            await conn.execute("""
-                INSERT INTO shifts
-                (facility_id, role, am_time_start, am_time_end, pm_time_start, pm_time_end,
-                noc_time_start, noc_time_end, am_meal_start, am_meal_end, pm_meal_start,
-                pm_meal_end, noc_meal_start, noc_meal_end, rate, hours)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16)
-            """, 
-                facility_id, nurse["nurseType"],
-                parse_time(nurse["amTimeStart"]), parse_time(nurse["amTimeEnd"]),
-                parse_time(nurse["pmTimeStart"]), parse_time(nurse["pmTimeEnd"]),
-                parse_time(nurse["nocTimeStart"]), parse_time(nurse["nocTimeEnd"]),
-                parse_time(nurse["amMealStart"]), parse_time(nurse["amMealEnd"]),
-                parse_time(nurse["pmMealStart"]), parse_time(nurse["pmMealEnd"]),
-                parse_time(nurse["nocMealStart"]), parse_time(nurse["nocMealEnd"]),
-                nurse["rate"], hours
-            )
-
-        for coordinator in coordinators:
-            await conn.execute("""
-                INSERT INTO coordinator (facility_id, coordinator_first_name, coordinator_last_name, coordinator_phone, coordinator_email)
-                VALUES ($1, $2, $3, $4, $5)
-            """, 
-                facility_id, coordinator["firstName"], coordinator["lastName"],
-                coordinator["phone"], coordinator["email"]
-            )
-
-        await conn.execute("COMMIT")
+        async with db.transaction() as conn:
+            facility_row = await conn.fetchrow("""
+                INSERT INTO facilities (name, address, city_state_zip, overtime_multiplier, lat, lng)
+                VALUES ($1, $2, $3, $4, $5, $6)
+                RETURNING id
+            """, name, address, cityStateZip, multiplier, lat, lng)
+            facility_id = facility_row["id"]
+
+            if nurses:
+                await conn.executemany(
+                    INSERT_SERVICE_QUERY, [service_params(facility_id, nurse) for nurse in nurses]
+                )
+            if coordinators:
+                await conn.executemany(INSERT_COORDINATOR_QUERY, [
+                    (facility_id, c["firstName"], c["lastName"], c["phone"], c["email"])
+                    for c in coordinators
+                ])
+
+        await refresh_facility_eligibility(facility_id)
+        count_cache.invalidate("facilities", "coordinator")
+        reference_cache.invalidate_facility(facility_id)
+        sender_resolver.invalidate("coordinator")
         return {"message": "Facility added successfully", "status": 200}
 
     except Exception as e:
-        await conn.execute("ROLLBACK")
         print("Facility add error:", e)
         return {"message": "Server error", "status": 500}
 
@@ -107,140 +163,133 @@ def parse_time(t: Optional[str]):
     return datetime.strptime(t, "%H:%M").time() if t else None
 
 async def admin_edit_facility(request: Request, response: Response, facility_id: int):
-    conn = db
     try:
         body = await request.json()
         name = body.get("name")
         address = body.get("address")
         cityStateZip = body.get("cityStateZip")
         multiplier = body.get("multiplier")
-        nurses = body.get("nurses", [])
+        nurses = unique_services(body.get("nurses", []))
         coordinators = body.get("coordinators", [])
 
-        await conn.execute("BEGIN")
-
         # Check for duplicate coordinator phone/email
-        for coordinator in coordinators:
-            check = await conn.fetchrow("""
-                SELECT 1 FROM coordinator
-                WHERE (coordinator_phone = $1 OR coordinator_email ILIKE $2) AND id != $3
-            """, coordinator["phone"], coordinator["email"], coordinator.get("id"))
-            if check:
-                await conn.execute("ROLLBACK")
-                return {"message": "Facility with this phone number or email already exists", "status": 400}
-
-        # Check if cityStateZip has changed → update lat/lng
-        existing = await conn.fetchrow("SELECT city_state_zip FROM facilities WHERE id = $1", facility_id)
-        if existing and existing["city_state_zip"] != cityStateZip:
+        if await coordinators_conflict(db, coordinators):
+            return {"message": "Facility with this phone number or email already exists", "status": 400}
+
+        # Check if cityStateZip has changed → update lat/lng (geocoded outside the transaction)
+        existing = await db.fetchrow("SELECT city_state_zip FROM facilities WHERE id = $1", facility_id)
+        location_changed = bool(existing) and existing["city_state_zip"] != cityStateZip
+        lat = lng = None
+        if location_changed:
             geo = await geo_lat_lng(cityStateZip)
             print("Geo data:", geo)
             lat = geo.get("lat")
             lng = geo.get("lng")
+
+        async with db.transaction() as conn:
+            # Update facility main fields (and the location when it moved)
             await conn.execute("""
                 UPDATE facilities
-                SET lat = $1, lng = $2
-                WHERE id = $3
-            """, lat, lng, facility_id)
-
-        # Update facility main fields
-        await conn.execute("""
-            UPDATE facilities
-            SET name = $1, address = $2, city_state_zip = $3, overtime_multiplier = $4
-            WHERE id = $5
-        """, name, address, cityStateZip, multiplier, facility_id)
-
-        # Update or insert shifts
-        for nurse in nurses:
-            work_ms = time_str_to_ms(nurse["amTimeEnd"]) - time_str_to_ms(nurse["amTimeStart"])
-            meal_ms = time_str_to_ms(nurse["amMealEnd"]) - time_str_to_ms(nurse["amMealStart"])
-            hours = (work_ms - meal_ms) / (1000 * 60 * 60)
-
-            shift = await conn.fetchrow("""
-                SELECT id FROM shifts
-                WHERE facility_id = $1 AND role = $2
-            """, facility_id, nurse["nurseType"])
-
-            shift_params = [
-                parse_time(nurse["amTimeStart"]), parse_time(nurse["amTimeEnd"]),
-                parse_time(nurse["pmTimeStart"]), parse_time(nurse["pmTimeEnd"]),
-                parse_time(nurse["nocTimeStart"]), parse_time(nurse["nocTimeEnd"]),
-                parse_time(nurse["amMealStart"]), parse_time(nurse["amMealEnd"]),
-                parse_time(nurse["pmMealStart"]), parse_time(nurse["pmMealEnd"]),
-                parse_time(nurse["nocMealStart"]), parse_time(nurse["nocMealEnd"]),
-                nurse["rate"], hours, facility_id, nurse["nurseType"]
+                SET name = $1, address = $2, city_state_zip = $3, overtime_multiplier = $4,
+                    lat = CASE WHEN $6 THEN $7 ELSE lat END,
+                    lng = CASE WHEN $6 THEN $8 ELSE lng END
+                WHERE id = $5
+            """, name, address, cityStateZip, multiplier, facility_id, location_changed, lat, lng)
+
+            # Update existing shifts and insert new ones
+            existing_roles = {
+                row["role"] for row in await conn.fetch("SELECT role FROM shifts WHERE facility_id = $1", facility_id)
+            }
+            updates, inserts = [], []
+            for nurse in nurses:
+                params = service_params(facility_id, nurse)
+                (updates if nurse["nurseType"] in existing_roles else inserts).append(params)
+            if updates:
+                await conn.executemany(UPDATE_SERVICE_QUERY, updates)
+            if inserts:
+                await conn.executemany(INSERT_SERVICE_QUERY, inserts)
+
+            # Update or insert coordinators
+            coordinator_updates = [
+                (c["id"], c["firstName"], c["lastName"], c["phone"], c["email"])
+                for c in coordinators if c.get("id")
             ]
-
-            if shift:
-                await conn.execute("""
-                    UPDATE shifts
-                    SET am_time_start = $1, am_time_end = $2,
-                        pm_time_start = $3, pm_time_end = $4,
-                        noc_time_start = $5, noc_time_end = $6,
-                        am_meal_start = $7, am_meal_end = $8,
-                        pm_meal_start = $9, pm_meal_end = $10,
-                        noc_meal_start = $11, noc_meal_end = $12,
-                        rate = $13, hours = $14
-                    WHERE facility_id = $15 AND role = $16
-                """, *shift_params)
-            else:
-                await conn.execute("""
-                    INSERT INTO shifts (
-                        am_time_start, am_time_end, pm_time_start, pm_time_end,
-                        noc_time_start, noc_time_end, am_meal_start, am_meal_end,
-                        pm_meal_start, pm_meal_end, noc_meal_start, noc_meal_end,
-                        rate, hours, facility_id, role
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8,
-                        $9, $10, $11, $12, $13, $14, $15, $16
-                    )
-                """, *shift_params)
-
-        # Update or insert coordinators
-        for coordinator in coordinators:
-            if coordinator.get("id"):
-                await conn.execute("""
-                    UPDATE coordinator
-                    SET coordinator_first_name = $2, coordinator_last_name = $3,
-                        coordinator_phone = $4, coordinator_email = $5
-                    WHERE id = $1
-                """, coordinator["id"], coordinator["firstName"], coordinator["lastName"],
-                     coordinator["phone"], coordinator["email"])
-            else:
-                await conn.execute("""
-                    INSERT INTO coordinator (
-                        facility_id, coordinator_first_name, coordinator_last_name,
-                        coordinator_phone, coordinator_email
-                    ) VALUES ($1, $2, $3, $4, $5)
-                """, facility_id, coordinator["firstName"], coordinator["lastName"],
-                     coordinator["phone"], coordinator["email"])
-
-        await conn.execute("COMMIT")
+            coordinator_inserts = [
+                (facility_id, c["firstName"], c["lastName"], c["phone"], c["email"])
+                for c in coordinators if not c.get("id")
+            ]
+            if coordinator_updates:
+                await conn.executemany(UPDATE_COORDINATOR_QUERY, coordinator_updates)
+            if coordinator_inserts:
+                await conn.executemany(INSERT_COORDINATOR_QUERY, coordinator_inserts)
+
+        if location_changed:
+            await refresh_facility_eligibility(facility_id)
+        count_cache.invalidate("facilities", "coordinator")
+        reference_cache.invalidate_facility(facility_id)
+        sender_resolver.invalidate("coordinator")
         return {"message": "Facility edited successfully", "status": 200}
 
     except Exception as e:
-        await conn.execute("ROLLBACK")
         print("Edit Facility Error:", e)
         return {"message": "Server error", "status": 500}
 
 
+FACILITY_SORT_KEY = ["name", "id"]
+
+async def get_facilities_by_cursor(query_params, search: Optional[str]):
+    limit = page_size(query_params)
+    try:
+        after = decode_cursor(query_params.get("cursor"), len(FACILITY_SORT_KEY))
+    except ValueError:
+        return JSONResponse(status_code=400, content={"message": "Invalid cursor", "status": 400})
+
+    conditions = []
+    values = []
+    if search:
+        values.append(search_pattern(search))
+        conditions.append(FACILITY_SEARCH_FILTER)
+    if after:
+        conditions.append(keyset_predicate(FACILITY_SORT_KEY, False, len(values) + 1))
+        values += after
+
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    values.append(limit + 1)
+    rows = await db.fetch(f"""
+        SELECT * FROM facilities
+        {where_clause}
+        ORDER BY {", ".join(FACILITY_SORT_KEY)}
+        LIMIT ${len(values)}
+    """, *values)
+    rows, next_cursor = split_page(rows, limit, FACILITY_SORT_KEY)
+
+    return JSONResponse(content={
+        "facilities": [serialize_row(row) for row in rows],
+        "pagination": {"limit": limit, "nextCursor": next_cursor},
+        "status": 200
+    })
+
 async def admin_get_facilities(request: Request, response: Response):
     conn = db
 
     try:
         query_params = request.query_params
         search = query_params.get("search")
+        if wants_cursor(query_params):
+            return await get_facilities_by_cursor(query_params, search)
+
         page = int(query_params.get("page", 1))
         limit = int(query_params.get("limit", 10))
         no_pagination = query_params.get("noPagination") == "true"
 
-        search_term = f"%{search}%" if search else None
+        search_term = search_pattern(search) if search else None
 
         base_query = """
             FROM facilities
         """
         if search_term:
-            base_query += """
-                WHERE name ILIKE $1 OR city_state_zip ILIKE $1 OR address ILIKE $1
+            base_query += f"""
+                WHERE {FACILITY_SEARCH_FILTER}
             """
 
         if no_pagination:
@@ -252,8 +301,9 @@ async def admin_get_facilities(request: Request, response: Response):
 
         # Total count query
         count_query = f"SELECT COUNT(*) {base_query}"
-        count_row = await conn.fetchrow(count_query, search_term) if search_term else await conn.fetchrow(count_query)
-        total = int(count_row["count"])
+        total, approximate = await count_cache.count(
+            "facilities", search, count_query, *([search_term] if search_term else []), table="facilities"
+        )
 
         # Paginated data query
         data_query = f"""
@@ -268,6 +318,7 @@ async def admin_get_facilities(request: Request, response: Response):
             "facilities": [serialize_row(row) for row in rows],
             "pagination": {
                 "total": total,
+                "totalApproximate": approximate,
                 "page": page,
                 "limit": limit,
                 "totalPages": (total + limit - 1) // limit
@@ -301,6 +352,9 @@ async def admin_get_facility_by_id(request: Request, response: Response, id: int
 async def admin_delete_facility(request: Request, response: Response, id: int):
     try:
         await db.execute("DELETE FROM facilities WHERE id = $1", id)
+        count_cache.invalidate("facilities", "shift_tracker")
+        reference_cache.invalidate_facility(id)
+        sender_resolver.invalidate("coordinator")
         return JSONResponse(content={"message": "Facility deleted successfully", "status": 200})
     except Exception as e:
         print("Error deleting facility:", e)
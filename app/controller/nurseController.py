@@ -1,8 +1,15 @@
 from app.database import db
+from app.models.queries import SHIFT_FACILITY_ID, NURSE_CHAT_INSERT
+import os
 import json
 import re
-from app.utils.send_message import send_message
-from app.helper.promptHelper import generate_message_for_nurse_ai
+from app.utils.outbox import enqueue_message
+from app.helper.promptHelper import generate_message_for_nurse_ai, generate_messages_for_nurses_ai
+from app.helper.outreachHelper import fan_out, run_in_background, SENT, SKIPPED, OUTREACH_CONCURRENCY
+from app.utils.parse_ai_json import parse_ai_json
+from app.helper.chatHistory import get_history
+from app.helper.intentClassifier import classify_nurse_message, set_pending_date_choice
+from app.helper.messageTemplates import render_shift_opening_message, render_shift_series_message, use_llm_for_outreach, get_nurses_worked_at_facility
 import asyncio
 from datetime import datetime
 from fastapi import HTTPException
@@ -14,89 +21,275 @@ from app.utils.geo_lat_lng import geo_lat_lng
 from datetime import datetime
 from fastapi import Request, Response, HTTPException
 import logging
-from app.utils.serialize_row import serialize_row
+from app.utils.serialize_row import serialize_row, public_row
 from app.utils.convert_mm_dd_yyyy_to_mm_dd import convert_to_md
+from app.utils.geo_radius import radius_filter, radius_params, NURSE_RADIUS_MILES
+from app.helper.nurseIndex import nurse_index
+from app.helper.searchIndex import search_pattern, NURSE_SEARCH_FILTER
+from app.utils.count_cache import count_cache
+from app.helper.referenceCache import reference_cache
+from app.helper.senderResolver import Principal, sender_resolver
+from app.utils.pagination import wants_cursor, page_size, decode_cursor, keyset_predicate, split_page
+from app.helper.nurseImport import import_nurse_roster
+from app.helper.eligibility import (
+    get_eligible_nurses, refresh_nurse_eligibility, rename_nurse_type,
+)
 
 logger = logging.getLogger(__name__)
 
+NURSES_IN_RADIUS_QUERY = f"""
+    SELECT n.*
+    FROM nurses n
+    WHERE n.nurse_type ILIKE $1
+      AND n.shift ILIKE $2
+      AND {radius_filter("n", 3)}
+"""
+
+async def find_nurses_in_radius(nurse_type: str, shift: str, lat: float, lng: float):
+    # Only used when the eligibility table fails: the in-memory index (loaded on first
+    # use here), then the indexed SQL search if the index cannot load either.
+    if await nurse_index.ensure_fresh():
+        matches = nurse_index.within(lat, lng, NURSE_RADIUS_MILES, nurse_type, shift)
+        if not matches:
+            return []
+        return await db.fetch("SELECT * FROM nurses WHERE id = ANY($1::int[])", [nurse_id for nurse_id, _ in matches])
+
+    # Bounding box first, exact distance on survivors
+    return await db.fetch(NURSES_IN_RADIUS_QUERY, nurse_type, shift, *radius_params(lat, lng))
+
+async def find_eligible_nurses(facility_id: int, nurse_type: str, shift: str, lat: float, lng: float):
+    try:
+        return await get_eligible_nurses(facility_id, nurse_type, shift)
+    except Exception as e:
+        # Eligibility table unavailable; answer from the geometry instead.
+        logger.error("Eligibility lookup failed for facility %s: %s", facility_id, e)
+        return await find_nurses_in_radius(nurse_type, shift, lat, lng)
+
 async def search_nurses(nurse_type: str, shift: str, shift_id: int):
     try:
         # Get shift info including facility_id
-        shift_row = await db.fetchrow(
-            "SELECT facility_id FROM shift_tracker WHERE id = $1", shift_id
-        )
+        shift_row = await db.fetchrow_named(SHIFT_FACILITY_ID, shift_id)
         if not shift_row:
             raise ValueError("Shift not found.")
         facility_id = shift_row["facility_id"]
 
         # Get facility location
-        facility = await db.fetchrow(
-            "SELECT lat, lng FROM facilities WHERE id = $1", facility_id
-        )
+        facility = await reference_cache.facility(facility_id)
         if not facility or not facility["lat"] or not facility["lng"]:
             raise ValueError("Facility does not have valid coordinates.")
 
         lat = facility["lat"]
         lng = facility["lng"]
 
-        # Search nurses within 50 miles radius using Haversine
-        query = """
-            SELECT n.*
-            FROM nurses n
-            WHERE n.nurse_type ILIKE $1
-              AND n.shift ILIKE $2
-              AND (
-                3959 * acos(
-                  cos(radians($3)) * cos(radians(n.lat)) *
-                  cos(radians(n.lng) - radians($4)) +
-                  sin(radians($3)) * sin(radians(n.lat))
-                )
-              ) <= 50
-        """
-        nurses = await db.fetch(query, nurse_type, shift, lat, lng)
-        return nurses
+        return await find_eligible_nurses(facility_id, nurse_type, shift, lat, lng)
 
     except Exception as e:
         print("Error searching nurses:", e)
         return []
 
-async def send_nurses_message(nurses, nurse_type: str, shift: str, shift_id: int, date: str, additional_instructions: str):
-    for nurse in nurses:
-        phone_number = nurse["mobile_number"]
-        print(f"Sending message to nurse: {phone_number}")
-        nurse_availability = await check_nurse_availability(nurse["id"], shift_id)
-        if not nurse_availability:
+OUTREACH_BATCH_SIZE = int(os.getenv("OUTREACH_BATCH_SIZE", "25"))
+
+def parse_batch_messages(raw_response, nurse_ids) -> dict:
+    """Keep only well-formed ``{"nurse_id", "message"}`` entries for requested nurses."""
+    if not isinstance(raw_response, str):
+        return {}
+    try:
+        entries = parse_ai_json(raw_response)
+    except json.JSONDecodeError as e:
+        print("Failed to parse batch AI reply:", e)
+        return {}
+    if isinstance(entries, dict):
+        entries = entries.get("messages", [])
+    if not isinstance(entries, list):
+        return {}
+
+    wanted = set(nurse_ids)
+    messages = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
             continue
+        try:
+            nurse_id = int(entry.get("nurse_id"))
+        except (TypeError, ValueError):
+            continue
+        message = entry.get("message")
+        if nurse_id in wanted and nurse_id not in messages and isinstance(message, str) and message.strip():
+            messages[nurse_id] = message.strip()
+    return messages
 
-        past_messages = await get_nurse_chat_data(phone_number)
+async def generate_outreach_messages(nurses_past_messages: dict, nurse_type: str, shift: str, shift_id: int, date: str, additional_instructions: str) -> dict:
+    nurse_ids = list(nurses_past_messages)
+    chunks = [nurse_ids[i:i + OUTREACH_BATCH_SIZE] for i in range(0, len(nurse_ids), OUTREACH_BATCH_SIZE)]
 
-        raw_response = await generate_message_for_nurse_ai(
+    async def generate_chunk(chunk):
+        raw_response = await generate_messages_for_nurses_ai(
             nurse_type=nurse_type,
             shift=shift,
             date=date,
-            past_messages=past_messages,
+            nurses_past_messages={nurse_id: nurses_past_messages[nurse_id] for nurse_id in chunk},
             shift_id=shift_id,
             additional_instructions=additional_instructions
         )
+        return parse_batch_messages(raw_response, chunk)
+
+    messages = {}
+    for chunk_messages in await asyncio.gather(*[generate_chunk(chunk) for chunk in chunks]):
+        messages.update(chunk_messages)
+    return messages
+
+async def generate_single_outreach_message(past_messages, nurse_type: str, shift: str, shift_id: int, date: str, additional_instructions: str) -> str:
+    raw_response = await generate_message_for_nurse_ai(
+        nurse_type=nurse_type,
+        shift=shift,
+        date=date,
+        past_messages=past_messages,
+        shift_id=shift_id,
+        additional_instructions=additional_instructions
+    )
+    message_data = parse_ai_json(raw_response)
+    return message_data.get("message", "")
+
+async def render_outreach_messages(nurses, nurse_type: str, shift: str, shift_id: int, date: str, additional_instructions: str) -> dict:
+    shift_row = await db.fetchrow("""
+        SELECT st.facility_id, f.name
+        FROM shift_tracker st
+        JOIN facilities f ON f.id = st.facility_id
+        WHERE st.id = $1
+    """, shift_id)
+    if not shift_row:
+        return {}
+
+    nurse_ids = [n["id"] for n in nurses]
+    worked_before = await get_nurses_worked_at_facility(nurse_ids, shift_row["facility_id"], exclude_shift_id=shift_id)
+    formatted_date = convert_to_md(datetime.strptime(date, "%Y-%m-%d").date())
+    return {
+        nurse_id: render_shift_opening_message(
+            nurse_type, shift_row["name"], shift, formatted_date,
+            worked_before=nurse_id in worked_before,
+            additional_instructions=additional_instructions
+        )
+        for nurse_id in nurse_ids
+    }
+
+async def get_booked_nurse_ids(nurse_ids: list[int], shift_id: int) -> set:
+    rows = await db.fetch("""
+        SELECT DISTINCT st.nurse_id
+        FROM shift_tracker st
+        WHERE st.nurse_id = ANY($1::int[])
+          AND st.date = (SELECT date FROM shift_tracker WHERE id = $2)
+    """, nurse_ids, shift_id)
+    return {row["nurse_id"] for row in rows}
 
-        message_text = raw_response.strip()
-        # Clean ```json or ``` if present
-        if message_text.startswith("```json"):
-            message_text = re.sub(r"```json|```", "", message_text).strip()
-        elif message_text.startswith("```"):
-            message_text = re.sub(r"```", "", message_text).strip()
+async def send_nurses_message(nurses, nurse_type: str, shift: str, shift_id: int, date: str, additional_instructions: str):
+    nurses = list(nurses)
+    booked = await get_booked_nurse_ids([n["id"] for n in nurses], shift_id) if nurses else set()
+    available = [n for n in nurses if n["id"] not in booked]
+
+    semaphore = asyncio.Semaphore(OUTREACH_CONCURRENCY)
+
+    async def load_history(nurse):
+        async with semaphore:
+            return nurse["id"], await get_nurse_chat_data(nurse["mobile_number"])
+
+    if use_llm_for_outreach(additional_instructions):
+        # One history fetch per nurse, then one model call per batch of nurses.
+        past_messages = dict(await asyncio.gather(*[load_history(n) for n in available]))
+        messages = await generate_outreach_messages(past_messages, nurse_type, shift, shift_id, date, additional_instructions) if available else {}
+    else:
+        # Plain openings are rendered locally, no model call or history needed.
+        past_messages = {}
+        messages = await render_outreach_messages(available, nurse_type, shift, shift_id, date, additional_instructions)
+
+    async def message_nurse(nurse):
+        if nurse["id"] in booked:
+            return SKIPPED
+        phone_number = nurse["mobile_number"]
+        print(f"Sending message to nurse: {phone_number}")
 
-        try:
-            message_data = json.loads(message_text)
-            ai_message = message_data.get("message", "")
-        except json.JSONDecodeError as e:
-            print("Failed to parse AI reply:", e)
-            continue
+        ai_message = messages.get(nurse["id"])
+        if not ai_message and nurse["id"] in past_messages:
+            # Entry missing or invalid in the batch reply, draft this one on its own.
+            ai_message = await generate_single_outreach_message(
+                past_messages[nurse["id"]], nurse_type, shift, shift_id, date, additional_instructions
+            )
+        if not ai_message:
+            return SKIPPED
 
-        if ai_message:
-            await update_nurse_chat_history(phone_number, ai_message, "sent")
-            asyncio.create_task(send_message(phone_number, ai_message)) 
+        await update_nurse_chat_history(phone_number, ai_message, "sent")
+        await enqueue_message(phone_number, ai_message)
+        return SENT
 
+    return await fan_out(shift_id, nurses, message_nurse)
+
+async def nurse_outreach(nurse_type: str, shift: str, shift_id: int, date: str, additional_instructions: str, exclude_phone: str = None):
+    try:
+        nurses = await search_nurses(nurse_type, shift, shift_id)
+        if exclude_phone:
+            nurses = [n for n in nurses if n["mobile_number"] != exclude_phone]
+        print("Nurses found:", len(nurses))
+        await send_nurses_message(nurses, nurse_type, shift, shift_id, date, additional_instructions)
+    except Exception as e:
+        print("Error in nurse outreach:", e)
+
+def start_nurse_outreach(nurse_type: str, shift: str, shift_id: int, date: str, additional_instructions: str, exclude_phone: str = None):
+    return run_in_background(
+        nurse_outreach(nurse_type, shift, shift_id, date, additional_instructions, exclude_phone)
+    )
+
+
+async def series_outreach(facility_id: int, shifts: list[dict]):
+    """Outreach for many new shifts at one facility: one message per nurse.
+
+    Shifts are grouped by nurse type and shift; every eligible nurse gets a
+    single message listing the group's dates they are not already booked on,
+    instead of one message per shift.
+    """
+    try:
+        facility = await reference_cache.facility(facility_id)
+        if not facility or not facility["lat"] or not facility["lng"]:
+            raise ValueError("Facility does not have valid coordinates.")
+
+        groups = {}
+        for row in shifts:
+            groups.setdefault((row["nurse_type"].lower(), row["shift"].lower()), []).append(row)
+
+        for group in groups.values():
+            nurse_type, shift = group[0]["nurse_type"], group[0]["shift"]
+            dates = sorted({row["date"] for row in group})
+            notes = next((row["additional_instructions"] for row in group if row["additional_instructions"]), None)
+
+            nurses = await find_eligible_nurses(facility_id, nurse_type, shift, facility["lat"], facility["lng"])
+            nurse_ids = [n["id"] for n in nurses]
+            booked = await db.fetch("""
+                SELECT nurse_id, date
+                FROM shift_tracker
+                WHERE nurse_id = ANY($1::int[]) AND date = ANY($2::date[])
+            """, nurse_ids, dates) if nurse_ids else []
+            booked_dates = {}
+            for row in booked:
+                booked_dates.setdefault(row["nurse_id"], set()).add(row["date"])
+            worked_before = await get_nurses_worked_at_facility(nurse_ids, facility_id)
+            print("Nurses found:", len(nurses), "for", len(dates), "dates")
+
+            async def message_nurse(nurse):
+                open_dates = [d for d in dates if d not in booked_dates.get(nurse["id"], ())]
+                if not open_dates:
+                    return SKIPPED
+                message = render_shift_series_message(
+                    nurse_type, facility["name"], shift, [convert_to_md(d) for d in open_dates],
+                    worked_before=nurse["id"] in worked_before, additional_instructions=notes
+                )
+                await update_nurse_chat_history(nurse["mobile_number"], message, "sent")
+                await enqueue_message(nurse["mobile_number"], message)
+                return SENT
+
+            # One run per group; its progress is readable through any shift id of the group.
+            await fan_out(group[0]["id"], nurses, message_nurse, related_shift_ids=[row["id"] for row in group[1:]])
+    except Exception as e:
+        print("Error in series outreach:", e)
+
+def start_series_outreach(facility_id: int, shifts: list[dict]):
+    return run_in_background(series_outreach(facility_id, shifts))
 
 async def check_nurse_availability(nurse_id: int, shift_id: int) -> bool:
     try:
@@ -127,39 +320,24 @@ async def check_nurse_availability(nurse_id: int, shift_id: int) -> bool:
 
 async def update_nurse_chat_history(sender: str, text: str, msg_type: str) -> None:
     try:
-        await db.execute("""
-            INSERT INTO nurse_chat_data
-            (mobile_number, message, message_type)
-            VALUES ($1, $2, $3)
-        """, sender, text, msg_type)
+        await db.execute_named(NURSE_CHAT_INSERT, sender, text, msg_type)
     except Exception as err:
         print('Error updating nurse chat history:', err)
     
 async def get_nurse_chat_data(sender: str) -> list[str]:
     try:
-        rows = await db.fetch("""
-            SELECT message
-            FROM nurse_chat_data
-            WHERE mobile_number = $1
-            LIMIT 50
-        """, sender)
-        return [row['message'] for row in rows]
+        return await get_history("nurse", sender)
     except Exception as error:
         print("Error getting nurse chat data:", error)
         return []
 
-async def follow_up_reply(sender: str, message: str) -> dict:
+async def follow_up_reply(nurse: Principal, message: str) -> dict:
     try:
-        # Step 1: Get nurse_id using sender (mobile number)
-        nurse = await db.fetchrow("""
-            SELECT id
-            FROM nurses
-            WHERE mobile_number = $1
-        """, sender)
+        # Step 1: The nurse resolved from the sender
         if not nurse:
             raise ValueError("Nurse not found for the given phone number.")
 
-        nurse_id = nurse['id']
+        nurse_id = nurse.id
 
         # Step 2: Get coordinator_id from today's shift for this nurse
         shift = await db.fetchrow("""
@@ -174,11 +352,7 @@ async def follow_up_reply(sender: str, message: str) -> dict:
         coordinator_id = shift['coordinator_id']
 
         # Step 3: Get coordinator contact details
-        coordinator = await db.fetchrow("""
-            SELECT coordinator_email, coordinator_phone
-            FROM coordinator
-            WHERE id = $1
-        """, coordinator_id)
+        coordinator = await reference_cache.coordinator(coordinator_id)
         if not coordinator:
             raise ValueError("Coordinator not found.")
 
@@ -186,7 +360,7 @@ async def follow_up_reply(sender: str, message: str) -> dict:
         coordinator_phone = coordinator['coordinator_phone']
 
         # Step 4: Send message
-        asyncio.create_task(send_message(coordinator_phone, message)) 
+        await enqueue_message(coordinator_phone, message) 
 
         return {
             "coordinator_email": coordinator_email,
@@ -197,33 +371,46 @@ async def follow_up_reply(sender: str, message: str) -> dict:
         print("Error in follow_up_reply:", e)
         return {}
 
-async def get_nurse_info(nurse_phone: str) -> dict:
-    try:
-        print(nurse_phone)
-        print(len(nurse_phone))
-
-        nurse = await db.fetchrow("""
-            SELECT nurse_type, shift
-            FROM nurses
-            WHERE mobile_number = $1
-        """, nurse_phone)
+NURSE_SORT_KEY = ["last_name", "first_name", "id"]
 
-        if not nurse:
-            raise ValueError("Nurse not found.")
-
-        return {
-            "nurse_type": nurse["nurse_type"],
-            "shift": nurse["shift"]
-        }
+async def get_nurses_by_cursor(params, search: str):
+    limit = page_size(params)
+    try:
+        after = decode_cursor(params.get("cursor"), len(NURSE_SORT_KEY))
+    except ValueError:
+        return {"message": "Invalid cursor", "status": 400}
+
+    conditions = []
+    values = []
+    if search:
+        values.append(search_pattern(search))
+        conditions.append(NURSE_SEARCH_FILTER)
+    if after:
+        conditions.append(keyset_predicate(NURSE_SORT_KEY, False, len(values) + 1))
+        values += after
+
+    where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+    values.append(limit + 1)
+    rows = await db.fetch(f"""
+        SELECT * FROM nurses{where_clause}
+        ORDER BY {", ".join(NURSE_SORT_KEY)}
+        LIMIT ${len(values)}
+    """, *values)
+    rows, next_cursor = split_page(rows, limit, NURSE_SORT_KEY)
+
+    return {
+        "nurses": [public_row(row) for row in rows],
+        "pagination": {"limit": limit, "nextCursor": next_cursor},
+        "status": 200
+    }
 
-    except Exception as e:
-        print("Error in get_nurse_info:", e)
-        return {}
-    
 async def admin_get_nurses(request: Request, response: Response):
     conn = db
     try:
         params = request.query_params
+        if wants_cursor(params):
+            return await get_nurses_by_cursor(params, params.get("search", "").strip())
+
         page = int(params.get("page", 1))
         limit = int(params.get("limit", 10))
         offset = (page - 1) * limit
@@ -235,11 +422,8 @@ async def admin_get_nurses(request: Request, response: Response):
         conditions = []
 
         if search:
-            conditions.append("""
-                (first_name ILIKE $1 OR last_name ILIKE $1 OR email ILIKE $1 
-                OR mobile_number ILIKE $1 OR shift ILIKE $1 OR nurse_type ILIKE $1)
-            """)
-            query_params.append(f"%{search}%")
+            conditions.append(NURSE_SEARCH_FILTER)
+            query_params.append(search_pattern(search))
 
         if conditions:
             where_clause = " WHERE " + " AND ".join(conditions)
@@ -251,17 +435,19 @@ async def admin_get_nurses(request: Request, response: Response):
         query_params += [limit, offset]
 
         # Total count
-        count_result = await conn.fetchrow(count_query, *query_params[:1] if conditions else [])
-        total = int(count_result["count"])
+        total, approximate = await count_cache.count(
+            "nurses", search, count_query, *query_params[:1] if conditions else [], table="nurses"
+        )
 
         # Data
         rows = await conn.fetch(base_query, *query_params)
-        nurses = [dict(row) for row in rows]
+        nurses = [public_row(row) for row in rows]
 
         return {
             "nurses": nurses,
             "pagination": {
                 "total": total,
+                "totalApproximate": approximate,
                 "page": page,
                 "limit": limit,
                 "totalPages": math.ceil(total / limit)
@@ -277,7 +463,7 @@ async def admin_get_nurse_by_id(request: Request, response: Response, id: int):
     conn = db
     try:
         row = await conn.fetchrow("SELECT * FROM nurses WHERE id = $1", id)
-        return {"nurseData": dict(row) if row else None, "status": 200}
+        return {"nurseData": public_row(row), "status": 200}
     except Exception as e:
         print("Error fetching nurse by ID:", e)
         return {"message": "Server error", "status": 500}
@@ -297,7 +483,7 @@ async def admin_add_nurse(request: Request, response: Response):
                 content={
                     "message": "Nurse with this email or phone number already exists",
                     "status": 400,
-                    "nurse": dict(existing[0])
+                    "nurse": public_row(existing[0])
                 },
                 status_code=200
             )
@@ -305,12 +491,13 @@ async def admin_add_nurse(request: Request, response: Response):
         geo = await geo_lat_lng(data["location"])
         lat, lng = geo["lat"], geo["lng"]
 
-        await db.execute("""
+        inserted = await db.fetchrow("""
             INSERT INTO nurses
             (first_name, last_name, schedule_name, rate, shift_dif, ot_rate,
              email, talent_id, nurse_type, mobile_number, location, shift, lat, lng)
             VALUES ($1, $2, $3, $4, $5, $6,
                     $7, $8, $9, $10, $11, $12, $13, $14)
+            RETURNING id
         """,
             data["firstName"],
             data["lastName"],
@@ -327,6 +514,10 @@ async def admin_add_nurse(request: Request, response: Response):
             lat,
             lng
         )
+        nurse_index.upsert(inserted["id"], data["position"], data["shift"], lat, lng)
+        await refresh_nurse_eligibility(inserted["id"])
+        count_cache.invalidate("nurses")
+        sender_resolver.invalidate("nurse")
 
         return JSONResponse(
             content={"message": "Nurse added successfully", "status": 200},
@@ -340,6 +531,38 @@ async def admin_add_nurse(request: Request, response: Response):
             status_code=500
         )
 
+async def admin_import_nurses(request: Request, response: Response):
+    """Bulk roster import. The body is the raw CSV (header row with the
+    add-nurse field names) or JSONL file; the format comes from ``?format=``
+    or the Content-Type, defaulting to CSV."""
+    try:
+        fmt = (request.query_params.get("format") or "").lower()
+        if not fmt:
+            content_type = request.headers.get("content-type", "").lower()
+            fmt = "jsonl" if "json" in content_type else "csv"
+        if fmt not in ("csv", "jsonl"):
+            return JSONResponse(
+                content={"message": "format must be csv or jsonl", "status": 400},
+                status_code=400
+            )
+
+        report = await import_nurse_roster(request.stream(), fmt)
+        if report["imported"]:
+            count_cache.invalidate("nurses")
+            sender_resolver.invalidate("nurse")
+
+        return JSONResponse(
+            content={"message": "Nurse import finished", **report, "status": 200},
+            status_code=200
+        )
+
+    except Exception as e:
+        logger.exception("Import Nurses Error")
+        return JSONResponse(
+            content={"message": "An error has occurred", "status": 500},
+            status_code=500
+        )
+
 async def admin_edit_nurse(request: Request, response: Response, id: int):
     data = await request.json()
     try:
@@ -379,6 +602,10 @@ async def admin_edit_nurse(request: Request, response: Response, id: int):
             WHERE id = $13
         """, data["firstName"], data["lastName"], data["scheduleName"], data["rate"], data["shiftDif"], data["otRate"],
              email, data["talentId"], data["position"], phone, data["location"], data["shift"], id)
+        await nurse_index.refresh_nurse(id)
+        await refresh_nurse_eligibility(id)
+        count_cache.invalidate("nurses")
+        sender_resolver.invalidate("nurse")
 
         return JSONResponse(content={"message": "Nurse updated successfully", "status": 200}, status_code=200)
 
@@ -392,6 +619,9 @@ async def admin_delete_nurse(request: Request, response: Response, id: int):
             DELETE FROM nurses
             WHERE id = $1
         """, id)
+        nurse_index.remove(id)
+        count_cache.invalidate("nurses")
+        sender_resolver.invalidate("nurse")
         return JSONResponse(content={"message": "Nurse deleted successfully", "status": 200}, status_code=200)
     except Exception as e:
         logger.exception("Delete Nurse Error")
@@ -410,34 +640,19 @@ async def admin_get_available_nurses(request: Request, response: Response):
         print("FETCH AVAILABLE NURSES", params)
 
         # Get facility location
-        facility_rows = await db.fetch("""
-            SELECT lat, lng FROM facilities WHERE id = $1
-        """, facility_id)
+        facility = await reference_cache.facility(facility_id)
 
-        if not facility_rows:
+        if not facility:
             return JSONResponse(content={"message": "Facility not found."}, status_code=400)
 
-        facility = facility_rows[0]
         if not facility["lat"] or not facility["lng"]:
             return JSONResponse(content={"message": "Facility location incomplete."}, status_code=400)
 
         facility_lat = float(facility["lat"])
         facility_lng = float(facility["lng"])
 
-        # Step 1: Find nurses within 50 miles using Haversine formula
-        nurse_rows = await db.fetch("""
-            SELECT * FROM nurses n
-            WHERE nurse_type ILIKE $1
-              AND shift ILIKE $2
-              AND lat IS NOT NULL AND lng IS NOT NULL
-              AND (
-                3959 * acos(
-                  cos(radians($3)) * cos(radians(n.lat)) *
-                  cos(radians(n.lng) - radians($4)) +
-                  sin(radians($3)) * sin(radians(n.lat))
-                )
-              ) <= 50
-        """, nurse_type, shift, facility_lat, facility_lng)
+        # Step 1: Find nurses within 50 miles
+        nurse_rows = await find_eligible_nurses(facility_id, nurse_type, shift, facility_lat, facility_lng)
 
         nurse_ids = [n["id"] for n in nurse_rows]
         print("NURSE IDS", nurse_ids)
@@ -474,6 +689,7 @@ async def admin_add_nurse_type(request: Request, response: Response):
             INSERT INTO nurse_type (nurse_type)
             VALUES ($1)
         """, nurse_type)
+        reference_cache.invalidate_nurse_types()
 
         return JSONResponse(content={"message": "Position added successfully", "status": 200})
 
@@ -483,15 +699,14 @@ async def admin_add_nurse_type(request: Request, response: Response):
     
 async def admin_get_nurse_type (request: Request, response: Response):
     try:
-        query = "SELECT * FROM nurse_type"
-        nurse_types = await db.fetch(query)
+        nurse_types = await reference_cache.nurse_types()
         return {"message": "Nurse types fetched successfully", "nurse_types": [serialize_row(row) for row in nurse_types], "status": 200}
     except Exception as error:
         print("Get Nurse Type Error:", error)
         return {"message": "An error has occurred", "status": 500}
 async def admin_get_nurse_types(request: Request, response: Response):
     try:
-        rows = await db.fetch("SELECT * FROM nurse_type")
+        rows = await reference_cache.nurse_types()
         nurse_types = [serialize_row(row) for row in rows]
         return JSONResponse(content={
             "message": "Nurse types fetched successfully",
@@ -517,6 +732,10 @@ async def admin_delete_nurse_type(request: Request, response: Response, id: int)
         await db.execute("DELETE FROM shifts WHERE role ILIKE $1", nurse_type)
         await db.execute("DELETE FROM nurses WHERE nurse_type ILIKE $1", nurse_type)
         await db.execute("DELETE FROM shift_tracker WHERE nurse_type ILIKE $1", nurse_type)
+        reference_cache.invalidate_nurse_types()
+        nurse_index.invalidate()
+        count_cache.invalidate("nurses", "shift_tracker")
+        sender_resolver.invalidate("nurse")
 
         return JSONResponse(content={
             "message": "Nurse type deleted successfully",
@@ -556,6 +775,11 @@ async def admin_edit_nurse_type(request: Request, response: Response,id: int):
             "UPDATE shift_tracker SET nurse_type = $1 WHERE nurse_type ILIKE $2",
             nurse_type, old_nurse_type
         )
+        await rename_nurse_type(old_nurse_type, nurse_type)
+        reference_cache.invalidate_nurse_types()
+        nurse_index.invalidate()
+        count_cache.invalidate("nurses", "shift_tracker")
+        sender_resolver.invalidate("nurse")
 
         return JSONResponse(
             content={"message": "Nurse type updated successfully", "status": 200},
@@ -575,6 +799,7 @@ async def admin_delete_service(request: Request, response: Response, id: int, ro
             "DELETE FROM shifts WHERE facility_id = $1 AND role ILIKE $2",
             id, role
         )
+        reference_cache.invalidate_services(id)
 
         return JSONResponse(
             content={"message": "Service deleted successfully", "status": 200},
@@ -602,8 +827,12 @@ async def nurse_chat_bot(sender, text):
         print("Error updating chat history:", e)
 
     try:
-        past_messages = await get_nurse_chat_data(sender)
-        reply_message = await generateReplyFromAINurse(text, past_messages)
+        nurse = await sender_resolver.nurse(sender)
+
+        reply_message = classify_nurse_message(sender, text)
+        if reply_message is None:
+            past_messages = await get_nurse_chat_data(sender)
+            reply_message = await generateReplyFromAINurse(text, past_messages)
         print("AI Reply:", reply_message)
         if isinstance(reply_message, str):
             reply_message = reply_message.strip()
@@ -631,11 +860,10 @@ async def nurse_chat_bot(sender, text):
             facility_names = reply_message["facility_name"]
             facility_names = facility_names if isinstance(facility_names, list) else [facility_names]
             print("sender:", sender)
-            print('length',len(sender))
-            nurse_info = await get_nurse_info(sender)
-            print("Nurse Info:", nurse_info)
-            nurse_type = nurse_info["nurse_type"]
-            shift = nurse_info["shift"]
+            if not nurse:
+                raise ValueError("Nurse not found.")
+            nurse_type = nurse.nurse_type
+            shift = nurse.shift
             print("Nurse Type:", nurse_type)
             print("Shift:", shift)
             for facility_name in facility_names:
@@ -649,25 +877,29 @@ async def nurse_chat_bot(sender, text):
                         format_date(detail["date"]) for detail in details_array if detail and detail.get("date")
                     ]
                     message = f"We found multiple shifts at {facility_name} that match your profile. On which date would you like to cover the shift?\n\n{', '.join(shift_dates)}"
-                    asyncio.create_task(send_message(sender, message)) 
+                    set_pending_date_choice(
+                        sender, facility_name,
+                        [detail["date"] for detail in details_array if detail and detail.get("date")]
+                    )
+                    await enqueue_message(sender, message) 
                 elif shift_ids:
-                    valid_shift = await check_shift_validity(shift_ids, sender)
+                    valid_shift = await check_shift_validity(shift_ids, nurse)
                     if not valid_shift:
                         continue
                     status = await check_shift_status(shift_ids, sender)
                     if status == "filled":
-                        asyncio.create_task(send_message(sender, "Sorry, the shift has already been filled. We will update you when more shifts are available for you.")) 
+                        await enqueue_message(sender, "Sorry, the shift has already been filled. We will update you when more shifts are available for you.") 
                         continue
-                    await update_coordinator(shift_ids, sender)
+                    await update_coordinator(shift_ids, nurse)
                 else:
                     print("No shift found")
 
         # Booking shift by dates and facilities
         if reply_message.get("shift"):
-            nurse_info = await get_nurse_info(sender)
-            print("Nurse Info:", nurse_info)
-            nurse_type = nurse_info["nurse_type"]
-            shift = nurse_info["shift"]
+            if not nurse:
+                raise ValueError("Nurse not found.")
+            nurse_type = nurse.nurse_type
+            shift = nurse.shift
             print("Nurse Type:", nurse_type)
             print("Shift:", shift)
             for facility_name, dates in reply_message["shift"].items():
@@ -679,37 +911,31 @@ async def nurse_chat_bot(sender, text):
                     print("Shift ID:", shift_id)
                     formatted_date = format_date(date)
                     if not shift_id:
-                        asyncio.create_task(send_message(sender, f"No shift found for {formatted_date} at {facility_name} for {nurse_type} {shift} shift")) 
+                        await enqueue_message(sender, f"No shift found for {formatted_date} at {facility_name} for {nurse_type} {shift} shift") 
                         continue
                     print('checking shift validity')
-                    valid_shift = await check_shift_validity(shift_id, sender)
+                    valid_shift = await check_shift_validity(shift_id, nurse)
                     print("Valid Shift:", valid_shift)
                     if not valid_shift:
                         continue
                     status = await check_shift_status(shift_id, sender)
                     if status == "filled":
-                        asyncio.create_task(send_message(sender, "Sorry, the shift has already been filled. We will update you when more shifts are available for you.")) 
+                        await enqueue_message(sender, "Sorry, the shift has already been filled. We will update you when more shifts are available for you.") 
                         continue
-                    await update_coordinator(shift_id, sender)
+                    await update_coordinator(shift_id, nurse)
 
         # Cancellation
         if reply_message.get("shift_details") and reply_message.get("cancellation"):
             shift_details = reply_message["shift_details"]
             shift_details = shift_details if isinstance(shift_details, list) else [shift_details]
-            nurse_info = await get_nurse_info(sender)
-            nurse_type = nurse_info["nurse_type"]
-            shift = nurse_info["shift"]
+            if not nurse:
+                raise ValueError("Nurse not found.")
             for shift_detail in shift_details:
-                await shift_cancellation_nurse(
-                    nurse_type,
-                    shift,
-                    shift_detail["date"],
-                    sender
-                )
+                await shift_cancellation_nurse(nurse, shift_detail["date"])
 
         # Follow-up to coordinator
         if reply_message.get("follow_up_reply"):
-            coordinator_email, coordinator_phone = await follow_up_reply(sender, reply_message["coordinator_message"])
+            coordinator_email, coordinator_phone = await follow_up_reply(nurse, reply_message["coordinator_message"])
             await update_coordinator_chat_history(coordinator_email, reply_message["coordinator_message"], "sent")
             await update_coordinator_chat_history(coordinator_phone, reply_message["coordinator_message"], "sent")
 
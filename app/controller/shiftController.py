@@ -1,16 +1,26 @@
 from app.database import db
-from app.controller.nurseController import search_nurses, send_nurses_message, check_nurse_availability
+from app.models.queries import SHIFT_BY_ID
+from app.controller.nurseController import check_nurse_availability, start_nurse_outreach, start_series_outreach
+from app.helper.outreachHelper import get_outreach_progress
 from app.controller.coordinatorController import update_coordinator_chat_history
-from app.utils.send_message import send_message
+from app.utils.outbox import enqueue_message
 from app.utils.normalizeDate import normalize_date
-from math import radians, sin, cos, sqrt, atan2
+from app.helper.eligibility import get_nurse_distance
 import asyncio
+import os
 from datetime import datetime
 from fastapi import Request, Response, HTTPException
 from app.utils.serialize_row import serialize_row
 from app.utils.convert_mm_dd_yyyy_to_mm_dd import convert_to_md
+from app.helper.searchIndex import search_pattern, SHIFT_SEARCH_FILTER
+from app.utils.count_cache import count_cache
+from app.helper.referenceCache import reference_cache
+from app.utils.pagination import wants_cursor, page_size, decode_cursor, keyset_predicate, split_page
+from app.helper.senderResolver import Principal
+from app.utils.shift_series import parse_weekdays, parse_shift_count, count_matching_days, expand_shift_series
+
 async def create_shift(
-    created_by: str,
+    coordinator: Principal,
     nurse_type: str,
     shift: str,
     date: str,
@@ -19,15 +29,8 @@ async def create_shift(
     status: str = "open"
 ):
     try:
-        # Get facility and coordinator ID
-        facility = await db.fetchrow("""
-            SELECT facility_id, id
-            FROM coordinator
-            WHERE coordinator_phone = $1 OR coordinator_email = $1
-        """, created_by)
-
-        facility_id = facility["facility_id"]
-        coordinator_id = facility["id"]
+        facility_id = coordinator.facility_id
+        coordinator_id = coordinator.id
         date = datetime.strptime(date, "%Y-%m-%d").date()
         # Insert shift record
         result = await db.fetchrow("""
@@ -39,12 +42,39 @@ async def create_shift(
             RETURNING id
         """, nurse_type, shift, nurse_id, status, date,
              facility_id, coordinator_id, "bot", additional_instructions)
+        count_cache.invalidate("shift_tracker")
 
         return result["id"]
 
     except Exception as err:
         print("Error creating shift:", err)
 
+BULK_SHIFT_MAX = int(os.getenv("BULK_SHIFT_MAX", "1000"))
+
+# Every shift of a batch in one statement; the arrays are zipped row-wise.
+INSERT_SHIFTS_QUERY = """
+    INSERT INTO shift_tracker (
+        nurse_type, shift, date, additional_instructions,
+        status, facility_id, coordinator_id, booked_by
+    )
+    SELECT s.nurse_type, s.shift, s.date, s.additional_instructions, $5, $6, $7, $8
+    FROM unnest($1::text[], $2::text[], $3::date[], $4::text[])
+        AS s(nurse_type, shift, date, additional_instructions)
+    RETURNING id, nurse_type, shift, date, additional_instructions, facility_id
+"""
+
+async def create_shifts(facility_id: int, coordinator_id: int, specs: list[tuple], booked_by: str, status: str = "open") -> list[dict]:
+    """Insert ``(nurse_type, shift, date, additional_instructions)`` specs in one round-trip."""
+    if not specs:
+        return []
+    nurse_types, shifts, dates, notes = (list(column) for column in zip(*specs))
+    rows = await db.fetch(
+        INSERT_SHIFTS_QUERY, nurse_types, shifts, dates, notes,
+        status, facility_id, coordinator_id, booked_by
+    )
+    count_cache.invalidate("shift_tracker")
+    return [dict(row) for row in rows]
+
 async def check_shift_status(shift_id: int, phone_number: str):
     try:
         result = await db.fetch(
@@ -60,26 +90,17 @@ async def check_shift_status(shift_id: int, phone_number: str):
             return result[0]["status"]
         else:
             message = "The shift ID you provided does not match any of the shifts. Make sure you have provided the correct ID."
-            asyncio.create_task(send_message(phone_number, message))
+            await enqueue_message(phone_number, message)
             return None
     except Exception as e:
         print("Error checking shift status:", e)
         return None
 
-async def search_shift(nurse_type, shift, date, created_by):
+async def search_shift(nurse_type, shift, date, coordinator: Principal):
     try:
         date = datetime.strptime(date, "%Y-%m-%d").date()
-        facility = await db.fetchrow("""
-            SELECT facility_id 
-            FROM coordinator 
-            WHERE coordinator_phone = $1 OR coordinator_email = $1
-        """, created_by)
-        
-        if not facility:
-            asyncio.create_task(send_message(created_by, "Coordinator not found."))
-            return
-        
-        facility_id = facility['facility_id']
+        created_by = coordinator.sender
+        facility_id = coordinator.facility_id
         rows = await db.fetch("""
             SELECT * FROM shift_tracker
             WHERE nurse_type ILIKE $1
@@ -89,11 +110,7 @@ async def search_shift(nurse_type, shift, date, created_by):
         """, nurse_type, shift, date, facility_id)
 
         if rows:
-            facility_info = await db.fetchrow("""
-                SELECT city_state_zip, name 
-                FROM facilities 
-                WHERE id = $1
-            """, facility_id)
+            facility_info = await reference_cache.facility(facility_id)
             location = facility_info['city_state_zip']
             name = facility_info['name']
 
@@ -119,11 +136,11 @@ async def search_shift(nurse_type, shift, date, created_by):
                     message += f"{i + 1}. {shift_row['nurse_type']} nurse ({nurse_name}) at {name}, {location} on {formatted_date}\n ID:{shift_row['id']}\n"
                 message += "\nPlease reply with the number of the shift you'd like to cancel."
                 await update_coordinator_chat_history(created_by, message, 'sent')
-                asyncio.create_task(send_message(created_by, message)) 
+                await enqueue_message(created_by, message) 
         else:
             formatted_date = normalize_date(date)
             message = f"The cancellation request you raised for the {nurse_type} nurse for {shift} shift scheduled on {formatted_date} does not exist or has been deleted already."
-            asyncio.create_task(send_message(created_by, message))
+            await enqueue_message(created_by, message)
     except Exception as e:
         print("Error in search_shift:", e)
 
@@ -133,6 +150,7 @@ async def delete_shift(shift_id, created_by, nurse_id, nurse_type, shift_value,
         result = await db.execute("DELETE FROM shift_tracker WHERE id = $1", shift_id)
         if result == "DELETE 0":
             return False  # No shift deleted
+        count_cache.invalidate("shift_tracker")
 
         # Notify nurse, if assigned
         if nurse_id:
@@ -149,7 +167,7 @@ async def delete_shift(shift_id, created_by, nurse_id, nurse_type, shift_value,
                     f"The shift you confirmed scheduled on {formatted_date} at {name} has been cancelled "
                     "by the coordinator. We are sorry for any inconvenience caused."
                 )
-                asyncio.create_task(send_message(nurse_phone_number, nurse_message)) 
+                await enqueue_message(nurse_phone_number, nurse_message) 
         return True
     except Exception as error:
         print('Error deleting shift:', error)
@@ -167,11 +185,7 @@ async def search_shift_by_id(shift_id: int):
         return None
 
     # Get facility details
-    facility = await db.fetchrow("""
-        SELECT city_state_zip, name
-        FROM facilities
-        WHERE id = $1
-    """, shift['facility_id'])
+    facility = await reference_cache.facility(shift['facility_id'])
 
     return {
         "nurse_id": shift['nurse_id'],
@@ -182,18 +196,13 @@ async def search_shift_by_id(shift_id: int):
         "facility_name": facility['name'] if facility else ''
     }
 
-async def shift_cancellation_nurse(nurse_type, shift, date, phone_number):
+async def shift_cancellation_nurse(nurse: Principal, date):
     try:
         date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-        nurse = await db.fetchrow("""
-            SELECT * FROM nurses
-            WHERE mobile_number = $1
-        """, phone_number)
-
-        if not nurse:
-            return
-
-        nurse_id = nurse['id']
+        nurse_type = nurse.nurse_type
+        shift = nurse.shift
+        phone_number = nurse.sender
+        nurse_id = nurse.id
 
         rows = await db.fetch("""
             SELECT * FROM shift_tracker
@@ -207,7 +216,7 @@ async def shift_cancellation_nurse(nurse_type, shift, date, phone_number):
             formatted_date = normalize_date(date_obj)
             formatted_date = convert_to_md(formatted_date)
             message = f"The cancellation request you raised for the {nurse_type} nurse for {shift} shift scheduled on {formatted_date} does not exist or has been deleted already."
-            asyncio.create_task(send_message(phone_number, message)) 
+            await enqueue_message(phone_number, message) 
             return
 
         shift_data = rows[0]
@@ -222,12 +231,9 @@ async def shift_cancellation_nurse(nurse_type, shift, date, phone_number):
                 nurse_id = NULL
             WHERE id = $1
         """, shift_id)
+        count_cache.invalidate("shift_tracker")
 
-        facility = await db.fetchrow("""
-            SELECT city_state_zip, name
-            FROM facilities
-            WHERE id = $1
-        """, facility_id)
+        facility = await reference_cache.facility(facility_id)
 
         location = facility['city_state_zip'] if facility else ''
         name = facility['name'] if facility else ''
@@ -235,32 +241,26 @@ async def shift_cancellation_nurse(nurse_type, shift, date, phone_number):
         formatted_date = convert_to_md(formatted_date)
         # Message to nurse
         message_to_nurse = f"The shift you confirmed at {name} on {formatted_date} for {nurse_type} has been cancelled."
-        asyncio.create_task(send_message(phone_number, message_to_nurse)) 
+        await enqueue_message(phone_number, message_to_nurse) 
 
-        # Get other nurses
-        nurses = await search_nurses(nurse_type, shift, shift_id)
-        nurses = [n for n in nurses if n['mobile_number'] != phone_number]
-        
-        await send_nurses_message(nurses, nurse_type, shift, shift_id, date, "")
+        # Re-broadcast to other nurses in the background
+        start_nurse_outreach(nurse_type, shift, shift_id, date, "", exclude_phone=phone_number)
 
         # Notify coordinator
-        coordinator = await db.fetchrow("""
-            SELECT coordinator_phone, coordinator_email
-            FROM coordinator
-            WHERE id = $1
-        """, coordinator_id)
+        coordinator = await reference_cache.coordinator(coordinator_id)
 
         if coordinator:
             message_to_creator = (
                 f"Hello! Your shift request on {formatted_date} for a {nurse_type} nurse has been cancelled by the nurse. "
                 f"We are looking for another to help cover it. Sorry for any inconvenience caused."
             )
-            asyncio.create_task(send_message(coordinator['coordinator_phone'], message_to_creator))
+            await enqueue_message(coordinator['coordinator_phone'], message_to_creator)
 
     except Exception as error:
         print("Error cancelling nurse confirmed shift:", error)
 
-async def check_shift_validity(shift_id: int, nurse_phone_number: str) -> bool:
+async def check_shift_validity(shift_id: int, nurse: Principal) -> bool:
+    nurse_phone_number = nurse.sender
     shift_data = await db.fetchrow("""
         SELECT shift, facility_id, nurse_type, date
         FROM shift_tracker
@@ -268,7 +268,7 @@ async def check_shift_validity(shift_id: int, nurse_phone_number: str) -> bool:
     """, shift_id)
 
     if not shift_data:
-        asyncio.create_task(send_message(nurse_phone_number, "The shift does not exist."))
+        await enqueue_message(nurse_phone_number, "The shift does not exist.")
         return False
 
     shift = shift_data['shift']
@@ -278,77 +278,47 @@ async def check_shift_validity(shift_id: int, nurse_phone_number: str) -> bool:
 
     formatted_date = normalize_date(date)
     formatted_date = datetime.strptime(formatted_date, "%Y-%m-%d").strftime("%m-%d-%Y")
-    facility = await db.fetchrow("""
-        SELECT lat, lng, name
-        FROM facilities
-        WHERE id = $1
-    """, facility_id)
+    facility = await reference_cache.facility(facility_id)
 
     if not facility:
         return False
 
-    facility_lat = facility['lat']
-    facility_lng = facility['lng']
     facility_name = facility['name']
 
-    nurse = await db.fetchrow("""
-        SELECT id, shift, location, nurse_type, lat, lng
-        FROM nurses
-        WHERE mobile_number = $1
-    """, nurse_phone_number)
-
-    if not nurse:
-        return False
-
-    nurse_id = nurse['id']
-    nurse_shift = nurse['shift']
-    nurse_type_from_db = nurse['nurse_type']
-    nurse_lat = nurse['lat']
-    nurse_lng = nurse['lng']
-
-    def haversine_distance(lat1, lon1, lat2, lon2):
-        R = 3959  # miles
-        d_lat = radians(lat2 - lat1)
-        d_lon = radians(lon2 - lon1)
-        a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
-        c = 2 * atan2(sqrt(a), sqrt(1 - a))
-        return R * c
+    nurse_id = nurse.id
+    nurse_shift = nurse.shift
+    nurse_type_from_db = nurse.nurse_type
 
-    distance = haversine_distance(facility_lat, facility_lng, nurse_lat, nurse_lng)
-    location_match = distance <= 50
+    location_match = await get_nurse_distance(facility_id, nurse_id) is not None
 
     if (
         shift.lower() != nurse_shift.lower()
         or not location_match
         or nurse_type.lower() != nurse_type_from_db.lower()
     ):
-        asyncio.create_task(send_message(
+        await enqueue_message(
             nurse_phone_number,
             f"The shift requested at {facility_name} on {formatted_date} does not match your profile."
-        )) 
+        ) 
         return False
 
     is_available = await check_nurse_availability(nurse_id, shift_id)
 
     if not is_available:
-        asyncio.create_task(send_message(
+        await enqueue_message(
             nurse_phone_number,
             f"The shift you asked to cover at {facility_name} on {formatted_date} conflicts with your other shift and thus cannot be covered by you."
-        ))
+        )
         return False
 
     return True
 
 async def get_shift_id_by_name(facility_name: str, nurse_type: str, shift: str, sender: str):
-    facility = await db.fetchrow("""
-        SELECT id
-        FROM facilities
-        WHERE name ILIKE $1
-    """, facility_name)
+    facility = await reference_cache.facility_by_name(facility_name)
 
     if not facility:
         message = "The facility name you provided does not exist. Make sure the name is correct."
-        asyncio.create_task(send_message(sender, message))
+        await enqueue_message(sender, message)
         raise Exception("Facility not found")
 
     facility_id = facility['id']
@@ -370,15 +340,12 @@ async def get_shift_id_by_name(facility_name: str, nurse_type: str, shift: str,
         return [row['id'] for row in shift_rows]  # Return list of shift IDs
     else:
         message = "There are no shifts matching your profile for the facility you provided. Please make sure you have provided the correct information."
-        asyncio.create_task(send_message(sender, message)) 
+        await enqueue_message(sender, message) 
         return None
 
 async def search_by_date(date: str, facility_name: str, nurse_type: str, shift: str):
     date = datetime.strptime(date, "%Y-%m-%d").date()
-    facility = await db.fetchrow("""
-        SELECT id FROM facilities
-        WHERE name ILIKE $1
-    """, facility_name)
+    facility = await reference_cache.facility_by_name(facility_name)
 
     if not facility:
         return None  # Facility not found
@@ -398,6 +365,12 @@ async def search_by_date(date: str, facility_name: str, nurse_type: str, shift:
 
     return shift_row['id']
 
+def parse_calendar_date(value: str | None):
+    """Date part of a calendar range bound such as ``2024-06-01`` or ``2024-06-01T00:00:00-05:00``."""
+    if not value:
+        return None
+    return datetime.strptime(value.split("T")[0], "%Y-%m-%d").date()
+
 async def admin_get_shifts(request: Request, response: Response):
     try:
         params = request.query_params
@@ -406,83 +379,91 @@ async def admin_get_shifts(request: Request, response: Response):
         shift = params.get("shift")
         status = params.get("status")
 
+        # Visible calendar window; ``end`` is exclusive, as calendar UIs send it.
+        try:
+            window_start = parse_calendar_date(params.get("start"))
+            window_end = parse_calendar_date(params.get("end"))
+        except ValueError:
+            return JSONResponse(content={"message": "Invalid start or end date", "status": 400}, status_code=400)
+
         filters = []
         values = []
 
+        if window_start:
+            values.append(window_start)
+            filters.append(f"st.date >= ${len(values)}")
+
+        if window_end:
+            values.append(window_end)
+            filters.append(f"st.date < ${len(values)}")
+
         if nurse_type:
             values.append(nurse_type)
-            filters.append(f"nurse_type = ${len(values)}")
+            filters.append(f"st.nurse_type = ${len(values)}")
 
         if shift:
             values.append(shift)
-            filters.append(f"shift = ${len(values)}")
+            filters.append(f"st.shift = ${len(values)}")
 
         if status:
             values.append(status)
-            filters.append(f"status = ${len(values)}")
-                    
+            filters.append(f"st.status = ${len(values)}")
+
         if facility_name:
-            facility = await db.fetchrow(
-                "SELECT id FROM facilities WHERE name = $1", facility_name
-            )
-            if facility:
-                values.append(facility["id"])
-                filters.append(f"facility_id = ${len(values)}")
-            else:
-                # If facility doesn't exist, return empty list (no results will match)
-                return JSONResponse(content={"events": [], "status": 200}, status_code=200)
+            # No such facility means no matching shifts.
+            values.append(facility_name)
+            filters.append(f"st.facility_id = (SELECT id FROM facilities WHERE name = ${len(values)} LIMIT 1)")
 
         where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
-        query = f"SELECT * FROM shift_tracker {where_clause} ORDER BY date, shift"
+
+        # Nurse name, facility name and the service's timings for the shift in one pass
+        query = f"""
+            SELECT st.id, st.nurse_type, st.status, st.date, st.shift, st.nurse_id,
+                   n.first_name, n.last_name,
+                   f.name AS facility_name,
+                   CASE st.shift
+                       WHEN 'AM' THEN s.am_time_start
+                       WHEN 'PM' THEN s.pm_time_start
+                       WHEN 'NOC' THEN s.noc_time_start
+                   END AS start_time,
+                   CASE st.shift
+                       WHEN 'AM' THEN s.am_time_end
+                       WHEN 'PM' THEN s.pm_time_end
+                       WHEN 'NOC' THEN s.noc_time_end
+                   END AS end_time
+            FROM shift_tracker st
+            JOIN LATERAL (
+                SELECT * FROM shifts
+                WHERE facility_id = st.facility_id AND role ILIKE st.nurse_type
+                LIMIT 1
+            ) s ON TRUE
+            LEFT JOIN nurses n ON n.id = st.nurse_id
+            LEFT JOIN facilities f ON f.id = st.facility_id
+            {where_clause}
+            ORDER BY st.date, st.shift
+        """
 
         result = await db.fetch(query, *values)
         events = []
 
         for row in result:
-            facility_id = row["facility_id"]
-            shift_val = row["shift"]
-            date = row["date"]
-
-            # Nurse name
-            if row["nurse_id"] is None:
-                nurse_name = "Not assigned"
-            else:
-                nurse = await db.fetchrow(
-                    "SELECT first_name, last_name FROM nurses WHERE id = $1",
-                    row["nurse_id"]
-                )
-                nurse_name = f"{nurse['first_name']} {nurse['last_name']}"
-
-            # Shift timings
-            shift_row = await db.fetchrow(
-                "SELECT * FROM shifts WHERE facility_id = $1 AND role ILIKE $2",
-                facility_id, row["nurse_type"]
-            )
-            if not shift_row:
-                continue
-
-            shift_times = {
-                "AM": (shift_row["am_time_start"], shift_row["am_time_end"]),
-                "PM": (shift_row["pm_time_start"], shift_row["pm_time_end"]),
-                "NOC": (shift_row["noc_time_start"], shift_row["noc_time_end"])
-            }
-
-            start_time, end_time = shift_times.get(shift_val, (None, None))
+            start_time, end_time = row["start_time"], row["end_time"]
             if not start_time or not end_time:
                 continue
 
-            formatted_date = date.strftime("%Y-%m-%d")
-            start = f"{formatted_date}T{start_time}"
-            end = f"{formatted_date}T{end_time}"
+            if row["nurse_id"] is None or row["first_name"] is None:
+                nurse_name = "Not assigned"
+            else:
+                nurse_name = f"{row['first_name']} {row['last_name']}"
 
-            facility = await db.fetchrow("SELECT name FROM facilities WHERE id = $1", facility_id)
-            facility_name = facility["name"] if facility else "Unknown"
+            facility_name = row["facility_name"] or "Unknown"
+            formatted_date = row["date"].strftime("%Y-%m-%d")
 
             events.append({
                 "id": row["id"],
                 "title": f"{row['nurse_type']} at {facility_name}",
-                "start": start,
-                "end": end,
+                "start": f"{formatted_date}T{start_time}",
+                "end": f"{formatted_date}T{end_time}",
                 "extendedProps": {
                     "nurse_type": row["nurse_type"],
                     "facility": facility_name,
@@ -504,63 +485,86 @@ from fastapi.responses import JSONResponse
 from typing import Optional
 import asyncio
 
+SHIFT_LIST_SELECT = """
+    SELECT 
+      s.*, 
+      CONCAT(n.first_name, ' ', n.last_name) AS nurse_name,
+      f.name AS facility_name,
+      CONCAT(c.coordinator_first_name, ' ', c.coordinator_last_name) AS coordinator_name
+    FROM shift_tracker s
+    LEFT JOIN nurses n ON s.nurse_id = n.id
+    LEFT JOIN facilities f ON s.facility_id = f.id
+    LEFT JOIN coordinator c ON s.coordinator_id = c.id
+"""
+
+def serialize_shift_list_row(shift):
+    return {
+        **serialize_row(shift),
+        "nurse_name": shift["nurse_name"] or "Not assigned",
+        "coordinator_name": shift["coordinator_name"] or "Not assigned"
+    }
+
+async def get_all_shifts_by_cursor(params, search: str | None):
+    limit = page_size(params)
+    try:
+        after = decode_cursor(params.get("cursor"), 1)
+    except ValueError:
+        return JSONResponse(content={"message": "Invalid cursor", "status": 400}, status_code=400)
+
+    filters = []
+    values = []
+    if search:
+        values.append(search_pattern(search))
+        filters.append(SHIFT_SEARCH_FILTER)
+    if after:
+        filters.append(keyset_predicate(["s.id"], True, len(values) + 1))
+        values += after
+
+    where_clause = f"WHERE {' AND '.join(filters)}" if filters else ""
+    values.append(limit + 1)
+    rows = await db.fetch(
+        f"{SHIFT_LIST_SELECT} {where_clause} ORDER BY s.id DESC LIMIT ${len(values)}", *values
+    )
+    rows, next_cursor = split_page(rows, limit, ["id"])
+
+    return JSONResponse(
+        content={
+            "limit": limit,
+            "nextCursor": next_cursor,
+            "shifts": [serialize_shift_list_row(shift) for shift in rows]
+        },
+        status_code=200
+    )
+
 async def admin_get_all_shifts(request: Request, response: Response):
     try:
         params = request.query_params
         search = params.get("search")
+        if wants_cursor(params):
+            return await get_all_shifts_by_cursor(params, search)
+
         page = int(params.get("page", 1))
         limit = int(params.get("limit", 10))
         offset = (page - 1) * limit
 
         if search:
-            search_term = f"%{search.lower()}%"
-            query = """
-                SELECT 
-                  s.*, 
-                  CONCAT(n.first_name, ' ', n.last_name) AS nurse_name,
-                  f.name AS facility_name,
-                  CONCAT(c.coordinator_first_name, ' ', c.coordinator_last_name) AS coordinator_name
-                FROM shift_tracker s
-                LEFT JOIN nurses n ON s.nurse_id = n.id
-                LEFT JOIN facilities f ON s.facility_id = f.id
-                LEFT JOIN coordinator c ON s.coordinator_id = c.id
-                WHERE 
-                  LOWER(CONCAT(n.first_name, ' ', n.last_name)) ILIKE $1
-                  OR LOWER(f.name) ILIKE $1
-                  OR LOWER(CONCAT(c.coordinator_first_name, ' ', c.coordinator_last_name)) ILIKE $1
-                  OR LOWER(s.nurse_type) ILIKE $1
-                  OR LOWER(s.shift) ILIKE $1
-                  OR LOWER(s.status) ILIKE $1
+            search_term = search_pattern(search)
+            query = f"""
+                {SHIFT_LIST_SELECT}
+                WHERE {SHIFT_SEARCH_FILTER}
                 ORDER BY s.id DESC
                 LIMIT $2 OFFSET $3
             """
-            count_query = """
+            count_query = f"""
                 SELECT COUNT(*) AS total
                 FROM shift_tracker s
-                LEFT JOIN nurses n ON s.nurse_id = n.id
-                LEFT JOIN facilities f ON s.facility_id = f.id
-                LEFT JOIN coordinator c ON s.coordinator_id = c.id
-                WHERE 
-                  LOWER(CONCAT(n.first_name, ' ', n.last_name)) ILIKE $1
-                  OR LOWER(f.name) ILIKE $1
-                  OR LOWER(CONCAT(c.coordinator_first_name, ' ', c.coordinator_last_name)) ILIKE $1
-                  OR LOWER(s.nurse_type) ILIKE $1
-                  OR LOWER(s.shift) ILIKE $1
-                  OR LOWER(s.status) ILIKE $1
+                WHERE {SHIFT_SEARCH_FILTER}
             """
             values = [search_term, limit, offset]
             count_values = [search_term]
         else:
-            query = """
-                SELECT 
-                  s.*, 
-                  CONCAT(n.first_name, ' ', n.last_name) AS nurse_name,
-                  f.name AS facility_name,
-                  CONCAT(c.coordinator_first_name, ' ', c.coordinator_last_name) AS coordinator_name
-                FROM shift_tracker s
-                LEFT JOIN nurses n ON s.nurse_id = n.id
-                LEFT JOIN facilities f ON s.facility_id = f.id
-                LEFT JOIN coordinator c ON s.coordinator_id = c.id
+            query = f"""
+                {SHIFT_LIST_SELECT}
                 ORDER BY s.id DESC
                 LIMIT $1 OFFSET $2
             """
@@ -569,26 +573,19 @@ async def admin_get_all_shifts(request: Request, response: Response):
             count_values = None
 
         # Execute both queries concurrently
-        result, count_result = await asyncio.gather(
+        result, (total, approximate) = await asyncio.gather(
             db.fetch(query, *values),
-            db.fetch(count_query, *count_values) if count_values else db.fetch(count_query)
+            count_cache.count("shifts", search, count_query, *(count_values or []), table="shift_tracker")
         )
 
-        total = int(count_result[0]["total"]) if count_result else 0
-
         return JSONResponse(
             content={
                 "page": page,
                 "limit": limit,
                 "total": total,
+                "totalApproximate": approximate,
                 "totalPages": (total + limit - 1) // limit,
-                "shifts": [
-                    {
-                        **serialize_row(shift),
-                        "nurse_name": shift["nurse_name"] or "Not assigned",
-                        "coordinator_name": shift["coordinator_name"] or "Not assigned"
-                    } for shift in result
-                ]
+                "shifts": [serialize_shift_list_row(shift) for shift in result]
             },
             status_code=200
         )
@@ -620,18 +617,13 @@ async def admin_delete_shift(request: Request, response: Response, shift_id: int
         facility_id = shift_details["facility_id"]
 
         # 2. Get coordinator contact
-        coordinator_contact = await db.fetchrow("""
-            SELECT coordinator_phone, coordinator_email
-            FROM coordinator WHERE id = $1
-        """, coordinator_id)
+        coordinator_contact = await reference_cache.coordinator(coordinator_id)
 
         phone = coordinator_contact["coordinator_phone"] if coordinator_contact else None
         email = coordinator_contact["coordinator_email"] if coordinator_contact else None
 
         # 3. Get facility name
-        facility = await db.fetchrow("""
-            SELECT name FROM facilities WHERE id = $1
-        """, facility_id)
+        facility = await reference_cache.facility(facility_id)
 
         facility_name = facility["name"] if facility else "Unknown Facility"
 
@@ -645,7 +637,7 @@ async def admin_delete_shift(request: Request, response: Response, shift_id: int
         )
 
         if phone:
-            asyncio.create_task(send_message(phone, message))
+            await enqueue_message(phone, message)
 
         # 5. Notify nurse if needed
         if nurse_id and shift_status == "filled":
@@ -655,12 +647,13 @@ async def admin_delete_shift(request: Request, response: Response, shift_id: int
 
             nurse_phone = nurse_contact["mobile_number"] if nurse_contact else None
             if nurse_phone:
-               asyncio.create_task(send_message(nurse_phone, message))
+               await enqueue_message(nurse_phone, message)
 
         # 6. Delete the shift
         await db.execute("""
             DELETE FROM shift_tracker WHERE id = $1
         """, shift_id)
+        count_cache.invalidate("shift_tracker")
 
         return JSONResponse(content={"message": "Shift deleted successfully", "status": 200})
 
@@ -689,11 +682,10 @@ async def admin_add_shift(request: Request, response: Response):
             (facility_id, coordinator_id, nurse_id, nurse_type, date, shift, status, booked_by, additional_instructions)
             VALUES($1,$2,$3,$4,$5,$6,$7,$8,$9)
         """, facility, coordinator, nurse, position, schedule_date, shift, 'filled', 'admin', additional_notes)
+        count_cache.invalidate("shift_tracker")
 
         # Fetch facility details
-        facility_details = await db.fetchrow("""
-            SELECT * FROM facilities WHERE id = $1
-        """, facility)
+        facility_details = await reference_cache.facility(facility)
 
         facility_name = facility_details["name"] if facility_details else ""
         facility_location = facility_details["city_state_zip"] if facility_details else ""
@@ -709,9 +701,7 @@ async def admin_add_shift(request: Request, response: Response):
         nurse_phone = nurse_details["mobile_number"] if nurse_details else ""
 
         # Fetch coordinator details
-        coordinator_details = await db.fetchrow("""
-            SELECT * FROM coordinator WHERE id = $1
-        """, coordinator)
+        coordinator_details = await reference_cache.coordinator(coordinator)
 
         coordinator_phone = coordinator_details["coordinator_phone"] if coordinator_details else ""
 
@@ -731,9 +721,9 @@ async def admin_add_shift(request: Request, response: Response):
 
         # Background message sending
         if nurse_phone:
-            asyncio.create_task(send_message(nurse_phone, message_nurse))
+            await enqueue_message(nurse_phone, message_nurse)
         if coordinator_phone:
-            asyncio.create_task(send_message(coordinator_phone, message_coordinator))
+            await enqueue_message(coordinator_phone, message_coordinator)
 
         return JSONResponse(content={"message": "Shift added successfully", "status": 200})
 
@@ -742,9 +732,63 @@ async def admin_add_shift(request: Request, response: Response):
         raise HTTPException(status_code=500, detail="An error has occurred")
 
 
+async def admin_add_shifts_bulk(request: Request, response: Response):
+    """Open shifts for a date range, e.g. every weekday NOC for a month:
+    ``{"facility", "coordinator", "startDate", "endDate", "weekdays",
+    "positions": [{"position", "shift", "count", "additionalNotes"}]}``."""
+    try:
+        data = await request.json()
+        facility = data.get("facility")
+        facility = int(facility) if facility else None
+        coordinator = data.get("coordinator")
+        coordinator = int(coordinator) if coordinator else None
+        positions = data.get("positions") or []
+
+        try:
+            start_date = parse_calendar_date(data.get("startDate"))
+            end_date = parse_calendar_date(data.get("endDate")) or start_date
+            weekdays = parse_weekdays(data.get("weekdays"))
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"message": str(e), "status": 400})
+
+        if not facility or not start_date or not positions:
+            return JSONResponse(status_code=400, content={"message": "facility, startDate and positions are required", "status": 400})
+        if end_date < start_date:
+            return JSONResponse(status_code=400, content={"message": "endDate is before startDate", "status": 400})
+        if any(not isinstance(p, dict) or not p.get("position") or not p.get("shift") for p in positions):
+            return JSONResponse(status_code=400, content={"message": "Every position needs a position and a shift", "status": 400})
+        try:
+            counts = [parse_shift_count(p.get("count")) for p in positions]
+        except ValueError:
+            return JSONResponse(status_code=400, content={"message": "count must be a positive integer", "status": 400})
+
+        # Size the request before building anything.
+        matching_days = count_matching_days(start_date, end_date, weekdays)
+        if not matching_days:
+            return JSONResponse(status_code=400, content={"message": "No dates match the given range and weekdays", "status": 400})
+        if matching_days * sum(counts) > BULK_SHIFT_MAX:
+            return JSONResponse(status_code=400, content={"message": f"At most {BULK_SHIFT_MAX} shifts can be created at once", "status": 400})
+
+        specs = expand_shift_series(start_date, end_date, weekdays, positions)
+
+        rows = await create_shifts(facility, coordinator, specs, "admin")
+        if data.get("outreach", True):
+            start_series_outreach(facility, rows)
+
+        return JSONResponse(content={
+            "message": "Shifts added successfully",
+            "created": len(rows),
+            "shiftIds": [row["id"] for row in rows],
+            "status": 200
+        })
+
+    except Exception as e:
+        print("Add Shifts Bulk Error:", str(e))
+        raise HTTPException(status_code=500, detail="An error has occurred")
+
 async def admin_get_shift_by_id(request: Request, response: Response, id: int):
     try:
-        row = await db.fetchrow("SELECT * FROM shift_tracker WHERE id = $1", id)
+        row = await db.fetchrow_named(SHIFT_BY_ID, id)
         return JSONResponse(content={"shift": serialize_row(dict(row)) if row else None, "status": 200})
     except Exception as e:
         print("Error fetching shift details:", str(e))
@@ -765,7 +809,7 @@ async def admin_edit_shift(request: Request, response: Response, id: int):
         shift = body.get("shift")
         additional_notes = body.get("additionalNotes")
 
-        existing_shift = await db.fetchrow("SELECT * FROM shift_tracker WHERE id = $1", id)
+        existing_shift = await db.fetchrow_named(SHIFT_BY_ID, id)
         if not existing_shift:
             raise HTTPException(status_code=404, detail="Shift not found")
 
@@ -776,7 +820,7 @@ async def admin_edit_shift(request: Request, response: Response, id: int):
         old_position = existing_shift["nurse_type"]
         old_facility_id = existing_shift["facility_id"]
 
-        facility_row = await db.fetchrow("SELECT name FROM facilities WHERE id = $1", facility)
+        facility_row = await reference_cache.facility(facility)
         facility_name = facility_row["name"] if facility_row else "Unknown Facility"
 
         # 🧑‍⚕️ Nurse Notification Logic
@@ -787,7 +831,7 @@ async def admin_edit_shift(request: Request, response: Response, id: int):
                     formatted_date = datetime.strptime(str(old_date), "%Y-%m-%d").strftime("%m-%d-%Y")
                     formatted_date = convert_to_md(formatted_date)
                     message = f"Hi {old_nurse['first_name']}, your previously assigned shift for {old_position} on {formatted_date} ({old_shift} shift) at {facility_name} has been reassigned to another nurse. Thank you for your support."
-                    asyncio.create_task(send_message(old_nurse["mobile_number"], message))
+                    await enqueue_message(old_nurse["mobile_number"], message)
 
             if nurse:
                 new_nurse = await db.fetchrow("SELECT first_name, mobile_number FROM nurses WHERE id = $1", nurse)
@@ -795,7 +839,7 @@ async def admin_edit_shift(request: Request, response: Response, id: int):
                     formatted_date = schedule_date
                     formatted_date = convert_to_md(formatted_date)
                     message = f"Hi {new_nurse['first_name']}, you've been scheduled for a new {position} shift on {formatted_date} ({shift} shift) at {facility_name}. Notes: {additional_notes}"
-                    asyncio.create_task(send_message(new_nurse["mobile_number"], message))
+                    await enqueue_message(new_nurse["mobile_number"], message)
 
         elif nurse:
             nurse_details = await db.fetchrow("SELECT first_name, mobile_number FROM nurses WHERE id = $1", nurse)
@@ -803,7 +847,7 @@ async def admin_edit_shift(request: Request, response: Response, id: int):
                 formatted_date = schedule_date
                 formatted_date = convert_to_md(formatted_date)
                 message = f"Hi {nurse_details['first_name']}, there have been updates to your shift: {position} on {formatted_date} ({shift} shift) at {facility_name}. Notes: {additional_notes}. Please take note of the changes."
-                asyncio.create_task(send_message(nurse_details["mobile_number"], message))
+                await enqueue_message(nurse_details["mobile_number"], message)
 
         # 🧑‍💼 Coordinator Notification Logic
         nurse_name = None
@@ -813,28 +857,28 @@ async def admin_edit_shift(request: Request, response: Response, id: int):
 
         if coordinator != old_coordinator_id:
             if old_coordinator_id:
-                old_coord = await db.fetchrow("SELECT coordinator_first_name, coordinator_phone FROM coordinator WHERE id = $1", old_coordinator_id)
+                old_coord = await reference_cache.coordinator(old_coordinator_id)
                 if old_coord:
                     formatted_date = datetime.strptime(str(old_date), "%Y-%m-%d").strftime("%m-%d-%Y")
                     formatted_date = convert_to_md(formatted_date)
                     message = f"Dear {old_coord['coordinator_first_name']}, the coordination responsibility for the {old_position} shift on {formatted_date} ({old_shift} shift)has been assigned to another coordinator. Thank you for your efforts."
-                    asyncio.create_task(send_message(old_coord["coordinator_phone"], message))
+                    await enqueue_message(old_coord["coordinator_phone"], message)
 
             if coordinator:
-                new_coord = await db.fetchrow("SELECT coordinator_first_name, coordinator_phone FROM coordinator WHERE id = $1", coordinator)
+                new_coord = await reference_cache.coordinator(coordinator)
                 if new_coord:
                     formatted_date = schedule_date
                     formatted_date = convert_to_md(formatted_date)
                     message = f"Dear {new_coord['coordinator_first_name']}, you are now responsible for overseeing the {position} shift on {formatted_date} ({shift} shift), assigned to nurse {nurse_name}. Please ensure smooth coordination."
-                    asyncio.create_task(send_message(new_coord["coordinator_phone"], message))
+                    await enqueue_message(new_coord["coordinator_phone"], message)
 
         elif coordinator:
-            coord = await db.fetchrow("SELECT coordinator_first_name, coordinator_phone FROM coordinator WHERE id = $1", coordinator)
+            coord = await reference_cache.coordinator(coordinator)
             if coord:
                 formatted_date = schedule_date
                 formatted_date = convert_to_md(formatted_date)
                 message = f"Dear {coord['coordinator_first_name']}, the shift details under your coordination have been updated. New details: {position} on {formatted_date} ({shift} shift), assigned to nurse {nurse_name}. Additional Notes: {additional_notes}. Please review."
-                asyncio.create_task(send_message(coord["coordinator_phone"], message))
+                await enqueue_message(coord["coordinator_phone"], message)
 
         # Update shift in DB
         await db.execute("""
@@ -842,9 +886,16 @@ async def admin_edit_shift(request: Request, response: Response, id: int):
             SET facility_id = $1, coordinator_id = $2, nurse_id = $3, nurse_type = $4, date = $5, shift = $6, status = $7, additional_instructions = $8
             WHERE id = $9
         """, facility, coordinator, nurse, position, schedule_date, shift, 'filled', additional_notes, id)
+        count_cache.invalidate("shift_tracker")
 
         return JSONResponse(content={"message": "Shift updated successfully", "status": 200})
 
     except Exception as e:
         print("Error editing shift:", str(e))
         raise HTTPException(status_code=500, detail="Server error")
+
+async def admin_get_outreach_progress(request: Request, response: Response, shift_id: int):
+    progress = get_outreach_progress(shift_id)
+    if not progress:
+        return JSONResponse(content={"message": "No outreach found for this shift", "status": 404}, status_code=404)
+    return JSONResponse(content={"progress": progress, "status": 200})
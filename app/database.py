@@ -1,4 +1,6 @@
 import os
+import time
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import asyncpg
 
@@ -7,6 +9,11 @@ load_dotenv()
 class Database:
     def __init__(self):
         self.pool = None
+        # Named queries: name -> SQL. Registered by the modules that own them.
+        self.queries: dict[str, str] = {}
+        # Prepared statements per server connection (backend pid) and name.
+        self._prepared: dict[int, dict[str, asyncpg.prepared_stmt.PreparedStatement]] = {}
+        self.query_stats: dict[str, dict] = {}
 
     async def connect(self):
         if not self.pool:
@@ -32,5 +39,95 @@ class Database:
         async with self.pool.acquire() as conn:
             return await conn.execute(query, *args)
 
+    async def fetchval(self, query, *args):
+        async with self.pool.acquire() as conn:
+            return await conn.fetchval(query, *args)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Pin one pooled connection for the block and run it in a transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+        Use the yielded connection for every statement that must be atomic.
+        """
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
+    def register(self, name: str, query: str) -> str:
+        """Add a named query; it is prepared once per pooled connection on first use."""
+        existing = self.queries.get(name)
+        if existing is not None and existing != query:
+            raise ValueError(f"Query {name!r} is already registered with different SQL")
+        self.queries[name] = query
+        return name
+
+    async def _statement(self, conn, name: str):
+        pid = conn.get_server_pid()
+        statements = self._prepared.get(pid)
+        if statements is None:
+            # Connections the pool has replaced leave their pids behind.
+            if len(self._prepared) >= 4 * self.pool.get_max_size():
+                self._prepared.clear()
+            statements = self._prepared[pid] = {}
+        statement = statements.get(name)
+        if statement is None:
+            statement = await conn.prepare(self.queries[name])
+            statements[name] = statement
+        return statement
+
+    async def _run_named(self, name: str, run):
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            try:
+                result = await run(await self._statement(conn, name))
+            except (asyncpg.exceptions.InvalidCachedStatementError,
+                    asyncpg.exceptions.OutdatedSchemaCacheError,
+                    asyncpg.exceptions.InterfaceError):
+                # The plan went stale (schema change) or belongs to a closed
+                # connection; prepare it again once.
+                self._prepared.get(conn.get_server_pid(), {}).pop(name, None)
+                result = await run(await self._statement(conn, name))
+        self._record(name, time.perf_counter() - started)
+        return result
+
+    def _record(self, name: str, elapsed: float) -> None:
+        stats = self.query_stats.setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        elapsed_ms = elapsed * 1000
+        stats["calls"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    async def fetch_named(self, name: str, *args) -> list[asyncpg.Record]:
+        return await self._run_named(name, lambda statement: statement.fetch(*args))
+
+    async def fetchrow_named(self, name: str, *args) -> asyncpg.Record | None:
+        return await self._run_named(name, lambda statement: statement.fetchrow(*args))
+
+    async def fetchval_named(self, name: str, *args):
+        return await self._run_named(name, lambda statement: statement.fetchval(*args))
+
+    async def execute_named(self, name: str, *args) -> str:
+        """Run a named statement for its effect; returns the command status like ``execute``."""
+        async def run(statement):
+            await statement.fetch(*args)
+            return statement.get_statusmsg()
+        return await self._run_named(name, run)
+
+    def metrics(self) -> dict:
+        return {
+            "pool_size": self.pool.get_size() if self.pool else 0,
+            "pool_idle": self.pool.get_idle_size() if self.pool else 0,
+            "prepared_connections": len(self._prepared),
+            "queries": {
+                name: {
+                    "calls": stats["calls"],
+                    "avg_ms": round(stats["total_ms"] / stats["calls"], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                }
+                for name, stats in sorted(self.query_stats.items())
+            },
+        }
+
 
 db = Database()
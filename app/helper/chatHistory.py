@@ -0,0 +1,180 @@
+import os
+import logging
+from dotenv import load_dotenv
+from app.database import db
+from app.helper.llmCache import cached_generate
+from app.utils.parse_ai_json import parse_ai_json
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "1500"))
+CHAT_HISTORY_MAX_MESSAGES = int(os.getenv("CHAT_HISTORY_MAX_MESSAGES", "50"))
+CHAT_SUMMARY_CHAR_BUDGET = int(os.getenv("CHAT_SUMMARY_CHAR_BUDGET", "1200"))
+SUMMARY_LINE_CHARS = 160
+SUMMARY_FOLD_LIMIT = 200
+
+# Named queries prepared once per pooled connection (see Database.register).
+HISTORY_QUERIES = {
+    "nurse": {
+        "recent": db.register("nurse_history_recent", """
+            SELECT id, message
+            FROM nurse_chat_data
+            WHERE mobile_number = $1
+            ORDER BY id DESC
+            LIMIT $2
+        """),
+        "older": db.register("nurse_history_older", """
+            SELECT id, message, message_type
+            FROM nurse_chat_data
+            WHERE mobile_number = $1 AND id > $2 AND id < $3
+            ORDER BY id DESC
+            LIMIT $4
+        """),
+    },
+    "coordinator": {
+        "recent": db.register("coordinator_history_recent", """
+            SELECT id, message
+            FROM coordinator_chat_data
+            WHERE sender = $1
+            ORDER BY id DESC
+            LIMIT $2
+        """),
+        "older": db.register("coordinator_history_older", """
+            SELECT id, message, message_type
+            FROM coordinator_chat_data
+            WHERE sender = $1 AND id > $2 AND id < $3
+            ORDER BY id DESC
+            LIMIT $4
+        """),
+    },
+}
+
+
+def estimate_tokens(text: str | None) -> int:
+    # Roughly four characters per token for English chat text.
+    return len(text or "") // 4 + 1
+
+
+SUMMARY_PROMPT = """
+You keep a running summary of an SMS conversation between a staffing assistant and a {kind}.
+
+Current summary (may be empty):
+{summary}
+
+Older messages to add to it, oldest first:
+{messages}
+
+Rewrite the summary so it also covers these messages. Keep what later replies may need:
+names, dates, shifts, facilities, availability, what was confirmed, declined or cancelled,
+and questions still open. Leave out greetings and small talk. Use at most {max_chars} characters.
+
+Return the output in this JSON format only:
+{{"summary": "<the updated summary>"}}
+"""
+
+
+def summary_lines(kind: str, rows) -> list[str]:
+    """Older messages as ``Speaker: text`` lines, each shortened to SUMMARY_LINE_CHARS."""
+    lines = []
+    for row in rows:
+        text = " ".join((row["message"] or "").split())
+        if text:
+            speaker = "Assistant" if row["message_type"] == "sent" else kind.capitalize()
+            lines.append(f"{speaker}: {text[:SUMMARY_LINE_CHARS]}")
+    return lines
+
+
+def truncate_summary(summary: str, lines: list[str]) -> str:
+    """Fallback when the model is unavailable: append the lines, keep the most recent part."""
+    combined = " | ".join(([summary] if summary else []) + lines)
+    if len(combined) > CHAT_SUMMARY_CHAR_BUDGET:
+        combined = "..." + combined[-CHAT_SUMMARY_CHAR_BUDGET:]
+    return combined
+
+
+async def summarize_turns(kind: str, summary: str, lines: list[str]) -> str:
+    """Condense older turns into the rolling summary with one cached model call."""
+    if not lines:
+        return summary
+    prompt = SUMMARY_PROMPT.format(
+        kind=kind, summary=summary or "(none)", messages="\n".join(lines), max_chars=CHAT_SUMMARY_CHAR_BUDGET
+    )
+    try:
+        reply = await cached_generate("history_summary", {"kind": kind, "summary": summary, "lines": lines}, prompt)
+        condensed = " ".join(str(parse_ai_json(reply).get("summary") or "").split())
+        if condensed:
+            return condensed[:CHAT_SUMMARY_CHAR_BUDGET]
+        logger.warning("Chat summary reply was empty; keeping the latest turns instead")
+    except Exception as e:
+        logger.warning("Chat summary failed; keeping the latest turns instead: %s", e)
+    return truncate_summary(summary, lines)
+
+
+SUMMARY_QUERY = db.register("chat_summary_get", """
+    SELECT summary, last_message_id
+    FROM chat_history_summary
+    WHERE kind = $1 AND sender = $2
+""")
+
+SUMMARY_UPSERT = db.register("chat_summary_upsert", """
+    INSERT INTO chat_history_summary (kind, sender, summary, last_message_id, updated_at)
+    VALUES ($1, $2, $3, $4, NOW())
+    ON CONFLICT (kind, sender) DO UPDATE
+    SET summary = EXCLUDED.summary,
+        last_message_id = EXCLUDED.last_message_id,
+        updated_at = EXCLUDED.updated_at
+""")
+
+
+async def _update_summary(kind: str, sender: str, window_start_id: int) -> str:
+    row = await db.fetchrow_named(SUMMARY_QUERY, kind, sender)
+    summary = row["summary"] if row else ""
+    last_message_id = row["last_message_id"] if row else 0
+
+    if window_start_id - 1 <= last_message_id:
+        return summary
+
+    older = await db.fetch_named(
+        HISTORY_QUERIES[kind]["older"], sender, last_message_id, window_start_id, SUMMARY_FOLD_LIMIT
+    )
+    if not older:
+        return summary
+
+    older = list(reversed(older))
+    summary = await summarize_turns(kind, summary, summary_lines(kind, older))
+    await db.execute_named(SUMMARY_UPSERT, kind, sender, summary, older[-1]["id"])
+    return summary
+
+
+async def get_history(kind: str, sender: str, token_budget: int = CHAT_HISTORY_TOKEN_BUDGET) -> list[str]:
+    """Most recent messages in chronological order, within ``token_budget``.
+
+    Messages that no longer fit are condensed by the model into a
+    per-sender rolling summary (see ``summarize_turns``), stored in
+    ``chat_history_summary`` and prepended as the first entry. Each older
+    message is summarized once, when it leaves the window.
+    """
+    rows = await db.fetch_named(HISTORY_QUERIES[kind]["recent"], sender, CHAT_HISTORY_MAX_MESSAGES)
+
+    window = []
+    used = 0
+    for row in rows:
+        cost = estimate_tokens(row["message"])
+        if window and used + cost > token_budget:
+            break
+        window.append(row)
+        used += cost
+
+    if not window:
+        return []
+
+    window.reverse()
+    messages = [row["message"] for row in window]
+
+    has_older = len(window) < len(rows) or len(rows) == CHAT_HISTORY_MAX_MESSAGES
+    if has_older:
+        summary = await _update_summary(kind, sender, window[0]["id"])
+        if summary:
+            messages.insert(0, f"Summary of earlier messages: {summary}")
+    return messages
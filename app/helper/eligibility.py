@@ -0,0 +1,139 @@
+import logging
+from app.database import db
+from app.utils.geo_radius import EARTH_RADIUS_MILES, NURSE_RADIUS_MILES, radius_filter, radius_params
+
+logger = logging.getLogger(__name__)
+
+# Great-circle distance between nurse ``n`` (precomputed unit vector) and facility ``f``.
+NURSE_FACILITY_DISTANCE = f"""{EARTH_RADIUS_MILES} * acos(LEAST(1.0, GREATEST(-1.0,
+        n.geo_x * cos(radians(f.lat)) * cos(radians(f.lng))
+      + n.geo_y * cos(radians(f.lat)) * sin(radians(f.lng))
+      + n.geo_z * sin(radians(f.lat))
+    )))"""
+
+REFRESH_NURSE_QUERY = f"""
+    INSERT INTO nurse_facility_eligibility (facility_id, nurse_id, nurse_type, shift, distance_miles)
+    SELECT facility_id, nurse_id, nurse_type, shift, distance_miles
+    FROM (
+        SELECT f.id AS facility_id, n.id AS nurse_id,
+               lower(n.nurse_type) AS nurse_type, lower(n.shift) AS shift,
+               {NURSE_FACILITY_DISTANCE} AS distance_miles
+        FROM nurses n
+        CROSS JOIN facilities f
+        WHERE n.id = ANY($1::int[])
+          AND n.lat IS NOT NULL AND n.lng IS NOT NULL
+          AND f.lat IS NOT NULL AND f.lng IS NOT NULL
+    ) d
+    WHERE distance_miles <= $2
+"""
+
+REFRESH_FACILITY_QUERY = f"""
+    INSERT INTO nurse_facility_eligibility (facility_id, nurse_id, nurse_type, shift, distance_miles)
+    SELECT f.id, n.id, lower(n.nurse_type), lower(n.shift), {NURSE_FACILITY_DISTANCE}
+    FROM facilities f
+    JOIN nurses n ON {radius_filter("n", 2)}
+    WHERE f.id = $1
+"""
+
+# Facilities whose rows for these nurses may be stale after a failed refresh:
+# those holding rows for them, and those offering their (current) nurse type.
+STALE_FACILITIES_QUERY = """
+    UPDATE facilities
+    SET eligibility_refreshed_at = NULL
+    WHERE id IN (
+        SELECT facility_id FROM nurse_facility_eligibility WHERE nurse_id = ANY($1::int[])
+        UNION
+        SELECT s.facility_id
+        FROM shifts s
+        JOIN nurses n ON lower(n.nurse_type) = lower(s.role)
+        WHERE n.id = ANY($1::int[])
+    )
+"""
+
+ELIGIBLE_NURSES_QUERY = """
+    SELECT n.*, e.distance_miles
+    FROM nurse_facility_eligibility e
+    JOIN nurses n ON n.id = e.nurse_id
+    WHERE e.facility_id = $1 AND e.nurse_type = lower($2) AND e.shift = lower($3)
+    ORDER BY e.distance_miles
+"""
+
+
+async def refresh_nurse_eligibility(nurse_id: int) -> None:
+    """Recompute every facility row for one nurse after it is added or edited."""
+    await refresh_nurses_eligibility([nurse_id])
+
+
+async def refresh_nurses_eligibility(nurse_ids: list[int]) -> None:
+    """Recompute every facility row for a set of nurses in one statement, e.g. after an import."""
+    if not nurse_ids:
+        return
+    try:
+        async with db.transaction() as conn:
+            await conn.execute("DELETE FROM nurse_facility_eligibility WHERE nurse_id = ANY($1::int[])", nurse_ids)
+            await conn.execute(REFRESH_NURSE_QUERY, nurse_ids, float(NURSE_RADIUS_MILES))
+    except Exception as e:
+        # The nurses' rows may now be stale; have the affected facilities rebuild on next use.
+        logger.error("Eligibility refresh failed for %s nurse(s): %s", len(nurse_ids), e)
+        try:
+            await db.execute(STALE_FACILITIES_QUERY, nurse_ids)
+        except Exception as e:
+            logger.error("Could not mark facilities stale for %s nurse(s): %s", len(nurse_ids), e)
+
+
+async def refresh_facility_eligibility(facility_id: int) -> None:
+    """Recompute every nurse row for one facility after it is added or moved."""
+    facility = await db.fetchrow("SELECT lat, lng FROM facilities WHERE id = $1", facility_id)
+    if not facility:
+        return
+
+    try:
+        async with db.transaction() as conn:
+            await conn.execute("DELETE FROM nurse_facility_eligibility WHERE facility_id = $1", facility_id)
+            if facility["lat"] is not None and facility["lng"] is not None:
+                await conn.execute(
+                    REFRESH_FACILITY_QUERY, facility_id,
+                    *radius_params(float(facility["lat"]), float(facility["lng"]))
+                )
+            await conn.execute(
+                "UPDATE facilities SET eligibility_refreshed_at = NOW() WHERE id = $1", facility_id
+            )
+    except Exception as e:
+        logger.error("Eligibility refresh failed for facility %s: %s", facility_id, e)
+        try:
+            await db.execute("UPDATE facilities SET eligibility_refreshed_at = NULL WHERE id = $1", facility_id)
+        except Exception as e:
+            logger.error("Could not mark facility %s stale: %s", facility_id, e)
+
+
+async def ensure_facility_eligibility(facility_id: int) -> None:
+    """Build a facility's rows on first use, e.g. facilities created before this table
+    existed or whose refresh failed after a write."""
+    row = await db.fetchrow("SELECT eligibility_refreshed_at FROM facilities WHERE id = $1", facility_id)
+    if row and row["eligibility_refreshed_at"] is None:
+        await refresh_facility_eligibility(facility_id)
+
+
+async def rename_nurse_type(old_nurse_type: str, new_nurse_type: str) -> None:
+    await db.execute("""
+        UPDATE nurse_facility_eligibility
+        SET nurse_type = lower($2)
+        WHERE nurse_type = lower($1)
+    """, old_nurse_type, new_nurse_type)
+
+
+async def get_eligible_nurses(facility_id: int, nurse_type: str, shift: str):
+    """Nurses of ``nurse_type``/``shift`` within the radius of a facility, nearest first."""
+    await ensure_facility_eligibility(facility_id)
+    return await db.fetch(ELIGIBLE_NURSES_QUERY, facility_id, nurse_type, shift)
+
+
+async def get_nurse_distance(facility_id: int, nurse_id: int) -> float | None:
+    """Distance in miles when the nurse is within the radius of the facility, else None."""
+    await ensure_facility_eligibility(facility_id)
+    row = await db.fetchrow("""
+        SELECT distance_miles
+        FROM nurse_facility_eligibility
+        WHERE facility_id = $1 AND nurse_id = $2
+    """, facility_id, nurse_id)
+    return row["distance_miles"] if row else None
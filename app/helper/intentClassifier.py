@@ -0,0 +1,151 @@
+import re
+import time
+from datetime import date
+from app.utils.convert_mm_dd_yyyy_to_mm_dd import convert_to_md
+
+# Local rules that answer trivial chat messages without a model call. Anything
+# that does not match a rule confidently returns None and goes to Gemini.
+
+GREETINGS = {"hi", "hii", "hello", "hey", "hey there", "hello there", "good morning", "good afternoon", "good evening"}
+THANKS = {"thanks", "thank you", "thanks a lot", "thank you so much", "thx", "ty", "many thanks"}
+ACKNOWLEDGEMENTS = {"ok", "okay", "k", "yes", "yeah", "yep", "sure", "no", "nope", "cool", "great", "got it", "alright", "sounds good"}
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+STATE_TTL_SECONDS = 24 * 60 * 60
+
+# sender -> {"last_reply": str, "date_choice": {...}, "updated_at": float}
+conversation_state: dict[str, dict] = {}
+
+stats = {"short_circuited": 0, "escalated": 0, "by_intent": {}}
+
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"[^\w\s/-]", " ", (text or "").lower())
+    return " ".join(text.split())
+
+
+def _state(sender: str) -> dict:
+    state = conversation_state.get(sender)
+    if state and time.time() - state["updated_at"] > STATE_TTL_SECONDS:
+        conversation_state.pop(sender, None)
+        state = None
+    return state or {}
+
+
+def _update_state(sender: str, **values) -> None:
+    state = conversation_state.setdefault(sender, {})
+    state.update(values)
+    state["updated_at"] = time.time()
+
+
+def remember_reply(sender: str, message: str) -> None:
+    """Record the last thing the bot said so bare acknowledgements can be judged."""
+    _update_state(sender, last_reply=message or "")
+
+
+def set_pending_date_choice(sender: str, facility_name: str, dates: list) -> None:
+    """The nurse was asked to pick one of ``dates`` at ``facility_name``."""
+    _update_state(sender, date_choice={"facility_name": facility_name, "dates": list(dates)})
+
+
+def _short_circuit(intent: str, reply: dict) -> dict:
+    stats["short_circuited"] += 1
+    stats["by_intent"][intent] = stats["by_intent"].get(intent, 0) + 1
+    return reply
+
+
+def _escalate() -> None:
+    stats["escalated"] += 1
+    return None
+
+
+def parse_bare_date(text: str) -> tuple[int, int, int | None] | None:
+    """Return ``(month, day, year)`` when the whole message is just a date."""
+    normalized = _normalize(text)
+    normalized = re.sub(r"^(on|for)\s+", "", normalized)
+
+    match = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})", normalized)
+    if match:
+        year, month, day = map(int, match.groups())
+        return month, day, year
+
+    match = re.fullmatch(r"(\d{1,2})[/-](\d{1,2})(?:[/-](\d{2,4}))?", normalized)
+    if match:
+        first, second = int(match.group(1)), int(match.group(2))
+        year = int(match.group(3)) if match.group(3) else None
+        if year is not None and year < 100:
+            year += 2000
+        # Month first, as in "6/4" meaning June 4th, unless that cannot be a month.
+        month, day = (second, first) if first > 12 else (first, second)
+        return month, day, year
+
+    match = re.fullmatch(r"([a-z]+)\s+(\d{1,2})(?:st|nd|rd|th)?(?:\s+(\d{4}))?", normalized)
+    if match and match.group(1)[:3] in MONTHS:
+        return MONTHS[match.group(1)[:3]], int(match.group(2)), int(match.group(3)) if match.group(3) else None
+
+    match = re.fullmatch(r"(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?([a-z]+)(?:\s+(\d{4}))?", normalized)
+    if match and match.group(2)[:3] in MONTHS:
+        return MONTHS[match.group(2)[:3]], int(match.group(1)), int(match.group(3)) if match.group(3) else None
+
+    return None
+
+
+def _match_pending_date(parsed: tuple, dates: list) -> date | None:
+    month, day, year = parsed
+    matches = [
+        d for d in dates
+        if d.month == month and d.day == day and (year is None or d.year == year)
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+def classify_coordinator_message(sender: str, text: str) -> dict | None:
+    normalized = _normalize(text)
+    state = _state(sender)
+
+    if normalized in GREETINGS:
+        return _short_circuit("greeting", {"message": "Hello! How can I assist you today?", "nurse_details": None})
+    if normalized in THANKS:
+        return _short_circuit("thanks", {"message": "You're welcome! Let me know if you need anything else.", "nurse_details": None})
+    if normalized in ACKNOWLEDGEMENTS:
+        last_reply = state.get("last_reply")
+        # Only safe when we know the bot's last message was not a question awaiting this answer.
+        if last_reply is not None and not last_reply.rstrip().endswith("?"):
+            return _short_circuit("acknowledgement", {"message": "Great! Let me know if you need anything else.", "nurse_details": None})
+    return _escalate()
+
+
+def classify_nurse_message(sender: str, text: str) -> dict | None:
+    normalized = _normalize(text)
+    state = _state(sender)
+
+    if normalized in GREETINGS:
+        return _short_circuit("greeting", {"message": "Hello! How can I help you today?"})
+    if normalized in THANKS:
+        return _short_circuit("thanks", {"message": "You're welcome! Let me know if you need anything else."})
+
+    date_choice = state.get("date_choice")
+    if date_choice:
+        parsed = parse_bare_date(text)
+        chosen = _match_pending_date(parsed, date_choice["dates"]) if parsed else None
+        if chosen:
+            state.pop("date_choice", None)
+            facility_name = date_choice["facility_name"]
+            return _short_circuit("date_choice", {
+                "message": f"Thanks! Let me confirm the shift on {convert_to_md(chosen)} at {facility_name} for you.",
+                "shift": {facility_name: chosen.isoformat()},
+            })
+    return _escalate()
+
+
+def metrics() -> dict:
+    total = stats["short_circuited"] + stats["escalated"]
+    return {
+        **stats,
+        "short_circuit_ratio": round(stats["short_circuited"] / total, 4) if total else 0.0,
+        "tracked_conversations": len(conversation_state),
+    }
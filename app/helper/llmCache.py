@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+from app.database import db
+from app.helper.llmGateway import llm_gateway
+from app.utils.parse_ai_json import parse_ai_json
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2048"))
+LLM_CACHE_SHARED = os.getenv("LLM_CACHE_SHARED", "false").lower() == "true"
+
+# Seconds a reply stays valid, per prompt type. Override with LLM_CACHE_TTL_<TYPE>.
+DEFAULT_TTLS = {
+    "coordinator_reply": 300,
+    "nurse_reply": 300,
+    "outreach": 3600,
+    "outreach_batch": 3600,
+    "follow_up": 3600,
+    "history_summary": 86400,
+}
+TTLS = {
+    prompt_type: int(os.getenv(f"LLM_CACHE_TTL_{prompt_type.upper()}", ttl))
+    for prompt_type, ttl in DEFAULT_TTLS.items()
+}
+
+SHARED_CLEANUP_EVERY = 500
+
+
+def normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {str(k): normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+
+class LLMCache:
+    """In-process TTL/LRU cache for model replies with an optional Postgres tier.
+
+    Keys are a hash of the prompt type and its normalized arguments, so two
+    calls that would build the same prompt share one reply. Setting
+    LLM_CACHE_SHARED=true also reads and writes the ``llm_cache`` table so
+    every worker sees the same entries.
+    """
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttls: dict = TTLS, shared: bool = LLM_CACHE_SHARED):
+        self.max_entries = max_entries
+        self.ttls = ttls
+        self.shared = shared
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.by_type: dict[str, dict] = {}
+        self._shared_writes = 0
+
+    @staticmethod
+    def make_key(prompt_type: str, args: dict) -> str:
+        payload = json.dumps({"fn": prompt_type, "args": normalize(args)}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, prompt_type: str, outcome: str) -> None:
+        counters = self.by_type.setdefault(prompt_type, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    async def get(self, prompt_type: str, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._count(prompt_type, "hits")
+                return value
+            del self._entries[key]
+
+        if self.shared:
+            try:
+                row = await db.fetchrow("""
+                    SELECT response, EXTRACT(EPOCH FROM (expires_at - NOW())) AS ttl
+                    FROM llm_cache
+                    WHERE cache_key = $1 AND expires_at > NOW()
+                """, key)
+            except Exception as e:
+                logger.warning("Shared LLM cache read failed: %s", e)
+                row = None
+            if row:
+                self._store(key, row["response"], float(row["ttl"]))
+                self.hits += 1
+                self.shared_hits += 1
+                self._count(prompt_type, "hits")
+                return row["response"]
+
+        self.misses += 1
+        self._count(prompt_type, "misses")
+        return None
+
+    def _store(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def set(self, prompt_type: str, key: str, value: str) -> None:
+        ttl = self.ttls.get(prompt_type, 0)
+        if ttl <= 0:
+            return
+        self._store(key, value, ttl)
+
+        if self.shared:
+            try:
+                await db.execute("""
+                    INSERT INTO llm_cache (cache_key, prompt_type, response, expires_at)
+                    VALUES ($1, $2, $3, NOW() + make_interval(secs => $4))
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET response = EXCLUDED.response, expires_at = EXCLUDED.expires_at
+                """, key, prompt_type, value, float(ttl))
+                self._shared_writes += 1
+                if self._shared_writes % SHARED_CLEANUP_EVERY == 0:
+                    await db.execute("DELETE FROM llm_cache WHERE expires_at < NOW()")
+            except Exception as e:
+                logger.warning("Shared LLM cache write failed: %s", e)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "shared": self.shared,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "by_type": self.by_type,
+        }
+
+
+llm_cache = LLMCache()
+
+
+async def cached_generate(prompt_type: str, key_args: dict, prompt: str) -> str:
+    key = LLMCache.make_key(prompt_type, key_args)
+    cached = await llm_cache.get(prompt_type, key)
+    if cached is not None:
+        return cached
+
+    reply = await llm_gateway.generate(prompt)
+    # Only replies the callers can actually parse are worth replaying.
+    try:
+        parse_ai_json(reply)
+    except (ValueError, TypeError):
+        return reply
+    await llm_cache.set(prompt_type, key, reply)
+    return reply
@@ -0,0 +1,85 @@
+import os
+import asyncio
+import logging
+import time
+from dotenv import load_dotenv
+import google.generativeai as genai
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "gemini-2.0-flash")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+
+genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+
+class LLMGateway:
+    """Async front door for every Gemini call.
+
+    Calls go through ``generate_content_async`` so the event loop is never
+    blocked on model I/O, at most ``max_concurrency`` requests are in flight
+    at once and each one is bounded by ``timeout`` seconds. Callers waiting
+    for a slot are counted as queued so the metrics show back-pressure.
+    """
+
+    def __init__(self, model, max_concurrency: int = LLM_MAX_CONCURRENCY, timeout: float = LLM_TIMEOUT_SECONDS):
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.queued = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.total_latency = 0.0
+
+    async def generate(self, prompt: str, timeout: float | None = None) -> str:
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                self.model.generate_content_async(prompt),
+                timeout=timeout or self.timeout,
+            )
+            self.completed += 1
+            return response.text
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.warning("LLM call timed out after %ss", timeout or self.timeout)
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.total_latency += time.perf_counter() - started
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def metrics(self) -> dict:
+        finished = self.completed + self.failed + self.timed_out
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "avg_latency_ms": round(self.total_latency / finished * 1000, 2) if finished else 0.0,
+        }
+
+
+model = genai.GenerativeModel(LLM_MODEL_NAME)
+llm_gateway = LLMGateway(model)
@@ -0,0 +1,81 @@
+import os
+import re
+from dotenv import load_dotenv
+from app.database import db
+
+load_dotenv()
+
+# "template" renders outreach locally; "llm" always drafts it with Gemini.
+OUTREACH_MESSAGE_MODE = os.getenv("OUTREACH_MESSAGE_MODE", "template").lower()
+TEMPLATE_MAX_INSTRUCTIONS_LENGTH = int(os.getenv("TEMPLATE_MAX_INSTRUCTIONS_LENGTH", "120"))
+
+WORKED_BEFORE_TEMPLATE = (
+    "Hello! A {nurse_type} is required at {facility_name} facility for a {shift} shift on {date}. "
+    "You have worked there before. Are you interested in covering this shift?"
+)
+NEW_FACILITY_TEMPLATE = (
+    "Hello! A {nurse_type} is required at {facility_name} facility for a {shift} shift on {date}. "
+    "Kindly let me know if you are interested in this opportunity."
+)
+
+# One message for several openings of the same nurse type and shift.
+SERIES_TEMPLATE = (
+    "Hello! {nurse_type}s are required at {facility_name} facility for {shift} shifts on {dates}. "
+    "{worked_before}Please reply with the facility name and the dates you can cover."
+)
+SERIES_WORKED_BEFORE = "You have worked there before. "
+
+
+def instructions_need_rephrasing(additional_instructions: str | None) -> bool:
+    """Short single-sentence notes are appended verbatim; anything longer goes to the model."""
+    if not additional_instructions or not additional_instructions.strip():
+        return False
+    text = additional_instructions.strip()
+    if len(text) > TEMPLATE_MAX_INSTRUCTIONS_LENGTH or "\n" in text:
+        return True
+    sentences = [part for part in re.split(r"[.!?]+\s+", text) if part.strip()]
+    return len(sentences) > 1
+
+
+def use_llm_for_outreach(additional_instructions: str | None) -> bool:
+    return OUTREACH_MESSAGE_MODE == "llm" or instructions_need_rephrasing(additional_instructions)
+
+
+def render_shift_opening_message(nurse_type: str, facility_name: str, shift: str, date: str, worked_before: bool, additional_instructions: str | None = None) -> str:
+    template = WORKED_BEFORE_TEMPLATE if worked_before else NEW_FACILITY_TEMPLATE
+    message = template.format(nurse_type=nurse_type, facility_name=facility_name, shift=shift, date=date)
+    if additional_instructions and additional_instructions.strip():
+        note = additional_instructions.strip()
+        if note[-1] not in ".!?":
+            note += "."
+        message += f" Note: {note}"
+    return message
+
+
+def render_shift_series_message(nurse_type: str, facility_name: str, shift: str, dates: list[str], worked_before: bool, additional_instructions: str | None = None) -> str:
+    if len(dates) == 1:
+        return render_shift_opening_message(nurse_type, facility_name, shift, dates[0], worked_before, additional_instructions)
+    message = SERIES_TEMPLATE.format(
+        nurse_type=nurse_type, facility_name=facility_name, shift=shift, dates=", ".join(dates),
+        worked_before=SERIES_WORKED_BEFORE if worked_before else "",
+    )
+    if additional_instructions and additional_instructions.strip():
+        note = additional_instructions.strip()
+        if note[-1] not in ".!?":
+            note += "."
+        message += f" Note: {note}"
+    return message
+
+
+async def get_nurses_worked_at_facility(nurse_ids: list[int], facility_id: int, exclude_shift_id: int | None = None) -> set:
+    """Ids of the given nurses who have been booked on another shift at this facility."""
+    if not nurse_ids:
+        return set()
+    rows = await db.fetch("""
+        SELECT DISTINCT nurse_id
+        FROM shift_tracker
+        WHERE facility_id = $1
+          AND nurse_id = ANY($2::int[])
+          AND id IS DISTINCT FROM $3
+    """, facility_id, nurse_ids, exclude_shift_id)
+    return {row["nurse_id"] for row in rows}
@@ -0,0 +1,165 @@
+import os
+import asyncio
+import logging
+from dotenv import load_dotenv
+from app.database import db
+from app.utils.geo_lat_lng import geo_lat_lng
+from app.helper.referenceCache import reference_cache
+from app.helper.nurseIndex import nurse_index
+from app.helper.eligibility import refresh_nurses_eligibility
+from app.utils.roster import IMPORT_FIELDS, FileDuplicates, roster_records, validate_record
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+NURSE_IMPORT_CHUNK_SIZE = int(os.getenv("NURSE_IMPORT_CHUNK_SIZE", "500"))
+NURSE_IMPORT_GEOCODE_CONCURRENCY = int(os.getenv("NURSE_IMPORT_GEOCODE_CONCURRENCY", "8"))
+
+COPY_COLUMNS = list(IMPORT_FIELDS.values()) + ["lat", "lng"]
+
+# Existing nurses clashing with any row of a chunk, in one indexed lookup.
+DUPLICATES_QUERY = """
+    SELECT lower(email) AS email, mobile_number, talent_id
+    FROM nurses
+    WHERE lower(email) = ANY($1::text[])
+       OR mobile_number = ANY($2::text[])
+       OR talent_id = ANY($3::text[])
+"""
+
+
+async def _geocode_all(locations: set[str]) -> dict[str, dict | None]:
+    semaphore = asyncio.Semaphore(NURSE_IMPORT_GEOCODE_CONCURRENCY)
+
+    async def geocode(location):
+        async with semaphore:
+            try:
+                return location, await geo_lat_lng(location)
+            except Exception as e:
+                logger.warning("Roster geocode failed for %r: %s", location, e)
+                return location, None
+
+    return dict(await asyncio.gather(*(geocode(location) for location in locations)))
+
+
+class RosterImport:
+    """One roster upload: rows are validated, de-duplicated and loaded a chunk at a time.
+
+    Duplicates are checked within the file and, per chunk, against ``nurses``
+    in one set-based query; rows dropped before or during the load never count
+    as duplicates of later rows. Locations go through the geocode cache with
+    bounded concurrency, and each chunk is loaded with ``COPY`` in its own
+    transaction, so a failing chunk does not undo the earlier ones.
+    """
+
+    def __init__(self, nurse_types: dict):
+        self.nurse_types = nurse_types
+        self.received = 0
+        self.imported = 0
+        self.errors: list[dict] = []
+        self._duplicates = FileDuplicates()
+
+    def _reject(self, line_number: int, errors: list[str]) -> None:
+        self.errors.append({"line": line_number, "errors": errors})
+
+    def add(self, line_number: int, record: dict | None, error: str | None, chunk: list) -> None:
+        self.received += 1
+        if error:
+            self._reject(line_number, [error])
+            return
+        values, errors = validate_record(record, self.nurse_types)
+        if not errors:
+            errors = self._duplicates.check(values)
+        if errors:
+            self._reject(line_number, errors)
+            return
+        chunk.append((line_number, values))
+
+    async def load_chunk(self, chunk: list) -> None:
+        if not chunk:
+            return
+
+        existing = await db.fetch(
+            DUPLICATES_QUERY,
+            [values["email"].lower() for _, values in chunk],
+            [values["phone"] for _, values in chunk],
+            [values["talentId"] for _, values in chunk],
+        )
+        taken = {
+            "email": {row["email"] for row in existing},
+            "phone": {row["mobile_number"] for row in existing},
+            "talentId": {row["talent_id"] for row in existing},
+        }
+        fresh = []
+        for line_number, values in chunk:
+            clashes = [
+                f"A nurse with this {field} already exists"
+                for field, keys in taken.items()
+                if (values[field].lower() if field == "email" else values[field]) in keys
+            ]
+            if clashes:
+                self._reject(line_number, clashes)
+            else:
+                fresh.append((line_number, values))
+
+        geo = await _geocode_all({values["location"] for _, values in fresh})
+        records = []
+        loaded = []
+        for line_number, values in fresh:
+            location = geo.get(values["location"])
+            if not location or location.get("lat") is None:
+                self._reject(line_number, [f"Could not geocode location: {values['location']}"])
+                continue
+            # Earlier rows of this chunk that made it this far.
+            errors = self._duplicates.check(values)
+            if errors:
+                self._reject(line_number, errors)
+                continue
+            self._duplicates.add(line_number, values)
+            records.append(
+                tuple(values[field] for field in IMPORT_FIELDS) + (location["lat"], location["lng"])
+            )
+            loaded.append((line_number, values))
+        if not records:
+            return
+
+        try:
+            async with db.transaction() as conn:
+                await conn.copy_records_to_table("nurses", records=records, columns=COPY_COLUMNS)
+                rows = await conn.fetch(
+                    "SELECT id, nurse_type, shift, lat, lng FROM nurses WHERE talent_id = ANY($1::text[])",
+                    [record[COPY_COLUMNS.index("talent_id")] for record in records],
+                )
+        except Exception as e:
+            # e.g. a nurse with the same phone added while the import ran
+            logger.exception("Roster chunk of %s rows failed to load: %s", len(records), e)
+            for line_number, values in loaded:
+                self._duplicates.discard(line_number, values)
+                self._reject(line_number, ["Could not be saved; the chunk containing this row failed to load"])
+            return
+
+        self.imported += len(rows)
+        for row in rows:
+            nurse_index.upsert(row["id"], row["nurse_type"], row["shift"], row["lat"], row["lng"])
+        await refresh_nurses_eligibility([row["id"] for row in rows])
+
+    def report(self) -> dict:
+        return {
+            "received": self.received,
+            "imported": self.imported,
+            "failed": len(self.errors),
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+        }
+
+
+async def import_nurse_roster(chunks, fmt: str, chunk_size: int = NURSE_IMPORT_CHUNK_SIZE) -> dict:
+    """Import a streamed CSV or JSONL roster and return the per-row report."""
+    nurse_types = {row["nurse_type"].lower(): row["nurse_type"] for row in await reference_cache.nurse_types()}
+    roster = RosterImport(nurse_types)
+    chunk = []
+    async for line_number, record, error in roster_records(chunks, fmt):
+        roster.add(line_number, record, error, chunk)
+        if len(chunk) >= chunk_size:
+            await roster.load_chunk(chunk)
+            chunk = []
+    await roster.load_chunk(chunk)
+    return roster.report()
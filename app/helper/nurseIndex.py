@@ -0,0 +1,148 @@
+import os
+import asyncio
+import logging
+import time
+import numpy as np
+from dotenv import load_dotenv
+from app.database import db
+from app.utils.geo_radius import EARTH_RADIUS_MILES
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Other workers' nurse edits reach this process's index after at most this long.
+NURSE_INDEX_REFRESH_SECONDS = float(os.getenv("NURSE_INDEX_REFRESH_SECONDS", "300"))
+
+
+def haversine_miles(lat1, lng1, lat2, lng2):
+    """Great-circle distance in miles; any argument may be a NumPy array."""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _key(nurse_type: str, shift: str) -> tuple[str, str]:
+    return (nurse_type or "").strip().lower(), (shift or "").strip().lower()
+
+
+class _Partition:
+    """Nurses of one (nurse_type, shift); arrays are rebuilt lazily after edits."""
+
+    def __init__(self):
+        self.points: dict[int, tuple[float, float]] = {}
+        self._arrays = None
+
+    def put(self, nurse_id: int, lat: float, lng: float) -> None:
+        self.points[nurse_id] = (lat, lng)
+        self._arrays = None
+
+    def drop(self, nurse_id: int) -> None:
+        if self.points.pop(nurse_id, None) is not None:
+            self._arrays = None
+
+    def arrays(self):
+        if self._arrays is None:
+            ids = np.fromiter(self.points.keys(), dtype=np.int64, count=len(self.points))
+            coords = np.array(list(self.points.values()), dtype=np.float64).reshape(-1, 2)
+            self._arrays = (ids, coords[:, 0], coords[:, 1])
+        return self._arrays
+
+
+class NurseSpatialIndex:
+    """In-process index of nurse coordinates partitioned by nurse type and shift.
+
+    ``within`` answers "nurses within R miles of a point" with one vectorized
+    haversine pass over the matching partition. It backs up the eligibility
+    table, so nothing is loaded until the first ``ensure_fresh``; until then
+    ``upsert``/``remove``/``refresh_nurse`` are no-ops. Once loaded, admin nurse
+    endpoints keep it current through them, and a full reload every
+    NURSE_INDEX_REFRESH_SECONDS picks up writes made by other workers.
+    """
+
+    def __init__(self, refresh_seconds: float = NURSE_INDEX_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.partitions: dict[tuple[str, str], _Partition] = {}
+        self._partition_of: dict[int, tuple[str, str]] = {}
+        self.loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        rows = await db.fetch("""
+            SELECT id, nurse_type, shift, lat, lng
+            FROM nurses
+            WHERE lat IS NOT NULL AND lng IS NOT NULL
+        """)
+        partitions: dict[tuple[str, str], _Partition] = {}
+        partition_of = {}
+        for row in rows:
+            key = _key(row["nurse_type"], row["shift"])
+            partitions.setdefault(key, _Partition()).put(row["id"], float(row["lat"]), float(row["lng"]))
+            partition_of[row["id"]] = key
+        self.partitions, self._partition_of = partitions, partition_of
+        self.loaded_at = time.monotonic()
+        logger.info("Nurse index loaded %s nurses in %s partitions", len(rows), len(partitions))
+
+    async def ensure_fresh(self) -> bool:
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_seconds:
+            return True
+        async with self._lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at >= self.refresh_seconds:
+                try:
+                    await self.load()
+                except Exception as e:
+                    logger.error("Nurse index load failed: %s", e)
+                    return self.loaded_at is not None
+        return True
+
+    def invalidate(self) -> None:
+        """Force a full reload on the next lookup, e.g. after a nurse type is renamed."""
+        self.loaded_at = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def upsert(self, nurse_id: int, nurse_type: str, shift: str, lat, lng) -> None:
+        if not self.loaded:
+            return
+        self.remove(nurse_id)
+        if lat is None or lng is None:
+            return
+        key = _key(nurse_type, shift)
+        self.partitions.setdefault(key, _Partition()).put(nurse_id, float(lat), float(lng))
+        self._partition_of[nurse_id] = key
+
+    def remove(self, nurse_id: int) -> None:
+        key = self._partition_of.pop(nurse_id, None)
+        if key and key in self.partitions:
+            self.partitions[key].drop(nurse_id)
+
+    async def refresh_nurse(self, nurse_id: int) -> None:
+        if not self.loaded:
+            return
+        row = await db.fetchrow("SELECT id, nurse_type, shift, lat, lng FROM nurses WHERE id = $1", nurse_id)
+        if row:
+            self.upsert(row["id"], row["nurse_type"], row["shift"], row["lat"], row["lng"])
+        else:
+            self.remove(nurse_id)
+
+    def within(self, lat: float, lng: float, miles: float, nurse_type: str, shift: str) -> list[tuple[int, float]]:
+        """``(nurse_id, distance)`` pairs within ``miles``, nearest first."""
+        partition = self.partitions.get(_key(nurse_type, shift))
+        if not partition or not partition.points:
+            return []
+        ids, lats, lngs = partition.arrays()
+        distances = haversine_miles(float(lat), float(lng), lats, lngs)
+        mask = distances <= miles
+        order = np.argsort(distances[mask])
+        return list(zip(ids[mask][order].tolist(), distances[mask][order].tolist()))
+
+    def metrics(self) -> dict:
+        return {
+            "nurses": len(self._partition_of),
+            "partitions": len(self.partitions),
+            "age_seconds": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at is not None else None,
+        }
+
+
+nurse_index = NurseSpatialIndex()
@@ -0,0 +1,116 @@
+import os
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+OUTREACH_CONCURRENCY = int(os.getenv("OUTREACH_CONCURRENCY", "10"))
+OUTREACH_DEADLINE_SECONDS = float(os.getenv("OUTREACH_DEADLINE_SECONDS", "120"))
+OUTREACH_PROGRESS_HISTORY = 500
+
+SENT = "sent"
+SKIPPED = "skipped"
+
+
+@dataclass
+class OutreachProgress:
+    shift_id: int
+    total: int
+    sent: int = 0
+    skipped: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    status: str = "running"
+    started_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    def as_dict(self) -> dict:
+        return {
+            "shift_id": self.shift_id,
+            "total": self.total,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "pending": self.total - self.sent - self.skipped - self.failed - self.cancelled,
+            "status": self.status,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+# Most recent runs per shift, oldest evicted first.
+outreach_progress: "OrderedDict[int, OutreachProgress]" = OrderedDict()
+
+# Strong references so background runs are not garbage collected mid-flight.
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_outreach_progress(shift_id: int) -> dict | None:
+    progress = outreach_progress.get(shift_id)
+    return progress.as_dict() if progress else None
+
+
+def _track(progress: OutreachProgress, shift_ids) -> None:
+    for shift_id in shift_ids:
+        outreach_progress[shift_id] = progress
+        outreach_progress.move_to_end(shift_id)
+    while len(outreach_progress) > OUTREACH_PROGRESS_HISTORY:
+        outreach_progress.popitem(last=False)
+
+
+async def fan_out(shift_id: int, items, worker, concurrency: int = OUTREACH_CONCURRENCY, deadline: float = OUTREACH_DEADLINE_SECONDS, related_shift_ids=()) -> OutreachProgress:
+    """Run ``worker(item)`` for every item with at most ``concurrency`` in flight.
+
+    The worker returns ``SENT`` or ``SKIPPED``; an exception counts as a
+    failure for that item only. Items still running when ``deadline``
+    seconds have elapsed are cancelled and counted as such. The progress is
+    also recorded under ``related_shift_ids``, e.g. the rest of a series.
+    """
+    items = list(items)
+    progress = OutreachProgress(shift_id=shift_id, total=len(items))
+    _track(progress, [shift_id, *related_shift_ids])
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(item):
+        async with semaphore:
+            try:
+                result = await worker(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                progress.failed += 1
+                logger.warning("Outreach for shift %s failed for one recipient: %s", shift_id, e)
+                return
+            if result == SENT:
+                progress.sent += 1
+            else:
+                progress.skipped += 1
+
+    tasks = [asyncio.create_task(run(item)) for item in items]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            progress.cancelled += len(pending)
+            progress.status = "deadline_exceeded"
+
+    if progress.status == "running":
+        progress.status = "done"
+    progress.finished_at = time.time()
+    logger.info("Outreach for shift %s finished: %s", shift_id, progress.as_dict())
+    return progress
+
+
+def run_in_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
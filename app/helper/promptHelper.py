@@ -1,16 +1,17 @@
 import os
+import json
 from dotenv import load_dotenv
-import google.generativeai as genai
 from datetime import datetime
 from app.database import db
+from app.models.queries import SHIFT_BY_ID, SHIFT_FACILITY_ID
+from app.helper.llmCache import cached_generate
+from app.helper.referenceCache import reference_cache
 from app.utils.convert_mm_dd_yyyy_to_mm_dd import convert_to_md
 load_dotenv()
 
 api_key = os.getenv("GEMINI_API_KEY")
 current_date = datetime.now().strftime('%Y-%m-%d')
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-2.0-flash")
 async def generateReplyFromAI(text: str, past_messages: str):
     prompt = f"""
 You are an AI chatbot designed to assist in scheduling nurse appointments for facilities. Your primary goal is to facilitate the booking process by gathering necessary details from staffing agencies. The conversation should remain focused on nurse bookings, and if it deviates, redirect it back to the topic.
@@ -265,8 +266,7 @@ Past Message history: {past_messages}
     """.strip()
 
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        return await cached_generate("coordinator_reply", {"text": text.casefold(), "past_messages": past_messages, "current_date": current_date}, prompt)
     except Exception as e:
         print("Error generating response:", e)
         return "Sorry, something went wrong."
@@ -470,8 +470,7 @@ make sure to ask for full details which are required for every scenario
 """
 
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        return await cached_generate("nurse_reply", {"text": text.casefold(), "past_messages": past_messages, "current_date": current_date}, prompt)
     except Exception as e:
         print("Error generating response:", e)
         return "Sorry, something went wrong."
@@ -479,18 +478,14 @@ make sure to ask for full details which are required for every scenario
 async def generate_message_for_nurse_ai(nurse_type: str, shift: str, date: str, past_messages: str, shift_id: int, additional_instructions: str):
     try:
         # Fetch shift from DB
-        shift_record = await db.fetchrow(
-            "SELECT * FROM shift_tracker WHERE id = $1", shift_id
-        )
+        shift_record = await db.fetchrow_named(SHIFT_BY_ID, shift_id)
         if not shift_record:
             return {"error": "Shift not found"}
 
         facility_id = shift_record["facility_id"]
 
         # Fetch facility details
-        facility = await db.fetchrow(
-            "SELECT * FROM facilities WHERE id = $1", facility_id
-        )
+        facility = await reference_cache.facility(facility_id)
         if not facility:
             return {"error": "Facility not found"}
 
@@ -534,13 +529,80 @@ You are an AI chatbot responsible for crafting friendly messages to nurses about
 - send the date exactly as it is provided in the date field
 """
 
-        response = model.generate_content(prompt)
-        return response.text
+        return await cached_generate("outreach", {
+            "nurse_type": nurse_type, "shift": shift, "date": date, "past_messages": past_messages,
+            "shift_id": shift_id, "additional_instructions": additional_instructions
+        }, prompt)
 
     except Exception as e:
         print("Error generating message:", e)
         return "Sorry, something went wrong."
 
+async def generate_messages_for_nurses_ai(nurse_type: str, shift: str, date: str, nurses_past_messages: dict, shift_id: int, additional_instructions: str):
+    """Draft one outreach message per nurse in a single model call.
+
+    ``nurses_past_messages`` maps nurse id to that nurse's past messages. The
+    model is asked for a JSON array of ``{"nurse_id", "message"}`` objects;
+    validating the entries is left to the caller.
+    """
+    try:
+        shift_record = await db.fetchrow_named(SHIFT_FACILITY_ID, shift_id)
+        if not shift_record:
+            return {"error": "Shift not found"}
+
+        facility = await reference_cache.facility(shift_record["facility_id"])
+        if not facility:
+            return {"error": "Facility not found"}
+
+        name = facility["name"]
+        formatted_date = datetime.strptime(date, "%Y-%m-%d").strftime("%m-%d-%Y")
+        formatted_date = convert_to_md(formatted_date)
+        nurses_block = json.dumps(
+            [{"nurse_id": nurse_id, "past_messages": messages} for nurse_id, messages in nurses_past_messages.items()],
+            default=str
+        )
+        prompt = f"""
+You are an AI chatbot responsible for crafting friendly messages to nurses about job openings at local facilities. Your task is to generate one text message for each nurse listed below about the same opening:
+
+1. Nurse Type: {nurse_type}
+2. Shift: {shift}
+3. Facility: {name}
+4. Date: {formatted_date}
+5. Additional Instructions: {additional_instructions}
+6. Nurses (each with their own past messages): {nurses_block}
+
+### Instructions:
+
+1. If a nurse's past messages show they have previously accepted a shift at the specified facility, formulate a message that acknowledges their prior experience.
+   Example: "Hello! A {nurse_type} is required at {name} facility for a {shift} shift on {formatted_date}. You have worked there before. Are you interested in covering this shift?"
+
+2. If the nurse has not worked at that facility before, create a message inviting them to consider the shift, using a friendly tone.
+   Example: "Hello! A {nurse_type} is required at {name} facility for a {shift} shift on {formatted_date}. Kindly let me know if you are interested in this opportunity."
+
+3. Incorporate any additional instructions provided in the Additional Instructions field into every message.
+
+4. Return exactly one entry per nurse, as a JSON array in the following format and nothing else:
+[
+  {{"nurse_id": 1, "message": "Friendly text you want to send to this nurse."}}
+]
+
+### Tone:
+- Ensure the tone is friendly and inviting.
+
+### Constraints:
+- send the date exactly as it is provided in the date field
+- use the nurse_id values exactly as given
+"""
+
+        return await cached_generate("outreach_batch", {
+            "nurse_type": nurse_type, "shift": shift, "date": date, "nurses_past_messages": nurses_past_messages,
+            "shift_id": shift_id, "additional_instructions": additional_instructions
+        }, prompt)
+
+    except Exception as e:
+        print("Error generating batch messages:", e)
+        return "Sorry, something went wrong."
+
 async def generate_follow_up_message_for_nurse(nurse_name: str, follow_up_message: str, facility_name: str):
     try:
         prompt = f"""
@@ -588,8 +650,9 @@ json
 }}
 return the output in the above specifief format only
 """
-        response = model.generate_content(prompt)
-        return response.text
+        return await cached_generate("follow_up", {
+            "nurse_name": nurse_name, "follow_up_message": follow_up_message, "facility_name": facility_name
+        }, prompt)
 
     except Exception as e:
         print("Error generating follow-up message:", e)
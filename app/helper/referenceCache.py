@@ -0,0 +1,153 @@
+import os
+import time
+from dotenv import load_dotenv
+from app.database import db
+
+load_dotenv()
+
+# Admin writes in this process invalidate entries immediately; the TTL bounds
+# how long another worker's edit can go unseen.
+REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+
+
+class _Section:
+    """One kind of reference data: key -> (expires_at, value), with hit counters."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.entries: dict = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def drop(self, key=None):
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class ReferenceCache:
+    """Read-through cache of the small, rarely changing tables: facilities,
+    their services (``shifts`` rows), nurse types and coordinators.
+
+    Rows are returned as plain dicts shared by all callers, so treat them as
+    read-only. Admin handlers that write these tables call the matching
+    ``invalidate_*`` hook.
+    """
+
+    def __init__(self, ttl: float = REFERENCE_CACHE_TTL_SECONDS):
+        self._facilities = _Section(ttl)
+        self._facility_names = _Section(ttl)
+        self._services = _Section(ttl)
+        self._nurse_types = _Section(ttl)
+        self._coordinators = _Section(ttl)
+
+    async def facility(self, facility_id: int) -> dict | None:
+        if facility_id is None:
+            return None
+        cached = self._facilities.get(facility_id)
+        if cached is not None:
+            return cached
+        row = await db.fetchrow("SELECT * FROM facilities WHERE id = $1", facility_id)
+        return self._facilities.put(facility_id, dict(row)) if row else None
+
+    async def facility_by_name(self, name: str) -> dict | None:
+        """Facility whose name matches case-insensitively, like ``name ILIKE``."""
+        key = (name or "").lower()
+        cached = self._facility_names.get(key)
+        if cached is not None:
+            return cached
+        row = await db.fetchrow("SELECT * FROM facilities WHERE name ILIKE $1", name)
+        return self._facility_names.put(key, dict(row)) if row else None
+
+    async def services_for(self, facility_id: int) -> list[dict]:
+        cached = self._services.get(facility_id)
+        if cached is not None:
+            return cached
+        rows = await db.fetch("SELECT * FROM shifts WHERE facility_id = $1 ORDER BY id", facility_id)
+        return self._services.put(facility_id, [dict(row) for row in rows])
+
+    async def service(self, facility_id: int, role: str) -> dict | None:
+        """The facility's service row for ``role``, matched case-insensitively like ``role ILIKE``."""
+        role = (role or "").lower()
+        for service in await self.services_for(facility_id):
+            if (service["role"] or "").lower() == role:
+                return service
+        return None
+
+    async def nurse_types(self) -> list[dict]:
+        cached = self._nurse_types.get("all")
+        if cached is not None:
+            return cached
+        rows = await db.fetch("SELECT * FROM nurse_type")
+        return self._nurse_types.put("all", [dict(row) for row in rows])
+
+    async def nurse_type_exists(self, nurse_type: str) -> bool:
+        return any(row["nurse_type"] == nurse_type for row in await self.nurse_types())
+
+    async def coordinator(self, coordinator_id: int) -> dict | None:
+        if coordinator_id is None:
+            return None
+        cached = self._coordinators.get(coordinator_id)
+        if cached is not None:
+            return cached
+        row = await db.fetchrow("SELECT * FROM coordinator WHERE id = $1", coordinator_id)
+        return self._coordinators.put(coordinator_id, dict(row)) if row else None
+
+    def invalidate_facility(self, facility_id: int | None = None) -> None:
+        """A facility, its services or its coordinators changed; None means all facilities."""
+        self._facilities.drop(facility_id)
+        self._facility_names.drop()
+        self._services.drop(facility_id)
+        # Coordinators are keyed by their own id, so drop them all.
+        self._coordinators.drop()
+
+    def invalidate_services(self, facility_id: int | None = None) -> None:
+        self._services.drop(facility_id)
+
+    def invalidate_nurse_types(self) -> None:
+        self._nurse_types.drop()
+        # Renaming or deleting a type rewrites service roles everywhere.
+        self._services.drop()
+
+    def invalidate_coordinators(self) -> None:
+        self._coordinators.drop()
+
+    def metrics(self) -> dict:
+        sections = {
+            "facilities": self._facilities,
+            "facility_names": self._facility_names,
+            "services": self._services,
+            "nurse_types": self._nurse_types,
+            "coordinators": self._coordinators,
+        }
+        hits = sum(section.hits for section in sections.values())
+        lookups = hits + sum(section.misses for section in sections.values())
+        return {
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            **{name: section.metrics() for name, section in sections.items()},
+        }
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,57 @@
+# Admin search boxes. Each entity has a lowercased ``search_text`` column
+# generated by Postgres from the searchable fields (so it is kept in sync on
+# every write) with a pg_trgm GIN index, which serves '%term%' patterns that
+# a btree cannot. The schema lives in app.models.schema.
+#
+# Fields are joined with a newline so a term cannot match across two fields.
+# Every filter takes the pattern built by ``search_pattern`` as $1.
+
+
+def search_pattern(term: str) -> str:
+    return f"%{term.strip().lower()}%"
+
+
+NURSE_SEARCH_TEXT = """lower(
+    coalesce(first_name, '') || ' ' || coalesce(last_name, '') || chr(10) ||
+    coalesce(email, '') || chr(10) || coalesce(mobile_number, '') || chr(10) ||
+    coalesce(shift, '') || chr(10) || coalesce(nurse_type, '')
+)"""
+
+FACILITY_SEARCH_TEXT = """lower(
+    coalesce(name, '') || chr(10) || coalesce(city_state_zip, '') || chr(10) || coalesce(address, '')
+)"""
+
+COORDINATOR_SEARCH_TEXT = """lower(
+    coalesce(coordinator_first_name, '') || ' ' || coalesce(coordinator_last_name, '')
+)"""
+
+SHIFT_SEARCH_TEXT = """lower(
+    coalesce(nurse_type, '') || chr(10) || coalesce(shift, '') || chr(10) || coalesce(status, '')
+)"""
+
+# The shift search matches nurses by full name and facilities by name only,
+# as before; these expressions have their own trigram indexes.
+NURSE_NAME_TEXT = "lower(first_name || ' ' || last_name)"
+FACILITY_NAME_TEXT = "lower(name)"
+
+NURSE_SEARCH_FILTER = "search_text LIKE $1"
+
+FACILITY_SEARCH_FILTER = "search_text LIKE $1"
+
+# One indexed branch per entity, unioned into the matching shift ids.
+SHIFT_SEARCH_FILTER = """s.id IN (
+      SELECT id FROM shift_tracker WHERE search_text LIKE $1
+      UNION
+      SELECT st.id FROM shift_tracker st
+      JOIN nurses sn ON sn.id = st.nurse_id
+      WHERE lower(sn.first_name || ' ' || sn.last_name) LIKE $1
+      UNION
+      SELECT st.id FROM shift_tracker st
+      JOIN facilities sf ON sf.id = st.facility_id
+      WHERE lower(sf.name) LIKE $1
+      UNION
+      SELECT st.id FROM shift_tracker st
+      JOIN coordinator sc ON sc.id = st.coordinator_id
+      WHERE sc.search_text LIKE $1
+    )"""
+
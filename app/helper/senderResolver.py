@@ -0,0 +1,93 @@
+import os
+import time
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+from app.database import db
+
+load_dotenv()
+
+SENDER_CACHE_TTL_SECONDS = float(os.getenv("SENDER_CACHE_TTL_SECONDS", "300"))
+SENDER_CACHE_MAX_ENTRIES = int(os.getenv("SENDER_CACHE_MAX_ENTRIES", "5000"))
+
+# Phone and email each use their own unique index; an OR across both
+# columns would not.
+COORDINATOR_QUERY = db.register("sender_coordinator", """
+    SELECT * FROM coordinator WHERE coordinator_phone = $1
+    UNION ALL
+    SELECT * FROM coordinator WHERE coordinator_email = $1 AND coordinator_phone IS DISTINCT FROM $1
+    LIMIT 1
+""")
+
+NURSE_QUERY = db.register("sender_nurse", "SELECT * FROM nurses WHERE mobile_number = $1")
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Who a chat message came from, resolved once per request."""
+    role: str
+    id: int
+    sender: str
+    facility_id: int | None = None
+    nurse_type: str | None = None
+    shift: str | None = None
+    record: dict = field(default_factory=dict, compare=False)
+
+
+class SenderResolver:
+    """Maps a webhook sender (phone or email) to a ``Principal`` with a TTL cache.
+
+    Admin handlers that add, edit or delete nurses and coordinators call
+    ``invalidate`` so a changed phone, type or shift is seen immediately.
+    """
+
+    def __init__(self, ttl: float = SENDER_CACHE_TTL_SECONDS, max_entries: int = SENDER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[tuple[str, str], tuple[float, Principal]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def _resolve(self, role: str, sender: str, query: str, build) -> Principal | None:
+        key = (role, sender)
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        row = await db.fetchrow_named(query, sender)
+        if not row:
+            return None
+        principal = build(dict(row))
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (time.monotonic() + self.ttl, principal)
+        return principal
+
+    async def coordinator(self, sender: str) -> Principal | None:
+        return await self._resolve("coordinator", sender, COORDINATOR_QUERY, lambda row: Principal(
+            role="coordinator", id=row["id"], sender=sender, facility_id=row["facility_id"], record=row,
+        ))
+
+    async def nurse(self, sender: str) -> Principal | None:
+        return await self._resolve("nurse", sender, NURSE_QUERY, lambda row: Principal(
+            role="nurse", id=row["id"], sender=sender,
+            nurse_type=row["nurse_type"], shift=row["shift"], record=row,
+        ))
+
+    def invalidate(self, role: str | None = None) -> None:
+        """Drop cached principals of ``role`` (all when None)."""
+        for key in [key for key in self._entries if role is None or key[0] == role]:
+            del self._entries[key]
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+sender_resolver = SenderResolver()
@@ -2,11 +2,24 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import adminRoutes, nurseRoutes, facilityRoutes, coordinatorRoutes, shiftRoutes
 from app.database import db
+from app.models.schema import ensure_schema
+from app.utils.outbox import outbox
+from app.utils.http_client import http_clients
+from app.utils.geocode_cache import zip_gazetteer
 app = FastAPI()
 
 @app.on_event("startup")
 async def startup():
     await db.connect()
+    await ensure_schema()
+    await http_clients.start()
+    zip_gazetteer.load()
+    await outbox.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await outbox.stop()
+    await http_clients.close()
 
 origins = [
     "http://localhost:5173", 
@@ -16,6 +16,9 @@ class Facility(Base):
     overtime_multiplier = Column(Numeric)
     lat = Column(Float)
     lng = Column(Float)
+    eligibility_refreshed_at = Column(TIMESTAMP(timezone=False))
+    # Generated: lowercased searchable fields, trigram-indexed for admin search
+    search_text = Column(Text)
 
 class Coordinator(Base):
     __tablename__ = "coordinator"
@@ -25,6 +28,8 @@ class Coordinator(Base):
     coordinator_last_name = Column(Text, nullable=False)
     coordinator_phone = Column(Text, unique=True, nullable=False)
     coordinator_email = Column(Text, unique=True, nullable=False)
+    # Generated: lowercased searchable fields, trigram-indexed for admin search
+    search_text = Column(Text)
 
 class CoordinatorChatData(Base):
     __tablename__ = "coordinator_chat_data"
@@ -51,6 +56,12 @@ class Nurse(Base):
     talent_id = Column(String(255), unique=True, nullable=False)
     lat = Column(Float)
     lng = Column(Float)
+    # Generated: unit vector of (lat, lng) for the radius search
+    geo_x = Column(Float)
+    geo_y = Column(Float)
+    geo_z = Column(Float)
+    # Generated: lowercased searchable fields, trigram-indexed for admin search
+    search_text = Column(Text)
 
 class NurseChatData(Base):
     __tablename__ = "nurse_chat_data"
@@ -106,4 +117,49 @@ class ShiftTracker(Base):
     booked_by = Column(String(255))
     additional_instructions = Column(Text)
     coordinator_id = Column(Integer, ForeignKey("coordinator.id", ondelete="CASCADE"))
+    # Generated: lowercased searchable fields, trigram-indexed for admin search
+    search_text = Column(Text)
 
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+    cache_key = Column(Text, primary_key=True)
+    prompt_type = Column(Text, nullable=False)
+    response = Column(Text, nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=False), nullable=False, index=True)
+
+class ChatHistorySummary(Base):
+    __tablename__ = "chat_history_summary"
+    kind = Column(Text, primary_key=True)
+    sender = Column(Text, primary_key=True)
+    summary = Column(Text, nullable=False, server_default="")
+    last_message_id = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(TIMESTAMP(timezone=False), server_default=func.now())
+
+class OutboundMessage(Base):
+    __tablename__ = "outbound_messages"
+    id = Column(Integer, primary_key=True, index=True)
+    recipient = Column(Text, nullable=False)
+    message = Column(Text, nullable=False)
+    status = Column(Text, nullable=False, server_default="pending")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    next_attempt_at = Column(TIMESTAMP(timezone=False), nullable=False, server_default=func.now())
+    locked_at = Column(TIMESTAMP(timezone=False))
+    last_error = Column(Text)
+    created_at = Column(TIMESTAMP(timezone=False), server_default=func.now())
+    sent_at = Column(TIMESTAMP(timezone=False))
+
+class GeocodeCacheEntry(Base):
+    __tablename__ = "geocode_cache"
+    query = Column(Text, primary_key=True)
+    lat = Column(Float, nullable=False)
+    lng = Column(Float, nullable=False)
+    source = Column(Text, nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=False), server_default=func.now())
+
+class NurseFacilityEligibility(Base):
+    __tablename__ = "nurse_facility_eligibility"
+    facility_id = Column(Integer, ForeignKey("facilities.id", ondelete="CASCADE"), primary_key=True)
+    nurse_id = Column(Integer, ForeignKey("nurses.id", ondelete="CASCADE"), primary_key=True, index=True)
+    nurse_type = Column(Text, nullable=False)
+    shift = Column(Text, nullable=False)
+    distance_miles = Column(Float, nullable=False)
@@ -0,0 +1,19 @@
+from app.database import db
+
+# Hot statements shared by several modules, prepared once per pooled
+# connection. Queries owned by a single module (chat history, sender
+# lookup, outbox claim) are registered next to their callers.
+
+SHIFT_BY_ID = db.register("shift_by_id", "SELECT * FROM shift_tracker WHERE id = $1")
+
+SHIFT_FACILITY_ID = db.register("shift_facility_id", "SELECT facility_id FROM shift_tracker WHERE id = $1")
+
+NURSE_CHAT_INSERT = db.register("nurse_chat_insert", """
+    INSERT INTO nurse_chat_data (mobile_number, message, message_type)
+    VALUES ($1, $2, $3)
+""")
+
+COORDINATOR_CHAT_INSERT = db.register("coordinator_chat_insert", """
+    INSERT INTO coordinator_chat_data (sender, message, message_type)
+    VALUES ($1, $2, $3)
+""")
@@ -0,0 +1,102 @@
+from app.database import db
+from app.helper.searchIndex import (
+    NURSE_SEARCH_TEXT, FACILITY_SEARCH_TEXT, COORDINATOR_SEARCH_TEXT, SHIFT_SEARCH_TEXT,
+    NURSE_NAME_TEXT, FACILITY_NAME_TEXT,
+)
+
+# Tables and indexes owned by the backend itself. Every statement is
+# idempotent so this runs safely on each startup.
+SCHEMA_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        cache_key TEXT PRIMARY KEY,
+        prompt_type TEXT NOT NULL,
+        response TEXT NOT NULL,
+        expires_at TIMESTAMP NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS llm_cache_expires_at_idx ON llm_cache (expires_at)",
+    """
+    CREATE TABLE IF NOT EXISTS chat_history_summary (
+        kind TEXT NOT NULL,
+        sender TEXT NOT NULL,
+        summary TEXT NOT NULL DEFAULT '',
+        last_message_id INTEGER NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (kind, sender)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS nurse_chat_data_sender_id_idx ON nurse_chat_data (mobile_number, id DESC)",
+    "CREATE INDEX IF NOT EXISTS coordinator_chat_data_sender_id_idx ON coordinator_chat_data (sender, id DESC)",
+    """
+    CREATE TABLE IF NOT EXISTS outbound_messages (
+        id SERIAL PRIMARY KEY,
+        recipient TEXT NOT NULL,
+        message TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        locked_at TIMESTAMP,
+        last_error TEXT,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        sent_at TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS outbound_messages_status_next_attempt_idx ON outbound_messages (status, next_attempt_at)",
+    # Unit vectors for the radius search, kept in sync by Postgres on every write.
+    "ALTER TABLE nurses ADD COLUMN IF NOT EXISTS geo_x DOUBLE PRECISION GENERATED ALWAYS AS (cos(radians(lat)) * cos(radians(lng))) STORED",
+    "ALTER TABLE nurses ADD COLUMN IF NOT EXISTS geo_y DOUBLE PRECISION GENERATED ALWAYS AS (cos(radians(lat)) * sin(radians(lng))) STORED",
+    "ALTER TABLE nurses ADD COLUMN IF NOT EXISTS geo_z DOUBLE PRECISION GENERATED ALWAYS AS (sin(radians(lat))) STORED",
+    "CREATE INDEX IF NOT EXISTS nurses_lat_lng_idx ON nurses (lat, lng)",
+    """
+    CREATE TABLE IF NOT EXISTS geocode_cache (
+        query TEXT PRIMARY KEY,
+        lat DOUBLE PRECISION NOT NULL,
+        lng DOUBLE PRECISION NOT NULL,
+        source TEXT NOT NULL,
+        updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+    )
+    """,
+    # Which nurses are within the outreach radius of which facility, with the
+    # distance; maintained by app.helper.eligibility on nurse/facility writes.
+    """
+    CREATE TABLE IF NOT EXISTS nurse_facility_eligibility (
+        facility_id INTEGER NOT NULL REFERENCES facilities(id) ON DELETE CASCADE,
+        nurse_id INTEGER NOT NULL REFERENCES nurses(id) ON DELETE CASCADE,
+        nurse_type TEXT NOT NULL,
+        shift TEXT NOT NULL,
+        distance_miles DOUBLE PRECISION NOT NULL,
+        PRIMARY KEY (facility_id, nurse_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS nurse_facility_eligibility_match_idx ON nurse_facility_eligibility (facility_id, nurse_type, shift, distance_miles)",
+    "CREATE INDEX IF NOT EXISTS nurse_facility_eligibility_nurse_idx ON nurse_facility_eligibility (nurse_id)",
+    "ALTER TABLE facilities ADD COLUMN IF NOT EXISTS eligibility_refreshed_at TIMESTAMP",
+    # Calendar feed: date-range scans filtered by facility and status.
+    "CREATE INDEX IF NOT EXISTS shift_tracker_date_facility_status_idx ON shift_tracker (date, facility_id, status)",
+    # Sort keys of the cursor-paginated admin lists (shifts page on the primary key).
+    "CREATE INDEX IF NOT EXISTS nurses_name_sort_idx ON nurses (last_name, first_name, id)",
+    "CREATE INDEX IF NOT EXISTS facilities_name_sort_idx ON facilities (name, id)",
+    # Admin search: generated search_text columns with trigram indexes (see app.helper.searchIndex).
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"ALTER TABLE nurses ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS ({NURSE_SEARCH_TEXT}) STORED",
+    f"ALTER TABLE facilities ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS ({FACILITY_SEARCH_TEXT}) STORED",
+    f"ALTER TABLE coordinator ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS ({COORDINATOR_SEARCH_TEXT}) STORED",
+    f"ALTER TABLE shift_tracker ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS ({SHIFT_SEARCH_TEXT}) STORED",
+    "CREATE INDEX IF NOT EXISTS nurses_search_text_trgm_idx ON nurses USING gin (search_text gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS facilities_search_text_trgm_idx ON facilities USING gin (search_text gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS coordinator_search_text_trgm_idx ON coordinator USING gin (search_text gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS shift_tracker_search_text_trgm_idx ON shift_tracker USING gin (search_text gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS nurses_name_trgm_idx ON nurses USING gin (({NURSE_NAME_TEXT}) gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS facilities_name_trgm_idx ON facilities USING gin (({FACILITY_NAME_TEXT}) gin_trgm_ops)",
+    # Join keys of the shift search branches
+    "CREATE INDEX IF NOT EXISTS shift_tracker_nurse_id_idx ON shift_tracker (nurse_id)",
+    "CREATE INDEX IF NOT EXISTS shift_tracker_facility_id_idx ON shift_tracker (facility_id)",
+    "CREATE INDEX IF NOT EXISTS shift_tracker_coordinator_id_idx ON shift_tracker (coordinator_id)",
+    # Roster import: case-insensitive duplicate check on nurse emails
+    "CREATE INDEX IF NOT EXISTS nurses_email_lower_idx ON nurses (lower(email))",
+]
+
+async def ensure_schema():
+    for statement in SCHEMA_STATEMENTS:
+        await db.execute(statement)
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Request, Response, Depends
-from app.controller.adminController import admin_login, admin_logout
+from app.controller.adminController import admin_login, admin_logout, admin_get_metrics
+from app.middleware.auth import get_current_user
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 @router.post("/login")
@@ -13,3 +14,6 @@ async def login(request: Request, response: Response):
 async def logout(request: Request, response: Response):
     return await admin_logout(request, response)
 
+@router.get("/metrics")
+async def metrics(request: Request, response: Response, user=Depends(get_current_user)):
+    return await admin_get_metrics(request, response)
@@ -2,7 +2,7 @@ from fastapi import APIRouter,Request, Response, Depends
 from pydantic import BaseModel
 from app.controller.nurseController import nurse_chat_bot
 from app.middleware.auth import get_current_user
-from app.controller.nurseController import admin_get_nurses,admin_get_nurse_by_id,admin_add_nurse,admin_edit_nurse,admin_delete_nurse,admin_get_available_nurses, admin_get_nurse_types, admin_get_nurse_type, admin_delete_nurse_type, admin_edit_nurse_type, admin_add_nurse_type, admin_delete_service
+from app.controller.nurseController import admin_get_nurses,admin_get_nurse_by_id,admin_add_nurse,admin_import_nurses,admin_edit_nurse,admin_delete_nurse,admin_get_available_nurses, admin_get_nurse_types, admin_get_nurse_type, admin_delete_nurse_type, admin_edit_nurse_type, admin_add_nurse_type, admin_delete_service
 router = APIRouter()
 
 class ChatNurseRequest(BaseModel):
@@ -27,6 +27,10 @@ async def get_nurse_by_id(request: Request, response: Response, id: int, user=De
 async def add_nurse(request: Request, response: Response, user=Depends(get_current_user)):
     return await admin_add_nurse(request, response)
 
+@router.post("/api/admin/import-nurses")
+async def import_nurses(request: Request, response: Response, user=Depends(get_current_user)):
+    return await admin_import_nurses(request, response)
+
 @router.put("/api/admin/edit-nurse/{id}")
 async def edit_nurse(request: Request, response: Response, id: int, user=Depends(get_current_user)):
     return await admin_edit_nurse(request, response, id=id)
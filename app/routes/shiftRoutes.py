@@ -1,4 +1,4 @@
-from app.controller.shiftController import admin_get_shifts, admin_get_all_shifts, admin_delete_shift, admin_add_shift, admin_get_shift_by_id, admin_edit_shift
+from app.controller.shiftController import admin_get_shifts, admin_get_all_shifts, admin_delete_shift, admin_add_shift, admin_add_shifts_bulk, admin_get_shift_by_id, admin_edit_shift, admin_get_outreach_progress
 from fastapi import APIRouter, Request, Response, Depends
 from app.middleware.auth import get_current_user
 
@@ -20,10 +20,18 @@ async def delete_shift(request: Request, response: Response, shift_id: int, user
 async def add_shift(request: Request, response: Response, user=Depends(get_current_user)):
     return await admin_add_shift(request, response)
 
+@router.post("/add-shifts-bulk")
+async def add_shifts_bulk(request: Request, response: Response, user=Depends(get_current_user)):
+    return await admin_add_shifts_bulk(request, response)
+
 @router.get("/get-shift-by-id/{id}")
 async def get_shift_by_id(request: Request, response: Response, id: int, user=Depends(get_current_user)):
     return await admin_get_shift_by_id(request, response, id=id)
 
 @router.put("/edit-shift/{id}")
 async def edit_shift(request: Request, response: Response, id: int, user=Depends(get_current_user)):
-    return await admin_edit_shift(request, response, id=id)
\ No newline at end of file
+    return await admin_edit_shift(request, response, id=id)
+
+@router.get("/outreach-progress/{shift_id}")
+async def get_outreach_progress(request: Request, response: Response, shift_id: int, user=Depends(get_current_user)):
+    return await admin_get_outreach_progress(request, response, shift_id=shift_id)
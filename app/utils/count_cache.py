@@ -0,0 +1,83 @@
+import os
+import time
+import logging
+from dotenv import load_dotenv
+from app.database import db
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_TTL_SECONDS = float(os.getenv("COUNT_CACHE_TTL_SECONDS", "30"))
+COUNT_CACHE_MAX_ENTRIES = int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "1000"))
+# Unfiltered totals of tables the planner believes are at least this big are
+# reported from pg_class statistics instead of being counted.
+COUNT_ESTIMATE_MIN_ROWS = int(os.getenv("COUNT_ESTIMATE_MIN_ROWS", "50000"))
+
+# Tables whose writes can change each endpoint's totals (shift search also
+# matches nurse, facility and coordinator names).
+ENDPOINT_TABLES = {
+    "shifts": {"shift_tracker", "nurses", "facilities", "coordinator"},
+    "nurses": {"nurses"},
+    "facilities": {"facilities"},
+}
+
+
+class CountCache:
+    """Totals for the paginated admin lists.
+
+    Exact counts are cached per (endpoint, search term) for a short TTL, so
+    paging through one search pays for a single COUNT. Writes drop the
+    affected endpoints through ``invalidate``. For large unfiltered tables
+    the planner's row estimate is returned and flagged as approximate.
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL_SECONDS, max_entries: int = COUNT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[tuple[str, str], tuple[float, int]] = {}
+        self.counters = {"hits": 0, "exact": 0, "estimated": 0, "invalidations": 0}
+
+    async def _estimate(self, table: str) -> int | None:
+        try:
+            row = await db.fetchrow(
+                "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass($1)", table
+            )
+        except Exception as e:
+            logger.warning("Row estimate for %s failed: %s", table, e)
+            return None
+        # reltuples is -1 for a table that has never been analyzed.
+        return int(row["estimate"]) if row and row["estimate"] is not None else None
+
+    async def count(self, endpoint: str, search: str | None, query: str, *args, table: str | None = None) -> tuple[int, bool]:
+        """``(total, approximate)`` for ``query``, a ``SELECT COUNT(*)`` returning one value."""
+        key = (endpoint, (search or "").strip().lower())
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.counters["hits"] += 1
+            return entry[1], False
+
+        if table and not key[1]:
+            estimate = await self._estimate(table)
+            if estimate is not None and estimate >= COUNT_ESTIMATE_MIN_ROWS:
+                self.counters["estimated"] += 1
+                return estimate, True
+
+        row = await db.fetchrow(query, *args)
+        total = int(row[0]) if row else 0
+        self.counters["exact"] += 1
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (time.monotonic() + self.ttl, total)
+        return total, False
+
+    def invalidate(self, *tables: str) -> None:
+        endpoints = {endpoint for endpoint, deps in ENDPOINT_TABLES.items() if deps & set(tables)}
+        for key in [key for key in self._entries if key[0] in endpoints]:
+            del self._entries[key]
+        self.counters["invalidations"] += 1
+
+    def metrics(self) -> dict:
+        return {"size": len(self._entries), "ttl_seconds": self.ttl, **self.counters}
+
+
+count_cache = CountCache()
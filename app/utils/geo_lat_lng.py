@@ -1,12 +1,33 @@
 import httpx
 import os
 import logging
+from app.utils.http_client import http_clients
+from app.utils.geocode_cache import geocode_cache, zip_gazetteer, normalize_query
 
 OPENCAGE_API_KEY = os.getenv("GEO_LOCATION_API_KEY")
 
 logging.basicConfig(level=logging.INFO)
 
 async def geo_lat_lng(city_state_zip: str):
+    key = normalize_query(city_state_zip)
+    cached = await geocode_cache.get(key)
+    if cached:
+        return cached
+
+    local = zip_gazetteer.lookup(city_state_zip)
+    if local:
+        geocode_cache.counters["gazetteer_hits"] += 1
+        await geocode_cache.set(key, local, "gazetteer")
+        return local
+
+    location = await geocode_with_opencage(city_state_zip)
+    if location:
+        await geocode_cache.set(key, location, "opencage")
+    else:
+        geocode_cache.counters["misses"] += 1
+    return location
+
+async def geocode_with_opencage(city_state_zip: str):
     if not OPENCAGE_API_KEY:
         logging.error("GEO_LOCATION_API_KEY not set in environment.")
         raise Exception("GEO_LOCATION_API_KEY not set in environment.")
@@ -19,10 +40,11 @@ async def geo_lat_lng(city_state_zip: str):
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
-            data = response.json()
+        geocode_cache.counters["network_lookups"] += 1
+        client = http_clients.get("geocoder")
+        response = await client.get(url, params=params)
+        response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
+        data = response.json()
 
         logging.info("API response: %s", data)
 
@@ -0,0 +1,39 @@
+from math import radians, degrees, cos, sin, pi
+
+EARTH_RADIUS_MILES = 3959
+NURSE_RADIUS_MILES = 50
+
+MILES_PER_DEGREE = EARTH_RADIUS_MILES * pi / 180
+
+
+def unit_vector(lat: float, lng: float) -> tuple[float, float, float]:
+    """Point on the unit sphere; matches the nurses.geo_x/geo_y/geo_z columns."""
+    lat_r, lng_r = radians(lat), radians(lng)
+    return cos(lat_r) * cos(lng_r), cos(lat_r) * sin(lng_r), sin(lat_r)
+
+
+def bounding_box(lat: float, lng: float, miles: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) enclosing every point within ``miles``."""
+    d_lat = miles / MILES_PER_DEGREE
+    lat_cos = cos(radians(min(abs(lat) + d_lat, 90.0)))
+    d_lng = 180.0 if lat_cos < 1e-9 else min(degrees(miles / (EARTH_RADIUS_MILES * lat_cos)), 180.0)
+    return lat - d_lat, lat + d_lat, max(lng - d_lng, -180.0), min(lng + d_lng, 180.0)
+
+
+def radius_params(lat: float, lng: float, miles: float = NURSE_RADIUS_MILES) -> list:
+    """Bind values for RADIUS_FILTER: bounding box, facility unit vector, radius."""
+    return [*bounding_box(lat, lng, miles), *unit_vector(lat, lng), float(miles)]
+
+
+def radius_filter(alias: str, first_param: int) -> str:
+    """SQL predicate for "row ``alias`` is within the radius" using 8 params from ``first_param``.
+
+    The lat/lng range narrows rows through nurses_lat_lng_idx before the exact
+    great-circle distance is computed from the precomputed unit vector.
+    """
+    p = [f"${first_param + i}" for i in range(8)]
+    return f"""{alias}.lat BETWEEN {p[0]} AND {p[1]}
+              AND {alias}.lng BETWEEN {p[2]} AND {p[3]}
+              AND {EARTH_RADIUS_MILES} * acos(LEAST(1.0, GREATEST(-1.0,
+                    {alias}.geo_x * {p[4]} + {alias}.geo_y * {p[5]} + {alias}.geo_z * {p[6]}
+                  ))) <= {p[7]}"""
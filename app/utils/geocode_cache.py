@@ -0,0 +1,116 @@
+import os
+import re
+import csv
+import logging
+from collections import OrderedDict
+from dotenv import load_dotenv
+from app.database import db
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+GEOCODE_MEMORY_CACHE_SIZE = int(os.getenv("GEOCODE_MEMORY_CACHE_SIZE", "4096"))
+# CSV with a header row of zip,lat,lng and optionally city,state. The bundled
+# file is generated by scripts/build_zip_centroids.py; a missing file just
+# disables this tier.
+GEO_ZIP_CENTROIDS_PATH = os.getenv(
+    "GEO_ZIP_CENTROIDS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "zip_centroids.csv"),
+)
+
+ZIP_PATTERN = re.compile(r"\b(\d{5})(?:-\d{4})?\b")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(re.sub(r"[^\w\s-]", " ", (query or "").lower()).split())
+
+
+class GeocodeCache:
+    """Memory LRU in front of the persistent ``geocode_cache`` table."""
+
+    def __init__(self, max_entries: int = GEOCODE_MEMORY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.counters = {"memory_hits": 0, "table_hits": 0, "gazetteer_hits": 0, "network_lookups": 0, "misses": 0}
+
+    def _remember(self, key: str, location: dict) -> None:
+        self._entries[key] = location
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> dict | None:
+        location = self._entries.get(key)
+        if location:
+            self._entries.move_to_end(key)
+            self.counters["memory_hits"] += 1
+            return location
+
+        try:
+            row = await db.fetchrow("SELECT lat, lng FROM geocode_cache WHERE query = $1", key)
+        except Exception as e:
+            logger.warning("Geocode cache read failed: %s", e)
+            row = None
+        if row:
+            location = {"lat": row["lat"], "lng": row["lng"]}
+            self._remember(key, location)
+            self.counters["table_hits"] += 1
+            return location
+        return None
+
+    async def set(self, key: str, location: dict, source: str) -> None:
+        self._remember(key, location)
+        try:
+            await db.execute("""
+                INSERT INTO geocode_cache (query, lat, lng, source, updated_at)
+                VALUES ($1, $2, $3, $4, NOW())
+                ON CONFLICT (query) DO UPDATE
+                SET lat = EXCLUDED.lat, lng = EXCLUDED.lng, source = EXCLUDED.source, updated_at = EXCLUDED.updated_at
+            """, key, location["lat"], location["lng"], source)
+        except Exception as e:
+            logger.warning("Geocode cache write failed: %s", e)
+
+    def metrics(self) -> dict:
+        return {"size": len(self._entries), "max_entries": self.max_entries, **self.counters}
+
+
+class ZipGazetteer:
+    """Offline ZIP and city/state centroids loaded once from a local CSV."""
+
+    def __init__(self, path: str = GEO_ZIP_CENTROIDS_PATH):
+        self.path = path
+        self._zips: dict[str, dict] | None = None
+        self._cities: dict[str, dict] = {}
+
+    def load(self) -> None:
+        self._zips = {}
+        self._cities = {}
+        if not os.path.exists(self.path):
+            logger.info("No ZIP centroid file at %s, offline geocoding disabled (see scripts/build_zip_centroids.py).", self.path)
+            return
+        with open(self.path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    location = {"lat": float(row["lat"]), "lng": float(row["lng"])}
+                except (KeyError, TypeError, ValueError):
+                    continue
+                zip_code = (row.get("zip") or "").strip().zfill(5)
+                if zip_code:
+                    self._zips[zip_code] = location
+                city, state = (row.get("city") or "").strip(), (row.get("state") or "").strip()
+                if city and state:
+                    self._cities.setdefault(normalize_query(f"{city} {state}"), location)
+        logger.info("Loaded %s ZIP centroids from %s", len(self._zips), self.path)
+
+    def lookup(self, query: str) -> dict | None:
+        if self._zips is None:
+            self.load()
+        match = ZIP_PATTERN.search(query or "")
+        if match and match.group(1) in self._zips:
+            return self._zips[match.group(1)]
+        city_state = ZIP_PATTERN.sub("", normalize_query(query)).strip()
+        return self._cities.get(" ".join(city_state.split()))
+
+
+geocode_cache = GeocodeCache()
+zip_gazetteer = ZipGazetteer()
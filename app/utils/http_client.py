@@ -0,0 +1,55 @@
+import os
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+
+# Outbound integrations that get their own pool. Any other name gets one on first use.
+DEFAULT_CLIENTS = ("relay", "geocoder")
+
+
+class HTTPClientRegistry:
+    """App-lifetime ``httpx.AsyncClient`` pools, one per outbound integration.
+
+    Clients keep connections alive between calls so repeated requests to the
+    same host skip the TCP/TLS handshake. ``start`` runs on app startup and
+    ``close`` on shutdown; ``get`` also creates a client lazily for code that
+    runs outside the app lifecycle.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _create(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._create()
+        return client
+
+    async def start(self) -> None:
+        for name in DEFAULT_CLIENTS:
+            self.get(name)
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry()
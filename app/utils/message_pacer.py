@@ -0,0 +1,42 @@
+import os
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+MESSAGE_MIN_GAP_SECONDS = float(os.getenv("MESSAGE_MIN_GAP_SECONDS", "5"))
+PRUNE_EVERY = 1000
+
+
+class MessagePacer:
+    """Enforces a minimum gap between two sends to the same recipient.
+
+    ``reserve`` either claims the recipient's next send slot right away
+    (returning 0) or returns how many seconds remain until the gap has
+    passed. Check and claim happen without an ``await`` in between, so two
+    workers in this process can never both get the slot.
+    """
+
+    def __init__(self, min_gap: float = MESSAGE_MIN_GAP_SECONDS):
+        self.min_gap = min_gap
+        self._last_sent: dict[str, float] = {}
+        self._reservations = 0
+        self.deferred = 0
+
+    def reserve(self, recipient: str) -> float:
+        now = time.monotonic()
+        last = self._last_sent.get(recipient)
+        if last is not None and now - last < self.min_gap:
+            self.deferred += 1
+            return self.min_gap - (now - last)
+        self._last_sent[recipient] = now
+        self._reservations += 1
+        if self._reservations % PRUNE_EVERY == 0:
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now: float) -> None:
+        self._last_sent = {r: t for r, t in self._last_sent.items() if now - t < self.min_gap}
+
+
+message_pacer = MessagePacer()
@@ -0,0 +1,192 @@
+import os
+import asyncio
+import logging
+from dotenv import load_dotenv
+from app.database import db
+from app.utils.send_message import send_message
+from app.utils.message_pacer import message_pacer
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", "4"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "10"))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "900"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+# A row stuck in "sending" this long belongs to a worker that died; it is picked up again.
+OUTBOX_STALE_LOCK_SECONDS = float(os.getenv("OUTBOX_STALE_LOCK_SECONDS", "300"))
+
+CLAIM_QUERY = db.register("outbox_claim", """
+    UPDATE outbound_messages
+    SET status = 'sending', locked_at = NOW(), attempts = attempts + 1
+    WHERE id = (
+        SELECT id FROM outbound_messages
+        WHERE (status = 'pending' AND next_attempt_at <= NOW())
+           OR (status = 'sending' AND locked_at < NOW() - make_interval(secs => $1))
+        ORDER BY next_attempt_at, id
+        FOR UPDATE SKIP LOCKED
+        LIMIT 1
+    )
+    RETURNING id, recipient, message, attempts
+""")
+
+
+class OutboxDispatcher:
+    """Persistent outbound message queue drained by a fixed pool of workers.
+
+    Controllers call ``enqueue`` which only inserts a row. Workers claim due
+    rows with ``FOR UPDATE SKIP LOCKED`` (so several app processes can share
+    the table), relay them through ``send_message`` and retry failures with
+    exponential backoff until ``max_attempts``, after which the row is
+    marked ``dead`` for inspection.
+
+    Sends are paced per recipient by ``message_pacer``: the first text to a
+    phone goes out immediately, and anything queued for it within the
+    minimum gap is held back and then sent as a single combined message.
+    """
+
+    def __init__(self, workers: int = OUTBOX_WORKERS, max_attempts: int = OUTBOX_MAX_ATTEMPTS):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self.counters = {"enqueued": 0, "sent": 0, "coalesced": 0, "deferred": 0, "retried": 0, "dead": 0}
+
+    async def enqueue(self, recipient: str, message: str) -> int | None:
+        row = await db.fetchrow("""
+            INSERT INTO outbound_messages (recipient, message)
+            VALUES ($1, $2)
+            RETURNING id
+        """, recipient, message)
+        self.counters["enqueued"] += 1
+        self._wakeup.set()
+        return row["id"] if row else None
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                row = await db.fetchrow_named(CLAIM_QUERY, OUTBOX_STALE_LOCK_SECONDS)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Outbox worker %s failed to claim: %s", index, e)
+                row = None
+
+            if not row:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=OUTBOX_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                await self._deliver(row)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Outbox worker %s failed to record delivery of %s: %s", index, row["id"], e)
+
+    async def _claim_siblings(self, row) -> list:
+        """Claim every other due message for the same recipient so they go out as one."""
+        siblings = await db.fetch("""
+            UPDATE outbound_messages
+            SET status = 'sending', locked_at = NOW(), attempts = attempts + 1
+            WHERE id IN (
+                SELECT id FROM outbound_messages
+                WHERE recipient = $1 AND id != $2
+                  AND status = 'pending' AND next_attempt_at <= NOW()
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, recipient, message, attempts
+        """, row["recipient"], row["id"])
+        return sorted([row, *siblings], key=lambda r: r["id"])
+
+    async def _deliver(self, row) -> None:
+        rows = await self._claim_siblings(row)
+        ids = [r["id"] for r in rows]
+
+        delay = message_pacer.reserve(row["recipient"])
+        if delay > 0:
+            # Too soon after the last text to this phone: put the batch back
+            # until the gap has passed, without counting it as an attempt.
+            await db.execute("""
+                UPDATE outbound_messages
+                SET status = 'pending', locked_at = NULL, attempts = attempts - 1,
+                    next_attempt_at = NOW() + make_interval(secs => $2)
+                WHERE id = ANY($1::int[])
+            """, ids, float(delay))
+            self.counters["deferred"] += len(ids)
+            return
+
+        message = "\n\n".join(r["message"] for r in rows)
+        try:
+            await send_message(row["recipient"], message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            for r in rows:
+                await self._fail(r, e)
+            return
+
+        await db.execute("""
+            UPDATE outbound_messages
+            SET status = 'sent', sent_at = NOW(), locked_at = NULL, last_error = NULL
+            WHERE id = ANY($1::int[])
+        """, ids)
+        self.counters["sent"] += len(ids)
+        if len(ids) > 1:
+            self.counters["coalesced"] += len(ids) - 1
+
+    async def _fail(self, row, error: Exception) -> None:
+        error_text = getattr(error, "detail", None) or str(error)
+        if row["attempts"] >= self.max_attempts:
+            await db.execute("""
+                UPDATE outbound_messages
+                SET status = 'dead', locked_at = NULL, last_error = $2
+                WHERE id = $1
+            """, row["id"], error_text)
+            self.counters["dead"] += 1
+            logger.error("Outbox message %s to %s dead-lettered: %s", row["id"], row["recipient"], error_text)
+            return
+
+        delay = min(OUTBOX_BACKOFF_SECONDS * 2 ** (row["attempts"] - 1), OUTBOX_MAX_BACKOFF_SECONDS)
+        await db.execute("""
+            UPDATE outbound_messages
+            SET status = 'pending', locked_at = NULL, last_error = $2,
+                next_attempt_at = NOW() + make_interval(secs => $3)
+            WHERE id = $1
+        """, row["id"], error_text, float(delay))
+        self.counters["retried"] += 1
+
+    async def metrics(self) -> dict:
+        rows = await db.fetch("SELECT status, COUNT(*) AS count FROM outbound_messages GROUP BY status")
+        return {
+            "workers": self.workers,
+            "running_workers": sum(1 for task in self._tasks if not task.done()),
+            "by_status": {row["status"]: row["count"] for row in rows},
+            **self.counters,
+        }
+
+
+outbox = OutboxDispatcher()
+
+
+async def enqueue_message(recipient: str, message: str) -> int | None:
+    try:
+        return await outbox.enqueue(recipient, message)
+    except Exception as e:
+        logger.error("Failed to enqueue message to %s: %s", recipient, e)
+        return None
@@ -0,0 +1,51 @@
+import json
+import base64
+
+# Keyset ("cursor") pagination for the admin list endpoints. A cursor is the
+# sort key of the last row of the previous page, so the next page starts with
+# an index seek instead of scanning and discarding OFFSET rows.
+
+MAX_PAGE_SIZE = 200
+
+
+def wants_cursor(params) -> bool:
+    """Cursor mode is opted into by sending ``cursor`` (empty for the first page)."""
+    return "cursor" in params
+
+
+def page_size(params, default: int = 10) -> int:
+    return max(1, min(int(params.get("limit", default)), MAX_PAGE_SIZE))
+
+
+def encode_cursor(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> list | None:
+    """Sort key values from ``cursor``; None for the first page. Raises ValueError if malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def keyset_predicate(columns: list[str], descending: bool, first_param: int) -> str:
+    """Row-value comparison selecting rows strictly after the cursor in sort order."""
+    params = ", ".join(f"${first_param + i}" for i in range(len(columns)))
+    op = "<" if descending else ">"
+    return f"({', '.join(columns)}) {op} ({params})"
+
+
+def split_page(rows: list, limit: int, key_fields: list[str]) -> tuple[list, str | None]:
+    """Trim the extra look-ahead row and build the cursor for the following page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1][field] for field in key_fields])
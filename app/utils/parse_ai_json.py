@@ -0,0 +1,9 @@
+import json
+import re
+
+def parse_ai_json(text: str):
+    """Parse a model reply as JSON, dropping ```json / ``` fences if present."""
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = re.sub(r"```json|```", "", cleaned).strip()
+    return json.loads(cleaned)
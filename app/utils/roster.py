@@ -0,0 +1,142 @@
+import csv
+import json
+import codecs
+from decimal import Decimal, InvalidOperation
+
+# Parsing and validation of roster uploads for /api/admin/import-nurses;
+# loading lives in app.helper.nurseImport.
+
+# Roster fields use the /api/admin/add-nurse names; the nurses column names
+# are accepted as well. All of them are required.
+IMPORT_FIELDS = {
+    "firstName": "first_name",
+    "lastName": "last_name",
+    "scheduleName": "schedule_name",
+    "rate": "rate",
+    "shiftDif": "shift_dif",
+    "otRate": "ot_rate",
+    "email": "email",
+    "talentId": "talent_id",
+    "position": "nurse_type",
+    "phone": "mobile_number",
+    "location": "location",
+    "shift": "shift",
+}
+NUMERIC_FIELDS = {"rate", "shiftDif", "otRate"}
+FIELD_ALIASES = {
+    **{column: field for field, column in IMPORT_FIELDS.items()},
+    **{field.lower(): field for field in IMPORT_FIELDS},
+}
+
+
+async def roster_lines(chunks):
+    """``(line_number, text)`` for each non-blank line of a streamed body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_number = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield line_number + 1, pending.rstrip("\r")
+
+
+async def roster_records(chunks, fmt: str):
+    """``(line_number, record, error)`` per roster row; CSV needs a header line.
+
+    CSV records must fit on one line (no quoted line breaks).
+    """
+    header = None
+    async for line_number, line in roster_lines(chunks):
+        if fmt == "jsonl":
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield line_number, None, "Invalid JSON"
+                continue
+            if not isinstance(data, dict):
+                yield line_number, None, "Expected a JSON object"
+                continue
+            yield line_number, {FIELD_ALIASES.get(key.strip().lower(), key): value for key, value in data.items()}, None
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [FIELD_ALIASES.get(name.strip().lower(), name.strip()) for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_number, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield line_number, dict(zip(header, values)), None
+
+
+def validate_record(record: dict, nurse_types: dict) -> tuple[dict, list[str]]:
+    """Cleaned add-nurse fields and the list of problems with them."""
+    values = {}
+    errors = []
+    for field in IMPORT_FIELDS:
+        value = record.get(field)
+        value = "" if value is None else str(value).strip()
+        if not value:
+            errors.append(f"{field} is required")
+            continue
+        if field in NUMERIC_FIELDS:
+            try:
+                value = Decimal(value)
+            except InvalidOperation:
+                value = None
+            if value is None or not value.is_finite():
+                errors.append(f"{field} must be a number")
+                continue
+        values[field] = value
+
+    if "email" in values and "@" not in values["email"]:
+        errors.append("email is not valid")
+    if "position" in values:
+        canonical = nurse_types.get(values["position"].lower())
+        if canonical:
+            values["position"] = canonical
+        else:
+            errors.append(f"Unknown position: {values['position']}")
+    return values, errors
+
+
+class FileDuplicates:
+    """Email (case-insensitive), phone and talent id of rows already taken from the same file.
+
+    ``check`` only reads; a row's keys are added once it is certain to be
+    loaded, so a rejected row never blocks a later one.
+    """
+
+    FIELDS = ("email", "phone", "talentId")
+
+    def __init__(self):
+        self._seen = {field: {} for field in self.FIELDS}
+
+    @staticmethod
+    def _key(field: str, values: dict):
+        return values[field].lower() if field == "email" else values[field]
+
+    def check(self, values: dict) -> list[str]:
+        errors = []
+        for field, seen in self._seen.items():
+            line_number = seen.get(self._key(field, values))
+            if line_number is not None:
+                errors.append(f"{field} duplicates line {line_number}")
+        return errors
+
+    def add(self, line_number: int, values: dict) -> None:
+        for field, seen in self._seen.items():
+            seen[self._key(field, values)] = line_number
+
+    def discard(self, line_number: int, values: dict) -> None:
+        """Forget a row added earlier, e.g. when its chunk failed to load."""
+        for field, seen in self._seen.items():
+            key = self._key(field, values)
+            if seen.get(key) == line_number:
+                del seen[key]
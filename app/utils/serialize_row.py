@@ -1,6 +1,16 @@
 from decimal import Decimal
 from datetime import date, datetime, time
 
+# Generated/bookkeeping columns that back indexes and caches; never part of
+# an API response.
+INTERNAL_COLUMNS = {"geo_x", "geo_y", "geo_z", "eligibility_refreshed_at", "search_text"}
+
+def public_row(row):
+    """The row as a dict without ``INTERNAL_COLUMNS``."""
+    if not row:
+        return None
+    return {key: value for key, value in dict(row).items() if key not in INTERNAL_COLUMNS}
+
 def serialize_row(row):
     if not row:
         return None
@@ -8,5 +18,5 @@ def serialize_row(row):
         key: (
             str(value) if isinstance(value, (Decimal, date, datetime, time)) else value
         )
-        for key, value in dict(row).items()
+        for key, value in public_row(row).items()
     }
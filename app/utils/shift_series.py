@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+# Date-range expansion for bulk/recurring shift creation (admin_add_shifts_bulk).
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def parse_weekdays(values) -> set[int]:
+    """Weekday numbers (Monday is 0) from names like ``"mon"``/``"Monday"`` or numbers; all days when empty."""
+    if not values:
+        return set(range(7))
+    days = set()
+    for value in values:
+        if isinstance(value, int) and 0 <= value <= 6:
+            days.add(value)
+        elif isinstance(value, str) and value.strip().lower()[:3] in WEEKDAYS:
+            days.add(WEEKDAYS.index(value.strip().lower()[:3]))
+        else:
+            raise ValueError(f"Invalid weekday: {value}")
+    return days
+
+
+def parse_shift_count(value) -> int:
+    """Shifts per day for one position; 1 when omitted, otherwise a positive integer."""
+    if value is None:
+        return 1
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"Invalid count: {value}")
+    try:
+        count = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid count: {value}")
+    if count < 1:
+        raise ValueError(f"Invalid count: {value}")
+    return count
+
+
+def count_matching_days(start_date, end_date, weekdays: set[int]) -> int:
+    """Days from ``start_date`` to ``end_date`` (inclusive) falling on ``weekdays``, without iterating."""
+    total_days = (end_date - start_date).days + 1
+    if total_days <= 0:
+        return 0
+    full_weeks, remainder = divmod(total_days, 7)
+    first = start_date.weekday()
+    return full_weeks * len(weekdays) + sum(1 for i in range(remainder) if (first + i) % 7 in weekdays)
+
+
+def expand_shift_series(start_date, end_date, weekdays: set[int], positions: list[dict]) -> list[tuple]:
+    """Shift specs for every matching day from ``start_date`` to ``end_date`` (inclusive);
+    each position is ``{"position", "shift", "count", "additionalNotes"}``."""
+    specs = []
+    day = start_date
+    while day <= end_date:
+        if day.weekday() in weekdays:
+            for position in positions:
+                for _ in range(parse_shift_count(position.get("count"))):
+                    specs.append((position["position"], position["shift"], day, position.get("additionalNotes")))
+        day += timedelta(days=1)
+    return specs
@@ -0,0 +1,76 @@
+"""Build app/data/zip_centroids.csv, the offline tier of the geocoder.
+
+The source is the US ZIP dataset bundled in the MIT-licensed ``zipcodes``
+package (zips.json.bz2, version pinned below). Run from the repository root:
+
+    python scripts/build_zip_centroids.py                 # download the pinned wheel from PyPI
+    python scripts/build_zip_centroids.py --source zips.json.bz2
+
+Output columns are zip,lat,lng,city,state, sorted by ZIP, as read by
+app.utils.geocode_cache.ZipGazetteer.
+"""
+import argparse
+import bz2
+import csv
+import hashlib
+import io
+import json
+import os
+import urllib.request
+import zipfile
+
+ZIPCODES_VERSION = "1.2.0"
+WHEEL_URL = (
+    "https://files.pythonhosted.org/packages/1e/4a/"
+    "d0e54c2eaed40f604e9667311a7b86dfb82cb2e504aaba25eb2412938073/"
+    f"zipcodes-{ZIPCODES_VERSION}-py2.py3-none-any.whl"
+)
+WHEEL_SHA256 = "e06e4ad7a460cfa892452e1b8d6207a0e9059e2a00e96bf0b7b36afcaa176a29"
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "data", "zip_centroids.csv")
+
+
+def load_source(path: str | None) -> list[dict]:
+    if path:
+        with open(path, "rb") as f:
+            raw = f.read()
+    else:
+        with urllib.request.urlopen(WHEEL_URL) as response:
+            data = response.read()
+        if hashlib.sha256(data).hexdigest() != WHEEL_SHA256:
+            raise SystemExit("Downloaded zipcodes wheel does not match the pinned sha256")
+        raw = zipfile.ZipFile(io.BytesIO(data)).read("zipcodes/zips.json.bz2")
+    return json.loads(bz2.decompress(raw))
+
+
+def centroid_rows(entries: list[dict]) -> list[tuple]:
+    rows = {}
+    for entry in entries:
+        try:
+            lat, lng = float(entry["lat"]), float(entry["long"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if lat == 0 and lng == 0:
+            continue
+        zip_code = str(entry.get("zip_code") or "").strip().zfill(5)
+        if zip_code:
+            rows[zip_code] = (zip_code, f"{lat:.4f}", f"{lng:.4f}", entry.get("city") or "", entry.get("state") or "")
+    return [rows[zip_code] for zip_code in sorted(rows)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", help="local zips.json.bz2 instead of downloading the pinned wheel")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    rows = centroid_rows(load_source(args.source))
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["zip", "lat", "lng", "city", "state"])
+        writer.writerows(rows)
+    print(f"Wrote {len(rows)} ZIP centroids to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
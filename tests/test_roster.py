@@ -0,0 +1,119 @@
+import asyncio
+from decimal import Decimal
+
+from app.utils.roster import FileDuplicates, roster_lines, roster_records, validate_record
+
+HEADER = "firstName,lastName,scheduleName,rate,shiftDif,otRate,email,talentId,position,phone,location,shift"
+NURSE_TYPES = {"rn": "RN", "lvn": "LVN"}
+
+
+async def _stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+def collect(agen) -> list:
+    async def run():
+        return [item async for item in agen]
+    return asyncio.run(run())
+
+
+def record(**overrides) -> dict:
+    values = {
+        "firstName": "Ann", "lastName": "Lee", "scheduleName": "Ann L", "rate": "40",
+        "shiftDif": "2.5", "otRate": "60", "email": "Ann@Example.com", "talentId": "T1",
+        "position": "rn", "phone": "5550001", "location": "Austin, TX 78701", "shift": "NOC",
+    }
+    values.update(overrides)
+    return values
+
+
+def test_roster_lines_handles_bom_crlf_blank_lines_and_split_chunks():
+    lines = collect(roster_lines(_stream(b"\xef\xbb\xbfa,b\r\nc,", b"d\r\n\r\ne,f")))
+    assert lines == [(1, "a,b"), (2, "c,d"), (4, "e,f")]
+
+
+def test_roster_lines_handles_multibyte_character_split_across_chunks():
+    text = "José,Núñez\n".encode()
+    split = text.index("é".encode()) + 1
+    assert collect(roster_lines(_stream(text[:split], text[split:]))) == [(1, "José,Núñez")]
+
+
+def test_csv_header_aliases_map_to_add_nurse_fields():
+    body = "First_Name,LASTNAME,mobile_number,nurse_type\nAnn,Lee,555,RN\n".encode()
+    rows = collect(roster_records(_stream(body), "csv"))
+    assert rows == [(2, {"firstName": "Ann", "lastName": "Lee", "phone": "555", "position": "RN"}, None)]
+
+
+def test_csv_column_count_mismatch_is_reported_per_line():
+    body = f"{HEADER}\nonly,two\n".encode()
+    assert collect(roster_records(_stream(body), "csv")) == [(2, None, "Expected 12 columns, got 2")]
+
+
+def test_csv_quoted_commas_stay_in_one_field():
+    body = 'location,shift\n"Austin, TX",AM\n'.encode()
+    assert collect(roster_records(_stream(body), "csv")) == [(2, {"location": "Austin, TX", "shift": "AM"}, None)]
+
+
+def test_jsonl_rejects_invalid_json_and_non_objects():
+    body = b'{"email": "a@b.c", "talent_id": 7}\n[1, 2]\n"text"\nnot json\n'
+    rows = collect(roster_records(_stream(body), "jsonl"))
+    assert rows == [
+        (1, {"email": "a@b.c", "talentId": 7}, None),
+        (2, None, "Expected a JSON object"),
+        (3, None, "Expected a JSON object"),
+        (4, None, "Invalid JSON"),
+    ]
+
+
+def test_validate_record_cleans_numbers_and_canonical_position():
+    values, errors = validate_record(record(firstName="  Ann  "), NURSE_TYPES)
+    assert errors == []
+    assert values["firstName"] == "Ann"
+    assert values["rate"] == Decimal("40")
+    assert values["shiftDif"] == Decimal("2.5")
+    assert values["position"] == "RN"
+
+
+def test_validate_record_rejects_non_numeric_and_non_finite_numbers():
+    _, errors = validate_record(record(rate="abc", shiftDif="NaN", otRate="Infinity"), NURSE_TYPES)
+    assert errors == ["rate must be a number", "shiftDif must be a number", "otRate must be a number"]
+
+
+def test_validate_record_requires_every_field():
+    _, errors = validate_record(record(email="", talentId=None, shift="   "), NURSE_TYPES)
+    assert errors == ["email is required", "talentId is required", "shift is required"]
+
+
+def test_validate_record_checks_email_and_position():
+    _, errors = validate_record(record(email="not-an-email", position="CNA"), NURSE_TYPES)
+    assert errors == ["email is not valid", "Unknown position: CNA"]
+
+
+def test_file_duplicates_match_email_case_insensitively_and_phone_and_talent_id():
+    duplicates = FileDuplicates()
+    first = {"email": "ann@example.com", "phone": "5550001", "talentId": "T1"}
+    assert duplicates.check(first) == []
+    duplicates.add(2, first)
+    assert duplicates.check({"email": "ANN@example.com", "phone": "5550002", "talentId": "T2"}) == [
+        "email duplicates line 2"
+    ]
+    assert duplicates.check({"email": "bob@example.com", "phone": "5550001", "talentId": "T1"}) == [
+        "phone duplicates line 2", "talentId duplicates line 2"
+    ]
+    assert duplicates.check({"email": "cy@example.com", "phone": "5550003", "talentId": "T3"}) == []
+
+
+def test_file_duplicates_ignore_rows_that_were_never_added_or_were_discarded():
+    duplicates = FileDuplicates()
+    row = {"email": "ann@example.com", "phone": "5550001", "talentId": "T1"}
+    assert duplicates.check(row) == []
+    assert duplicates.check(row) == []
+
+    duplicates.add(2, row)
+    duplicates.discard(2, row)
+    assert duplicates.check(row) == []
+
+    duplicates.add(3, row)
+    duplicates.discard(2, row)
+    assert duplicates.check(row) == ["email duplicates line 3", "phone duplicates line 3", "talentId duplicates line 3"]
@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.utils.shift_series import count_matching_days, expand_shift_series, parse_shift_count, parse_weekdays
+
+
+def test_parse_weekdays_accepts_names_abbreviations_and_numbers():
+    assert parse_weekdays(["Monday", "fri", " SUN ", 2]) == {0, 4, 6, 2}
+
+
+def test_parse_weekdays_defaults_to_every_day():
+    assert parse_weekdays(None) == set(range(7))
+    assert parse_weekdays([]) == set(range(7))
+
+
+@pytest.mark.parametrize("value", ["funday", 7, -1, None, 1.0])
+def test_parse_weekdays_rejects_unknown_values(value):
+    with pytest.raises(ValueError):
+        parse_weekdays([value])
+
+
+def test_parse_shift_count_defaults_to_one_and_accepts_numeric_strings():
+    assert parse_shift_count(None) == 1
+    assert parse_shift_count(3) == 3
+    assert parse_shift_count("2") == 2
+
+
+@pytest.mark.parametrize("value", [0, -2, "0", "abc", "1.5", 1.5, True, [2]])
+def test_parse_shift_count_rejects_non_positive_and_non_integer_counts(value):
+    with pytest.raises(ValueError):
+        parse_shift_count(value)
+
+
+def test_expand_shift_series_is_inclusive_and_repeats_counts():
+    # 2026-11-01 is a Sunday; Mon/Fri/Sun up to and including Sunday the 8th.
+    specs = expand_shift_series(
+        date(2026, 11, 1), date(2026, 11, 8), {0, 4, 6},
+        [{"position": "RN", "shift": "NOC", "count": 2, "additionalNotes": "Badge at desk"},
+         {"position": "LVN", "shift": "AM"}],
+    )
+    days = [date(2026, 11, 1), date(2026, 11, 2), date(2026, 11, 6), date(2026, 11, 8)]
+    assert specs == [
+        spec
+        for day in days
+        for spec in [("RN", "NOC", day, "Badge at desk")] * 2 + [("LVN", "AM", day, None)]
+    ]
+
+
+def test_expand_shift_series_single_day_range():
+    assert expand_shift_series(date(2026, 11, 2), date(2026, 11, 2), {0}, [{"position": "RN", "shift": "PM"}]) == [
+        ("RN", "PM", date(2026, 11, 2), None)
+    ]
+
+
+def test_count_matching_days_agrees_with_expansion():
+    start = date(2026, 1, 1)
+    for offset in range(0, 21):
+        for length in range(-1, 30):
+            for weekdays in ({0}, {5, 6}, {1, 3, 4}, set(range(7))):
+                first = start + timedelta(days=offset)
+                last = first + timedelta(days=length)
+                expected = len(expand_shift_series(first, last, weekdays, [{"position": "RN", "shift": "AM"}]))
+                assert count_matching_days(first, last, weekdays) == expected